@@ -0,0 +1,135 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Implementation of the in-process storage driver built on top of the storagelib."""
+
+import dataclasses
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Dict, Tuple
+
+from spark_rapids_pytools.common.exceptions import StorageException
+from spark_rapids_pytools.common.sys_storage import StorageDriver, FSUtil
+from spark_rapids_pytools.common.utilities import ToolLogging
+from spark_rapids_tools.storagelib import CspFs, CspPath, LocalPath, TransferOptions
+
+
+@dataclass
+class CspFsStorageDriver(StorageDriver):
+    """
+    Storage driver that accesses the object stores in-process through the pyArrow filesystems of
+    the storagelib instead of forking the CLI of the cloud provider (aws s3, gsutil, az) for each
+    call. The filesystem clients are shared by all the calls, which reuses their connections.
+    Paths that do not belong to one of the remote_prefixes (i.e., local files, http urls, dbfs) are
+    handled by the fallback driver.
+    """
+    fallback: StorageDriver
+    remote_prefixes: Tuple[str, ...] = ('s3://', 'gs://', 'abfss://')
+    # optional clients per storage name (i.e., "s3") such as an S3 client pointing to a custom endpoint
+    fs_clients: Dict[str, CspFs] = field(default_factory=dict)
+    transfer_options: TransferOptions = field(default_factory=TransferOptions)
+    logger: Logger = field(default=None, init=False)
+
+    def __post_init__(self):
+        self.logger = ToolLogging.get_and_setup_logger('rapids.tools.storage.cspfs')
+
+    def _is_handled(self, src: str) -> bool:
+        return src is not None and src.startswith(self.remote_prefixes)
+
+    def _create_path(self, src: str) -> CspPath:
+        # the object stores do not keep trailing slashes in the path names
+        csp_path = CspPath(src.rstrip('/'))
+        fs_client = self.fs_clients.get(csp_path.get_storage_name())
+        if fs_client is not None:
+            csp_path = fs_client.create_as_path(str(csp_path))
+        return csp_path
+
+    def resource_exists(self, src) -> bool:
+        if not self._is_handled(src):
+            return self.fallback.resource_exists(src)
+        try:
+            return self._create_path(src).exists()
+        except OSError:
+            return False
+
+    def resource_is_dir(self, src) -> bool:
+        if not self._is_handled(src):
+            return self.fallback.resource_is_dir(src)
+        try:
+            return self._create_path(src).is_dir()
+        except OSError:
+            return False
+
+    def _copy_path(self, src: CspPath, dest: CspPath, exclude_pattern: str = None, sync: bool = False) -> None:
+        if not src.exists():
+            raise StorageException(f'Resource {src} does not exist')
+        options = dataclasses.replace(self.transfer_options, exclude_pattern=exclude_pattern)
+        if sync:
+            # files uploaded by a previous copy are not in the manifest. Compare them by size and mtime
+            stats = CspFs.sync_resources(src, dest, options=dataclasses.replace(options, resume=True))
+            self.logger.info('Synced %s to %s: %s', src, dest, stats)
+        else:
+            stats = CspFs.copy_resources(src, dest, options=options)
+            self.logger.info('Copied %s to %s: %s', src, dest, stats)
+
+    def _download_remote_resource(self, src: str, dest: str) -> str:
+        if not self._is_handled(src):
+            return self.fallback._download_remote_resource(src, dest)  # pylint: disable=protected-access
+        src_path = self._create_path(src)
+        try:
+            self._copy_path(src_path, LocalPath(dest))
+        except OSError as err:
+            raise StorageException(f'Could not download {src} to {dest}: {err}') from err
+        return FSUtil.build_full_path(dest, FSUtil.get_resource_name(src.rstrip('/')))
+
+    def _upload_remote_dest(self, src: str, dest: str, exclude_pattern: str = None) -> str:
+        if not self._is_handled(dest):
+            return self.fallback._upload_remote_dest(src, dest,  # pylint: disable=protected-access
+                                                     exclude_pattern=exclude_pattern)
+        dest_path = self._create_path(dest)
+        try:
+            self._copy_path(LocalPath(src), dest_path, exclude_pattern=exclude_pattern)
+        except OSError as err:
+            raise StorageException(f'Could not upload {src} to {dest}: {err}') from err
+        return FSUtil.build_path(dest, FSUtil.get_resource_name(src.rstrip('/')))
+
+    def _sync_remote_dest(self, src: str, dest: str, exclude_pattern: str = None) -> str:
+        if not self._is_handled(dest):
+            return self.fallback._sync_remote_dest(src, dest,  # pylint: disable=protected-access
+                                                   exclude_pattern=exclude_pattern)
+        dest_path = self._create_path(dest)
+        try:
+            self._copy_path(LocalPath(src), dest_path, exclude_pattern=exclude_pattern, sync=True)
+        except OSError as err:
+            raise StorageException(f'Could not sync {src} to {dest}: {err}') from err
+        return FSUtil.build_path(dest, FSUtil.get_resource_name(src.rstrip('/')))
+
+    def _delete_path(self, src, fail_ok: bool = False):
+        if not self._is_handled(src):
+            self.fallback._delete_path(src, fail_ok=fail_ok)  # pylint: disable=protected-access
+            return
+        src_path = self._create_path(src)
+        try:
+            if src_path.is_dir():
+                src_path.fs_obj.delete_dir(src_path.no_prefix)
+            elif src_path.is_file():
+                src_path.fs_obj.delete_file(src_path.no_prefix)
+            src_path.invalidate_file_info(recursive=True)
+        except OSError as err:
+            raise StorageException(f'Could not remove {src}: {err}') from err
+
+    def is_file_path(self, value: str):
+        if self._is_handled(value):
+            return True
+        return self.fallback.is_file_path(value)
@@ -243,7 +243,6 @@ class DatabricksCluster(ClusterBase):
                 'instance_type': self.props.get_value('node_type_id')
             }
             worker = DatabricksNode.create_worker_node().set_fields_from_dict(worker_props)
-            worker.fetch_and_set_hw_info(self.cli)
             worker_nodes.append(worker)
         master_props = {
             'Id': master_nodes_from_conf['node_id'],
@@ -253,7 +252,7 @@ class DatabricksCluster(ClusterBase):
             'instance_type': self.props.get_value('driver_node_type_id')
         }
         master_node = DatabricksNode.create_master_node().set_fields_from_dict(master_props)
-        master_node.fetch_and_set_hw_info(self.cli)
+        self._fetch_and_set_nodes_hw_info(worker_nodes + [master_node])
         self.nodes = {
             SparkNodeType.WORKER: worker_nodes,
             SparkNodeType.MASTER: master_node
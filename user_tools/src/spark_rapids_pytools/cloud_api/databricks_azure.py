@@ -327,7 +327,6 @@ class DatabricksAzureCluster(ClusterBase):
                 'instance_type': self.props.get_value('node_type_id')
             }
             worker = DatabricksAzureNode.create_worker_node().set_fields_from_dict(worker_props)
-            worker.fetch_and_set_hw_info(self.cli)
             worker_nodes.append(worker)
         driver_props = {
             'Id': driver_nodes_from_conf['node_id'],
@@ -337,7 +336,7 @@ class DatabricksAzureCluster(ClusterBase):
             'instance_type': self.props.get_value('driver_node_type_id')
         }
         driver_node = DatabricksAzureNode.create_master_node().set_fields_from_dict(driver_props)
-        driver_node.fetch_and_set_hw_info(self.cli)
+        self._fetch_and_set_nodes_hw_info(worker_nodes + [driver_node])
         self.nodes = {
             SparkNodeType.WORKER: worker_nodes,
             SparkNodeType.MASTER: driver_node
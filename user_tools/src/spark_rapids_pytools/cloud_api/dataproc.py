@@ -346,6 +346,11 @@ class DataprocNode(ClusterNode):
         instance_description = cli.exec_platform_describe_node_instance(self)
         self.mc_props = JSONPropertiesContainer(prop_arg=instance_description, file_load=False)
 
+    def get_hw_info_key(self) -> tuple:
+        # the accelerators are attached to the node separately from the machine type
+        accelerators = self.props.get_value_silent('accelerators') if self.props else None
+        return super().get_hw_info_key() + (self.zone, json.dumps(accelerators, sort_keys=True))
+
     def _set_fields_from_props(self):
         # set the machine type
         if not self.props:
@@ -405,8 +410,6 @@ class DataprocCluster(ClusterBase):
                     'zone': self.zone
                 }
                 worker = DataprocNode.create_worker_node().set_fields_from_dict(worker_props)
-                # TODO for optimization, we should set HW props for 1 worker
-                worker.fetch_and_set_hw_info(self.cli)
                 worker_nodes.append(worker)
         raw_master_props = self.props.get_value('config', 'masterConfig')
         master_props = {
@@ -416,7 +419,7 @@ class DataprocCluster(ClusterBase):
             'zone': self.zone
         }
         master_node = DataprocNode.create_master_node().set_fields_from_dict(master_props)
-        master_node.fetch_and_set_hw_info(self.cli)
+        self._fetch_and_set_nodes_hw_info(worker_nodes + [master_node])
         self.nodes = {
             SparkNodeType.WORKER: worker_nodes,
             SparkNodeType.MASTER: master_node
@@ -170,7 +170,6 @@ class DataprocGkeCluster(DataprocCluster):
                 'props': JSONPropertiesContainer(prop_arg=node_props.get_value('config'), file_load=False),
                 'zone': self.zone
             })
-            node.fetch_and_set_hw_info(self.cli)
             return node
 
         executor_nodes = []
@@ -181,6 +180,7 @@ class DataprocGkeCluster(DataprocCluster):
                 executor_nodes.append(c_node)
             elif gke_node_pool.spark_node_type == SparkNodeType.MASTER:
                 driver_nodes.append(c_node)
+        self._fetch_and_set_nodes_hw_info(executor_nodes + driver_nodes)
         self.nodes = {
             SparkNodeType.WORKER: executor_nodes,
             SparkNodeType.MASTER: driver_nodes[0]
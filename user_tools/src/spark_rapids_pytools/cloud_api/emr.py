@@ -388,11 +388,11 @@ class EMRCluster(ClusterBase):
                 'ec2_instance': ec2_inst
             }
             c_node = EMRNode.create_node(ec2_inst.group.spark_grp_type).set_fields_from_dict(node_props)
-            c_node.fetch_and_set_hw_info(self.cli)
             if c_node.node_type == SparkNodeType.WORKER:
                 worker_nodes.append(c_node)
             else:
                 master_nodes.append(c_node)
+        self._fetch_and_set_nodes_hw_info(worker_nodes + master_nodes)
         return {
             SparkNodeType.WORKER: worker_nodes,
             SparkNodeType.MASTER: master_nodes[0]
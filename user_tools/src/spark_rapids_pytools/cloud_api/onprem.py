@@ -159,6 +159,10 @@ class OnPremNode(ClusterNode):
         sys_info = self._pull_sys_info(cli)
         self.construct_hw_info(cli=cli, sys_info=sys_info)
 
+    def get_hw_info_key(self) -> tuple:
+        # the hardware is defined by the properties of the node
+        return super().get_hw_info_key() + (self.props.get_value('numCores'), self.props.get_value('memory'))
+
     def _pull_sys_info(self, cli=None) -> SysInfo:
         cpu_mem = self.props.get_value('memory')
         cpu_mem = cpu_mem.replace('MiB', '')
@@ -223,8 +227,6 @@ class OnPremCluster(ClusterBase):
                     'platform_name': self.platform.get_platform_name()
                 }
                 worker = OnPremNode.create_worker_node().set_fields_from_dict(worker_props)
-                # TODO for optimization, we should set HW props for 1 worker
-                worker.fetch_and_set_hw_info(self.cli)
                 worker_nodes.append(worker)
         raw_master_props = self.props.get_value('config', 'masterConfig')
         master_props = {
@@ -236,7 +238,7 @@ class OnPremCluster(ClusterBase):
         }
 
         master_node = OnPremNode.create_master_node().set_fields_from_dict(master_props)
-        master_node.fetch_and_set_hw_info(self.cli)
+        self._fetch_and_set_nodes_hw_info(worker_nodes + [master_node])
         self.nodes = {
             SparkNodeType.WORKER: worker_nodes,
             SparkNodeType.MASTER: master_node
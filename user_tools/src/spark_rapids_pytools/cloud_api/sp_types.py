@@ -16,13 +16,16 @@
 
 import configparser
 import json
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from logging import Logger
 from typing import Type, Any, List, Callable, Union
 
 from spark_rapids_tools import EnumeratedType, CspEnv
+from spark_rapids_pytools.cloud_api.cspfsstorage import CspFsStorageDriver
 from spark_rapids_pytools.common.prop_manager import AbstractPropertiesContainer, JSONPropertiesContainer, \
     get_elem_non_safe
 from spark_rapids_pytools.common.sys_storage import StorageDriver, FSUtil
@@ -188,6 +191,21 @@ class ClusterNode:
             gpu_info = None
         self.construct_hw_info(cli=cli, gpu_info=gpu_info, sys_info=sys_info)
 
+    def get_hw_info_key(self) -> tuple:
+        """
+        Nodes sharing the same key have the same hardware. The hardware info is pulled once per key.
+        :return: a hashable key identifying the hardware of the node.
+        """
+        return type(self).__name__, self.instance_type
+
+    def set_hw_info_from_node(self, other_node) -> None:
+        """
+        Sets the hardware info of the node from another node having the same hardware.
+        :param other_node: the node having the hardware info already pulled
+        """
+        self.mc_props = other_node.mc_props
+        self.hw_info = other_node.hw_info
+
     def find_best_cpu_conversion(self, target_list: dict):
         target_cpus = self.hw_info.sys_info.num_cpus
         best_match = None
@@ -273,6 +291,26 @@ class ClusterGetAccessor:
     def get_gpu_per_worker(self) -> (int, str):
         return self.get_gpu_per_node(SparkNodeType.WORKER)
 
+    def get_shape_fingerprint(self) -> tuple:
+        """
+        Builds a hashable description of the cluster hardware. Clusters with the same fingerprint
+        have the same costs.
+        :return: a tuple describing all the node types of the cluster. None if the hardware
+                 information of any node is not available.
+        """
+        res = []
+        for node_type in (SparkNodeType.MASTER, SparkNodeType.WORKER):
+            node = self.get_node(node_type)
+            if node is None or node.hw_info is None or node.hw_info.sys_info is None:
+                return None
+            res.append((SparkNodeType.tostring(node_type),
+                        self.get_node_instance_type(node_type),
+                        self.get_nodes_cnt(node_type),
+                        self.get_node_core_count(node_type),
+                        self.get_node_mem_mb(node_type),
+                        self.get_gpu_per_node(node_type)))
+        return tuple(res)
+
 
 @dataclass
 class CMDDriverBase:
@@ -290,6 +328,9 @@ class CMDDriverBase:
     timeout: int = 0
     env_vars: dict = field(default_factory=dict, init=False)
     logger: Logger = None
+    # nodes holding the hardware info already pulled during the session, keyed by hardware
+    hw_info_nodes: dict = field(default_factory=dict, init=False)
+    hw_info_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
 
     def get_env_var(self, key: str):
         return self.env_vars.get(key)
@@ -372,7 +413,8 @@ class CMDDriverBase:
                     cmd: Union[str, list],
                     cmd_input: str = None,
                     fail_ok: bool = False,
-                    env_vars: dict = None) -> str:
+                    env_vars: dict = None,
+                    stream_lines_cb: Callable[[str, str], None] = None) -> str:
 
         def process_credentials_option(cmd: list):
             res = []
@@ -460,7 +502,9 @@ class CMDDriverBase:
             'fail_ok': fail_ok,
             'cmd_input': cmd_input,
             'env_vars': env_vars,
-            'process_streams_cb': process_streams
+            # in streaming mode, the lines are already handled by the callback
+            'process_streams_cb': process_streams if stream_lines_cb is None else None,
+            'stream_lines_cb': stream_lines_cb
         }
         sys_cmd = SysCmd().build(cmd_args)
         return sys_cmd.exec()
@@ -546,17 +590,18 @@ class CMDDriverBase:
         :param submit_args: the arguments specified by the user that reflects on the platform.
         :return: a dictionary in the format of {"jvmArgs": {}, "envArgs": {}}
         """
-        jvm_heap_size = submit_args.get('jvmMaxHeapSize')
-        xmx_key = f'Xmx{jvm_heap_size}g'
         res = {
             'jvmArgs': {
                 # TODO: setting the AWS access keys from jvm arguments did not work
                 # 'Dspark.hadoop.fs.s3a.secret.key': aws_access_key,
                 # 'Dspark.hadoop.fs.s3a.access.key': aws_access_id
-                xmx_key: ''
             },
             'envArgs': {}
         }
+        jvm_heap_size = submit_args.get('jvmMaxHeapSize')
+        if jvm_heap_size is not None:
+            # when the heap is not set, the tool sizes the JVM automatically
+            res['jvmArgs'][f'Xmx{jvm_heap_size}g'] = ''
         rapids_configs = self.get_rapids_job_configs(self.cloud_ctxt.get('deployMode'))
         if not rapids_configs:
             return res
@@ -635,6 +680,20 @@ class PlatformBase:
     def _install_storage_driver(self):
         raise NotImplementedError
 
+    def _select_storage_backend(self):
+        """
+        Wraps the storage driver of the platform with the in-process driver when the platform
+        configuration (or the STORAGE_BACKEND env-var) selects the "cspfs" backend. Otherwise, the
+        storage commands are executed by the CLI of the platform.
+        """
+        def_backend = self.configs.get_value_silent('environment', 'storageBackend') or 'cli'
+        storage_backend = Utils.get_rapids_tools_env('STORAGE_BACKEND', def_backend)
+        if storage_backend == 'cspfs':
+            self.logger.info('Using the in-process storage driver')
+            self.storage = CspFsStorageDriver(fallback=self.storage)
+        elif storage_backend != 'cli':
+            self.logger.warning('Ignoring unknown storage backend [%s]. Using the platform CLI', storage_backend)
+
     def _get_config_environment(self, *key_strs) -> Any:
         return self.configs.get_value('environment', *key_strs)
 
@@ -766,6 +825,7 @@ class PlatformBase:
         self._parse_arguments(self.ctxt_args)
         self.cli = self._create_cli_instance()
         self._install_storage_driver()
+        self._select_storage_backend()
 
     def update_ctxt_notes(self, note_key, note_value):
         self.ctxt['notes'].update({note_key: note_value})
@@ -865,6 +925,8 @@ class ClusterBase(ClusterGetAccessor):
     nodes: dict = field(default_factory=dict, init=False)
     props: AbstractPropertiesContainer = field(default=None, init=False)
     logger: Logger = field(default=ToolLogging.get_and_setup_logger('rapids.tools.cluster'), init=False)
+    # max number of the hardware lookups running concurrently
+    HW_INFO_MAX_WORKERS = 16
 
     @staticmethod
     def _verify_workers_exist(has_no_workers_cb: Callable[[], bool]):
@@ -881,6 +943,35 @@ class ClusterBase(ClusterGetAccessor):
         self.cli = self.platform.cli
         self.region = self.cli.get_region()
 
+    def _fetch_and_set_nodes_hw_info(self, nodes: list) -> None:
+        """
+        Sets the hardware info of the nodes. The info is pulled once per distinct hardware, the
+        distinct lookups run concurrently, and the results are kept by the cli for the rest of
+        the session.
+        :param nodes: the cluster nodes missing the hardware info
+        """
+        pending_nodes = {}
+        with self.cli.hw_info_lock:
+            for node in nodes:
+                hw_key = node.get_hw_info_key()
+                if hw_key not in self.cli.hw_info_nodes:
+                    pending_nodes.setdefault(hw_key, node)
+        if pending_nodes:
+            self.logger.info('Pulling the hardware info of %d distinct node types for %d nodes',
+                             len(pending_nodes), len(nodes))
+            with ThreadPoolExecutor(max_workers=min(len(pending_nodes), self.HW_INFO_MAX_WORKERS)) as executor:
+                futures = {hw_key: executor.submit(node.fetch_and_set_hw_info, self.cli)
+                           for hw_key, node in pending_nodes.items()}
+            for hw_key, future in futures.items():
+                # raise the failure of any of the lookups
+                future.result()
+                with self.cli.hw_info_lock:
+                    self.cli.hw_info_nodes.setdefault(hw_key, pending_nodes[hw_key])
+        for node in nodes:
+            hw_node = self.cli.hw_info_nodes[node.get_hw_info_key()]
+            if hw_node is not node:
+                node.set_hw_info_from_node(hw_node)
+
     def _init_connection(self, cluster_id: str = None,
                          props: str = None) -> dict:
         name = cluster_id
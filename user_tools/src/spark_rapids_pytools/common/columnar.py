@@ -0,0 +1,76 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Writing and reading the reports of the tools as typed columnar files."""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def get_arrow_type(type_alias: str) -> pa.DataType:
+    """
+    :param type_alias: the name of an arrow type (i.e., string, int64, double) or a list of
+           such a type written as list<string>
+    """
+    if type_alias.startswith('list<') and type_alias.endswith('>'):
+        return pa.list_(get_arrow_type(type_alias[len('list<'):-1]))
+    return pa.type_for_alias(type_alias)
+
+
+def df_to_arrow_table(df: pd.DataFrame, schema_conf: dict) -> pa.Table:
+    """
+    Converts the dataframe into a table having a stable schema. The columns of the schema come
+    first in the same order and with the same types, even when they are missing from the dataframe.
+    The remaining columns of the dataframe are appended with their inferred types.
+    :param df: the report to convert
+    :param schema_conf: the arrow type alias of each column of the schema
+    """
+    fields = []
+    arrays = []
+    for col_name, type_alias in schema_conf.items():
+        arrow_type = get_arrow_type(type_alias)
+        if col_name in df.columns:
+            arrays.append(pa.array(df[col_name], from_pandas=True).cast(arrow_type))
+        else:
+            arrays.append(pa.nulls(len(df), type=arrow_type))
+        fields.append(pa.field(col_name, arrow_type))
+    for col_name in df.columns:
+        if col_name not in schema_conf:
+            col_array = pa.array(df[col_name], from_pandas=True)
+            arrays.append(col_array)
+            fields.append(pa.field(str(col_name), col_array.type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def write_parquet_report(df: pd.DataFrame, file_path: str, schema_conf: dict) -> str:
+    pq.write_table(df_to_arrow_table(df, schema_conf), file_path)
+    return file_path
+
+
+def get_columnar_file_path(csv_file_path: str) -> str:
+    return f'{os.path.splitext(csv_file_path)[0]}.parquet'
+
+
+def read_tabular_report(csv_file_path: str) -> pd.DataFrame:
+    """
+    Reads a tabular report from its parquet copy when it exists next to the CSV file. The parquet
+    file keeps the types of the columns and is parsed faster than the CSV file.
+    """
+    parquet_file_path = get_columnar_file_path(csv_file_path)
+    if os.path.exists(parquet_file_path):
+        return pd.read_parquet(parquet_file_path, engine='pyarrow')
+    return pd.read_csv(csv_file_path)
@@ -15,10 +15,11 @@
 """Implementation of helpers and utilities related to manage the properties and dictionaries."""
 
 import json
+import re
 from dataclasses import field, dataclass
 from json import JSONDecodeError
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, ClassVar
 
 import yaml
 
@@ -144,3 +145,125 @@ class JSONPropertiesContainer(AbstractPropertiesContainer):
     def __post_init__(self):
         self._load_as_json()
         self._init_fields()
+
+
+@dataclass
+class JSONStreamReader:
+    """
+    Incremental reader of large JSON documents. The document is read in chunks and the caller
+    walks through the objects one member at a time, deciding for each member whether to decode,
+    descend into, or skip its value. Only the member being decoded is materialized in memory.
+    The reader is used as follows:
+
+        for key in reader.iter_object():
+            if key == 'wanted':
+                value = reader.read_value()
+            else:
+                reader.skip_value()
+
+    The value of each key yielded by iter_object() must be consumed before moving to the next key.
+    """
+    file_obj: Any
+    chunk_size: int = 1 << 20
+    buf: str = field(default='', init=False)
+    pos: int = field(default=0, init=False)
+    eof: bool = field(default=False, init=False)
+    decoder: json.JSONDecoder = field(default_factory=json.JSONDecoder, init=False)
+    ws_pattern: ClassVar[re.Pattern] = re.compile(r'[ \t\n\r]*')
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file_obj.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # drop the consumed content to keep the buffer bounded
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            self.pos = self.ws_pattern.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise RuntimeError('Incorrect format of JSON File: unexpected end of content')
+
+    def _expect(self, ch: str) -> None:
+        if self._peek() != ch:
+            raise RuntimeError(f'Incorrect format of JSON File: expected \'{ch}\' at offset {self.pos}')
+        self.pos += 1
+
+    def read_value(self) -> Any:
+        """
+        Decodes the next value. It should be used for values that fit in memory.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end_pos = self.decoder.raw_decode(self.buf, self.pos)
+                # numbers can be split between two chunks. They are complete only when followed by a delimiter
+                if (self.eof or self.buf[end_pos - 1] in '"}]el' or
+                        (end_pos < len(self.buf) and self.buf[end_pos] in ' \t\n\r,]}')):
+                    self.pos = end_pos
+                    return value
+            except JSONDecodeError as e:
+                if self.eof:
+                    raise RuntimeError('Incorrect format of JSON File') from e
+            # the value spans beyond the buffer. If the content is over, the next iteration
+            # either returns the value or fails
+            self._fill()
+
+    def iter_object(self):
+        """
+        Iterates on the keys of the next object without decoding its values.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise RuntimeError('Incorrect format of JSON File: object keys must be strings')
+            self._expect(':')
+            yield key
+            next_ch = self._peek()
+            self.pos += 1
+            if next_ch == '}':
+                return
+            if next_ch != ',':
+                raise RuntimeError(f'Incorrect format of JSON File: unexpected \'{next_ch}\' at offset {self.pos}')
+
+    def iter_array(self):
+        """
+        Iterates on the elements of the next array without decoding them.
+        """
+        self._expect('[')
+        if self._peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            next_ch = self._peek()
+            self.pos += 1
+            if next_ch == ']':
+                return
+            if next_ch != ',':
+                raise RuntimeError(f'Incorrect format of JSON File: unexpected \'{next_ch}\' at offset {self.pos}')
+
+    def skip_value(self) -> None:
+        """
+        Skips the next value. Objects and arrays are skipped one member at a time.
+        """
+        next_ch = self._peek()
+        if next_ch == '{':
+            for _ in self.iter_object():
+                self.skip_value()
+        elif next_ch == '[':
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
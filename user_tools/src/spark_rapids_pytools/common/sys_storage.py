@@ -17,13 +17,17 @@
 import datetime
 import glob
 import hashlib
+import json
+import mmap
 import os
 import pathlib
 import re
 import shutil
 import ssl
 import subprocess
-import urllib
+import time
+import urllib.error
+import urllib.request
 from dataclasses import dataclass
 from functools import partial
 from itertools import islice
@@ -31,11 +35,10 @@ from shutil import rmtree
 from typing import List
 
 import certifi
-from fastcore.all import urlsave
-from fastprogress.fastprogress import progress_bar
 
 from spark_rapids_pytools.common.exceptions import StorageException
-from spark_rapids_pytools.common.utilities import Utils, SysCmd
+from spark_rapids_pytools.common.tracing import ToolTracer
+from spark_rapids_pytools.common.utilities import Utils, SysCmd, ToolLogging
 
 
 class FSUtil:
@@ -106,6 +109,37 @@ class FSUtil:
             return shutil.copy2(abs_src, abs_dest)
         return shutil.copytree(abs_src, abs_dest, dirs_exist_ok=True)
 
+    @classmethod
+    def link_resource(cls, src: str, dest: str) -> str:
+        """
+        Makes the file src available as dest without copying its content when possible. A hardlink
+        is created first, then a symlink because hardlinks fail across devices. Otherwise, the file
+        is copied. Directories are symlinked or copied recursively.
+        :param src: the path of the existing file or directory
+        :param dest: the path of the new file. It is replaced if it exists
+        :return: the path of the new file
+        """
+        if os.path.isdir(dest) and not os.path.islink(dest):
+            rmtree(dest)
+        elif os.path.lexists(dest):
+            os.remove(dest)
+        if os.path.isdir(src):
+            try:
+                os.symlink(src, dest, target_is_directory=True)
+            except OSError:
+                shutil.copytree(src, dest, symlinks=True)
+            return dest
+        try:
+            os.link(src, dest)
+            return dest
+        except OSError:
+            pass
+        try:
+            os.symlink(src, dest)
+        except OSError:
+            shutil.copyfile(src, dest)
+        return dest
+
     @classmethod
     def cache_resource(cls, src: str, dest: str):
         abs_src = os.path.abspath(src)
@@ -132,10 +166,15 @@ class FSUtil:
         return dest_file
 
     @classmethod
+    @ToolTracer.traced('Downloading url', 'storage')
     def fast_download_url(cls, url: str, fpath: str, timeout=None, pbar_enabled=False) -> str:
         """
         Download the given url and display a progress bar
         """
+        # fastcore and fastprogress are slow to import. They are needed only by the downloads
+        from fastcore.all import urlsave  # pylint: disable=import-outside-toplevel
+        from fastprogress.fastprogress import progress_bar  # pylint: disable=import-outside-toplevel
+
         pbar = progress_bar([])
 
         def progress_bar_cb(count=1, bsize=1, total_size=None):
@@ -185,6 +224,110 @@ class FSUtil:
             raise RuntimeError(f'Failed downloading resource {src_url}')
         return True
 
+    @classmethod
+    def get_url_metadata_file(cls, cache_file: str) -> str:
+        return f'{cache_file}.meta.json'
+
+    @classmethod
+    def load_url_metadata(cls, cache_file: str) -> dict:
+        meta_file = cls.get_url_metadata_file(cache_file)
+        if not os.path.exists(meta_file):
+            return {}
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as meta_fd:
+                return json.load(meta_fd)
+        except (OSError, ValueError):
+            # a corrupted metadata file only disables the conditional requests
+            return {}
+
+    @classmethod
+    def get_last_validation_time(cls, cache_file: str) -> float:
+        """
+        Gets the last time the cached content was known to match the remote resource. This is the
+        latest of the file modification time and the last successful conditional request.
+        """
+        url_meta = cls.load_url_metadata(cache_file)
+        return max(os.path.getmtime(cache_file), url_meta.get('checkedAt', 0))
+
+    @classmethod
+    def cache_from_url_conditional(cls,
+                                   src_url: str,
+                                   cache_file: str,
+                                   file_checks: dict = None,
+                                   timeout: float = None) -> bool:
+        """
+        download a resource from given URL as a destination cache_file. Unlike cache_from_url, an
+        expired cache_file is revalidated using HTTP conditional requests (ETag/Last-Modified).
+        The validators are saved in a sidecar metadata file next to the cache_file so that an
+        unchanged resource costs a single round-trip instead of a full download.
+        :param src_url: HTTP url containing the resource
+        :param cache_file: the file where the resource is saved
+        :param file_checks: a dictionary that contains the criteria to check that the file is the
+               same.
+        :param timeout: timeout in seconds of the HTTP request
+        :return: true if the file is re-downloaded. False, if the cached file is not modified.
+        """
+        file_checks = file_checks or {}
+        integrity_checks = {k: v for k, v in file_checks.items() if k != 'cacheExpirationSecs'}
+        curr_time_stamp = datetime.datetime.now().timestamp()
+        url_meta = cls.load_url_metadata(cache_file)
+        cache_exists = os.path.exists(cache_file)
+        if url_meta.get('url') != src_url:
+            # the validators belong to a different resource
+            url_meta = {}
+        if cache_exists:
+            expiration_time_s = file_checks.get('cacheExpirationSecs')
+            age_s = curr_time_stamp - cls.get_last_validation_time(cache_file)
+            not_expired = not expiration_time_s or age_s <= expiration_time_s
+            if not_expired and cls.verify_file(cache_file, integrity_checks):
+                return False
+        req_headers = {}
+        if cache_exists:
+            if url_meta.get('etag'):
+                req_headers['If-None-Match'] = url_meta['etag']
+            if url_meta.get('lastModified'):
+                req_headers['If-Modified-Since'] = url_meta['lastModified']
+        req = urllib.request.Request(src_url, headers=req_headers)
+        context = ssl.create_default_context(cafile=certifi.where())
+        tmp_file = f'{cache_file}.{os.getpid()}.download'
+        try:
+            with urllib.request.urlopen(req, context=context, timeout=timeout) as resp:
+                with open(tmp_file, 'wb') as f:
+                    shutil.copyfileobj(resp, f)
+                url_meta = {
+                    'url': src_url,
+                    'etag': resp.headers.get('ETag'),
+                    'lastModified': resp.headers.get('Last-Modified')
+                }
+        except urllib.error.HTTPError as http_err:
+            cls.remove_path(tmp_file, fail_ok=True)
+            if http_err.code != 304 or not cls.verify_file(cache_file, integrity_checks):
+                raise RuntimeError(f'Failed downloading resource {src_url}') from http_err
+            # the resource did not change since the last download
+            url_meta['checkedAt'] = curr_time_stamp
+            cls._save_url_metadata(cache_file, url_meta)
+            return False
+        except OSError as err:
+            cls.remove_path(tmp_file, fail_ok=True)
+            raise RuntimeError(f'Failed downloading resource {src_url}') from err
+        os.replace(tmp_file, cache_file)
+        # update modified time and access time
+        os.utime(cache_file, times=(curr_time_stamp, curr_time_stamp))
+        if not cls.verify_file(cache_file, integrity_checks):
+            raise RuntimeError(f'Failed downloading resource {src_url}')
+        url_meta['checkedAt'] = curr_time_stamp
+        cls._save_url_metadata(cache_file, url_meta)
+        return True
+
+    @classmethod
+    def _save_url_metadata(cls, cache_file: str, url_meta: dict) -> None:
+        # write then rename the file so that concurrent refreshes never leave a partial file
+        meta_file = cls.get_url_metadata_file(cache_file)
+        tmp_file = f'{meta_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as meta_fd:
+            json.dump(url_meta, meta_fd)
+        os.replace(tmp_file, meta_file)
+
     @classmethod
     def get_home_directory(cls) -> str:
         return os.path.expanduser('~')
@@ -301,6 +444,7 @@ class StorageDriver:
         # this is a folder-to-folder download
         return FSUtil.copy_resource(src, dest)
 
+    @ToolTracer.traced('Downloading resource', 'storage')
     def download_resource(self,
                           src: str,
                           dest: str,
@@ -328,6 +472,7 @@ class StorageDriver:
         del exclude_pattern
         return FSUtil.copy_resource(src, dest)
 
+    @ToolTracer.traced('Uploading resource', 'storage')
     def upload_resource(self,
                         src: str,
                         dest: str,
@@ -344,9 +489,41 @@ class StorageDriver:
                 raise store_ex
             return None
 
+    def _sync_remote_dest(self, src: str, dest: str, exclude_pattern: str = None):
+        # drivers that cannot compare the remote files upload all the resources
+        return self._upload_remote_dest(src, dest, exclude_pattern=exclude_pattern)
+
+    @ToolTracer.traced('Syncing resource', 'storage')
+    def sync_resource(self,
+                      src: str,
+                      dest: str,
+                      fail_ok: bool = False,
+                      exclude_pattern: str = None) -> str:
+        """
+        Upload a local resource into the dest directory, skipping the files that did not change
+        since the previous sync. Drivers that do not support the incremental sync copy everything
+        similar to upload_resource.
+        :param src: the local path of the resource. It can be a single file or a directory
+        :param dest: the directory where the resource is being copied
+        :param fail_ok: whether to raise an exception on failure
+        :param exclude_pattern: pattern of the file names that are not copied
+        :return: full path of the destination resource dest/resource_name
+        """
+        try:
+            abs_src = FSUtil.get_abs_path(src)
+            if not self.resource_exists(abs_src):
+                raise StorageException(f'Resource {abs_src} cannot be copied to {dest}. '
+                                       f'{abs_src} does not exist')
+            return self._sync_remote_dest(abs_src, dest, exclude_pattern=exclude_pattern)
+        except StorageException as store_ex:
+            if not fail_ok:
+                raise store_ex
+            return None
+
     def _delete_path(self, src, fail_ok: bool = False):
         FSUtil.remove_path(src, fail_ok=fail_ok)
 
+    @ToolTracer.traced('Removing resource', 'storage')
     def remove_resource(self,
                         src: str,
                         fail_ok: bool = False):
@@ -393,6 +570,49 @@ class FileVerifier:
     GPG_TIMEOUT_SEC = 60    # Timeout for GPG process
     READ_CHUNK_SIZE = 8192  # Size of chunk in bytes
     GPG_SIGNATURE_ENABLED = False  # enable/disable gpg-signature usage
+    # Size of the slices of the mapped file passed to the hash function. hashlib releases the GIL
+    # on large buffers, so the dependencies verified by the threads of the download pool are
+    # hashed in parallel
+    HASH_BLOCK_SIZE = 8 << 20
+
+    @classmethod
+    def _hash_file_content(cls, file_path: str, algorithm: str) -> str:
+        hash_function = cls.SUPPORTED_ALGORITHMS[algorithm]()
+        with open(file_path, 'rb') as file:
+            try:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                    mapped_view = memoryview(mapped_file)
+                    try:
+                        for offset in range(0, len(mapped_view), cls.HASH_BLOCK_SIZE):
+                            hash_function.update(mapped_view[offset:offset + cls.HASH_BLOCK_SIZE])
+                    finally:
+                        mapped_view.release()
+            except ValueError:
+                # empty files cannot be mapped
+                while chunk := file.read(cls.READ_CHUNK_SIZE):
+                    hash_function.update(chunk)
+        return hash_function.hexdigest()
+
+    @classmethod
+    def calculate_hash(cls, file_path: str, algorithm: str) -> str:
+        """
+        Calculates the hash of a file. The hashes are not memoized here: the dependency cache
+        records the verified files in a sidecar and skips their verification while they do not
+        change.
+
+        :param file_path: Path of the file.
+        :param algorithm: Name of the hash algorithm
+        :return: the hex digest of the file content
+        """
+        file_size = os.path.getsize(file_path)
+        start_time = time.monotonic()
+        hash_value = cls._hash_file_content(file_path, algorithm)
+        elapsed_time = max(time.monotonic() - start_time, 1e-6)
+        size_mb = file_size / (1 << 20)
+        ToolLogging.get_and_setup_logger('rapids.tools.file.verifier').info(
+            'Verified %s: %.2f MB in %.3f seconds (%.2f MB/s)',
+            file_path, size_mb, elapsed_time, size_mb / elapsed_time)
+        return hash_value
 
     @classmethod
     def get_signature_file(cls, file_url: str, dest_folder: str):
@@ -460,15 +680,7 @@ class FileVerifier:
             # Cannot verify file
             return False
 
-        # Helper function to calculate the hash of the file using the specified algorithm
-        def calculate_hash(hash_algorithm):
-            hash_function = cls.SUPPORTED_ALGORITHMS[hash_algorithm]()
-            with open(file_path, 'rb') as file:
-                while chunk := file.read(cls.READ_CHUNK_SIZE):
-                    hash_function.update(chunk)
-            return hash_function.hexdigest()
-
-        calculated_hash = calculate_hash(algorithm)
+        calculated_hash = cls.calculate_hash(file_path, algorithm)
         return calculated_hash == expected_hash
 
     @classmethod
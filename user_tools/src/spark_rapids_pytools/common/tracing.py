@@ -0,0 +1,232 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tracing of the phases and the steps executed by the tools."""
+
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, ClassVar, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # the resource usage is not available on all the OSes
+    resource = None
+
+
+def _get_peak_rss_mb(who: int) -> float:
+    if resource is None:
+        return 0.0
+    max_rss = resource.getrusage(who).ru_maxrss
+    # the peak RSS is reported in bytes on macOS and in kilobytes on Linux
+    if sys.platform == 'darwin':
+        return max_rss / (1 << 20)
+    return max_rss / (1 << 10)
+
+
+def _get_children_cpu_secs() -> float:
+    if resource is None:
+        return 0.0
+    children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return children_usage.ru_utime + children_usage.ru_stime
+
+
+@dataclass
+class TraceSpan:
+    """
+    A timed step of the tool run.
+    :param parent_id: the id of the enclosing span. A span running in a pool thread is attached to
+           the root span of the run
+    :param is_root: whether the span encloses the entire run
+    :param wall_secs: the elapsed time of the step
+    :param cpu_secs: the CPU time of the thread running the step. The spans of the system commands
+           add the CPU time of the child processes reaped during the step (i.e., the JVM). That
+           time is process-wide, so it includes the children reaped by other threads meanwhile
+    :param peak_rss_mb: the peak RSS of the process at the end of the step
+    :param children_peak_rss_mb: the peak RSS of the largest child process reaped at the end of the
+           step. It is not added to the peak of the process because they may not overlap
+    """
+    name: str
+    category: str
+    thread_id: int
+    span_id: int
+    parent_id: Optional[int]
+    is_root: bool
+    start_secs: float
+    wall_secs: float
+    cpu_secs: float
+    peak_rss_mb: float
+    children_peak_rss_mb: float
+    args: dict = field(default_factory=dict)
+
+    def to_trace_event(self, pid: int) -> dict:
+        return {
+            'name': self.name,
+            'cat': self.category,
+            'ph': 'X',
+            'ts': round(self.start_secs * 1e6),
+            'dur': round(self.wall_secs * 1e6),
+            'pid': pid,
+            'tid': self.thread_id,
+            'args': {
+                'spanId': self.span_id,
+                'parentId': self.parent_id,
+                'cpuSecs': round(self.cpu_secs, 6),
+                'peakRssMB': round(self.peak_rss_mb, 3),
+                'childrenPeakRssMB': round(self.children_peak_rss_mb, 3),
+                **self.args
+            }
+        }
+
+
+@dataclass
+class ToolTracer:
+    """
+    Records the nested spans of the phases and the steps of a tool run. Only the active tracer
+    records the spans, so the instrumented code costs a single check when tracing is disabled.
+    The spans are written as a trace file in the Chrome trace-event format that can be loaded
+    in chrome://tracing or Perfetto.
+    """
+    name: str
+    spans: List[TraceSpan] = field(default_factory=list, init=False)
+    start_time: float = field(default_factory=time.perf_counter, init=False)
+    lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    thread_names: dict = field(default_factory=dict, init=False)
+    root_span_id: Optional[int] = field(default=None, init=False)
+    span_ids: Iterator[int] = field(default_factory=itertools.count, init=False)
+
+    _active: ClassVar[Optional['ToolTracer']] = None
+    _thread_state: ClassVar[threading.local] = threading.local()
+
+    def activate(self) -> 'ToolTracer':
+        ToolTracer._active = self
+        return self
+
+    def deactivate(self) -> None:
+        if ToolTracer._active is self:
+            ToolTracer._active = None
+
+    @classmethod
+    def get_active(cls) -> Optional['ToolTracer']:
+        return cls._active
+
+    def _add_span(self, span: TraceSpan) -> None:
+        with self.lock:
+            self.spans.append(span)
+            self.thread_names.setdefault(span.thread_id, threading.current_thread().name)
+
+    @classmethod
+    @contextmanager
+    def span(cls, name: str, category: str = 'step', is_root: bool = False,
+             children_cpu: bool = False, **args):
+        """
+        Times the enclosed block as a span of the active tracer.
+        :param name: the name of the span
+        :param category: the category of the span (i.e., phase, cmd, storage, dataframe)
+        :param is_root: whether the span encloses the entire run
+        :param children_cpu: whether to add the CPU time of the child processes reaped during the
+               block. It is meant for the spans waiting on a system command
+        :param args: extra information attached to the span. The caller can add entries to the
+               yielded dictionary while the block runs.
+        """
+        tracer = cls._active
+        if tracer is None:
+            yield args
+            return
+        open_spans = getattr(cls._thread_state, 'open_spans', None)
+        if open_spans is None:
+            open_spans = cls._thread_state.open_spans = []
+        with tracer.lock:
+            span_id = next(tracer.span_ids)
+            if is_root and tracer.root_span_id is None:
+                tracer.root_span_id = span_id
+        parent_id = open_spans[-1] if open_spans else tracer.root_span_id
+        if parent_id == span_id:
+            parent_id = None
+        open_spans.append(span_id)
+        start_time = time.perf_counter()
+        start_cpu = time.thread_time()
+        if children_cpu:
+            start_cpu += _get_children_cpu_secs()
+        try:
+            yield args
+        finally:
+            end_time = time.perf_counter()
+            end_cpu = time.thread_time()
+            if children_cpu:
+                end_cpu += _get_children_cpu_secs()
+            open_spans.pop()
+            if is_root:
+                with tracer.lock:
+                    if tracer.root_span_id == span_id:
+                        tracer.root_span_id = None
+            peak_rss_mb, children_peak_rss_mb = 0.0, 0.0
+            if resource is not None:
+                peak_rss_mb = _get_peak_rss_mb(resource.RUSAGE_SELF)
+                children_peak_rss_mb = _get_peak_rss_mb(resource.RUSAGE_CHILDREN)
+            tracer._add_span(TraceSpan(name=name,
+                                       category=category,
+                                       thread_id=threading.get_ident(),
+                                       span_id=span_id,
+                                       parent_id=parent_id,
+                                       is_root=is_root,
+                                       start_secs=start_time - tracer.start_time,
+                                       wall_secs=end_time - start_time,
+                                       cpu_secs=end_cpu - start_cpu,
+                                       peak_rss_mb=peak_rss_mb,
+                                       children_peak_rss_mb=children_peak_rss_mb,
+                                       args=args))
+
+    @classmethod
+    def traced(cls, name: str, category: str = 'step') -> Callable:
+        """Decorator that times every call of the function as a span of the active tracer."""
+        def decorator(func_cb: Callable):
+            @functools.wraps(func_cb)
+            def wrapper(*args, **kwargs):
+                with cls.span(name, category):
+                    return func_cb(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def get_top_spans(self, top_n: int, include_root: bool = False) -> List[TraceSpan]:
+        """
+        :param top_n: the number of spans to return
+        :param include_root: whether to include the span enclosing the entire run
+        :return: the spans having the longest wall time, including the spans of the pool threads
+        """
+        with self.lock:
+            spans = [span for span in self.spans if include_root or not span.is_root]
+        return sorted(spans, key=lambda span: span.wall_secs, reverse=True)[:top_n]
+
+    def write_trace_file(self, file_path: str) -> str:
+        pid = os.getpid()
+        with self.lock:
+            trace_events = [{
+                'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': self.name}
+            }]
+            trace_events.extend({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id,
+                                 'args': {'name': thread_name}}
+                                for thread_id, thread_name in self.thread_names.items())
+            trace_events.extend(span.to_trace_event(pid)
+                                for span in sorted(self.spans, key=lambda span: span.start_secs))
+        with open(file_path, 'w', encoding='utf-8') as trace_fd:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, trace_fd)
+        return file_path
@@ -14,11 +14,15 @@
 
 """Definition of global utilities and helpers methods."""
 
+import atexit
 import datetime
-import logging.config
+import logging.handlers
+import multiprocessing
 import os
+import queue
 import re
 import secrets
+import signal
 import ssl
 import string
 import subprocess
@@ -26,6 +30,7 @@ import sys
 import threading
 import time
 import urllib
+from collections import deque
 from shutil import make_archive, which
 from dataclasses import dataclass, field
 from logging import Logger
@@ -33,7 +38,6 @@ from typing import Callable, Any
 
 import certifi
 import chevron
-from bs4 import BeautifulSoup
 from packaging.version import Version
 from progress.spinner import PixelSpinner
 from pygments import highlight
@@ -41,6 +45,7 @@ from pygments.formatters import get_formatter_by_name
 from pygments.lexers import get_lexer_by_name
 
 from spark_rapids_pytools import get_version
+from spark_rapids_pytools.common.tracing import ToolTracer
 
 
 class Utils:
@@ -103,7 +108,8 @@ class Utils:
         version_pattern = re.compile(version_regex)
         with urllib.request.urlopen(url_base, context=context) as resp:
             html_content = resp.read()
-            # Parse the HTML content using BeautifulSoup
+            # Parse the HTML content using BeautifulSoup. It is imported here because it is slow to load
+            from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
             soup = BeautifulSoup(html_content, 'html.parser')
             # Find all the links with title in the format of "xx.xx.xx"
             links = soup.find_all('a', {'title': version_pattern})
@@ -209,32 +215,124 @@ class Utils:
         return os.uname().sysname
 
 
+class _StderrHandler(logging.StreamHandler):
+    """
+    Writes the records to the current sys.stderr. This keeps the console output following the
+    redirections of sys.stderr made after the logging is set up.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stderr)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _LabelsFilter(logging.Filter):
+    """Accepts the records of the loggers set up by the tools."""
+
+    def __init__(self, labels: set):
+        super().__init__()
+        self.labels = labels
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.name in self.labels
+
+
 class ToolLogging:
-    """Holds global utilities used for logging."""
+    """
+    Holds global utilities used for logging.
+    The logging is set up once per process. The loggers send the records to a queue, and a
+    listener thread writes them to the console and to the log file of the run. This way, logging
+    does not block the callers on the I/O.
+    """
+    LOG_FORMAT = '{asctime} {levelname} {name}: {message}'
+
+    _lock = threading.RLock()
+    _setup_pid: int = None
+    _log_queue: queue.Queue = None
+    _listener: logging.handlers.QueueListener = None
+    _queue_handler: logging.Handler = None
+    _console_handler: logging.Handler = None
+    _file_handler: logging.Handler = None
+    _log_file: str = None
+    _labels: set = set()
+
+    @classmethod
+    def _get_formatter(cls) -> logging.Formatter:
+        return logging.Formatter(cls.LOG_FORMAT, style='{')
 
     @classmethod
-    def get_log_dict(cls, args):
-        return {
-            'version': 1,
-            'disable_existing_loggers': False,
-            'formatters': {
-                'simple': {
-                    'format': '{asctime} {levelname} {name}: {message}',
-                    'style': '{',
-                },
-            },
-            'handlers': {
-                'console': {
-                    'class': 'logging.StreamHandler',
-                    'formatter': 'simple',
-                    'level': 'DEBUG' if args.get('debug') else 'ERROR',
-                },
-            },
-            'root': {
-                'handlers': ['console'],
-                'level': 'DEBUG',
-            },
-        }
+    def _get_console_level(cls, debug_enabled: bool) -> int:
+        return logging.DEBUG if debug_enabled else logging.ERROR
+
+    @classmethod
+    def _setup_logging(cls, debug_enabled: bool) -> None:
+        cls._console_handler = _StderrHandler()
+        cls._console_handler.setFormatter(cls._get_formatter())
+        cls._console_handler.setLevel(cls._get_console_level(debug_enabled))
+        cls._file_handler = None
+        cls._log_file = None
+        cls._log_queue = queue.Queue()
+        cls._listener = logging.handlers.QueueListener(cls._log_queue, cls._console_handler,
+                                                       respect_handler_level=True)
+        cls._listener.start()
+        cls._queue_handler = logging.handlers.QueueHandler(cls._log_queue)
+        root_logger = logging.getLogger()
+        for handler in list(root_logger.handlers):
+            root_logger.removeHandler(handler)
+        root_logger.setLevel(logging.DEBUG)
+        if cls._setup_pid is None:
+            atexit.register(cls.shutdown)
+        cls._setup_pid = os.getpid()
+
+    @classmethod
+    def _set_log_file(cls, log_file: str) -> None:
+        # the records of the previous run are written before switching to the new file
+        cls.flush()
+        prev_file_handler = cls._file_handler
+        cls._file_handler = None
+        if log_file:
+            cls._file_handler = logging.FileHandler(log_file, delay=True)
+            cls._file_handler.setLevel(logging.DEBUG)
+            cls._file_handler.setFormatter(cls._get_formatter())
+            cls._file_handler.addFilter(_LabelsFilter(cls._labels))
+        cls._listener.handlers = tuple(h for h in (cls._console_handler, cls._file_handler) if h is not None)
+        cls._log_file = log_file
+        if prev_file_handler is not None:
+            prev_file_handler.close()
+
+    @classmethod
+    def flush(cls) -> None:
+        """Waits until the listener writes all the records queued so far."""
+        if cls._setup_pid == os.getpid() and cls._listener is not None:
+            cls._log_queue.join()
+            for handler in cls._listener.handlers:
+                handler.flush()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Writes the queued records and stops the listener."""
+        with cls._lock:
+            if cls._setup_pid == os.getpid() and cls._listener is not None:
+                cls._listener.stop()
+                cls._listener = None
+                if cls._file_handler is not None:
+                    cls._file_handler.close()
+            cls._setup_pid = None
+
+    @classmethod
+    def get_process_pool_context(cls):
+        """
+        Returns the context used to start the workers of the process pools. The workers are spawned
+        because a forked worker would inherit the queue of the listener thread in an unknown state.
+        """
+        return multiprocessing.get_context('spawn')
 
     @classmethod
     def enable_debug_mode(cls):
@@ -247,17 +345,24 @@ class ToolLogging:
     @classmethod
     def get_and_setup_logger(cls, type_label: str, debug_mode: bool = False):
         debug_enabled = bool(Utils.get_rapids_tools_env('LOG_DEBUG', debug_mode))
-        logging.config.dictConfig(cls.get_log_dict({'debug': debug_enabled}))
-        logger = logging.getLogger(type_label)
         log_file = Utils.get_rapids_tools_env('LOG_FILE')
-        # Ensure multiple handlers are not added
-        if log_file and not logger.handlers:
-            fh = logging.FileHandler(log_file)
-            fh.setLevel(logging.DEBUG)
-            formatter = logging.Formatter('{asctime} {levelname} {name}: {message}', style='{')
-            fh.setFormatter(formatter)
-            logger.addHandler(fh)
-        return logger
+        with cls._lock:
+            # a forked process does not inherit the listener thread of its parent
+            if cls._setup_pid != os.getpid() or cls._listener is None:
+                cls._setup_logging(debug_enabled)
+            root_logger = logging.getLogger()
+            # the handlers of the root logger may have been reset by the caller
+            if cls._queue_handler not in root_logger.handlers:
+                root_logger.addHandler(cls._queue_handler)
+            console_level = cls._get_console_level(debug_enabled)
+            if cls._console_handler.level != console_level:
+                # the queued records are written using the previous level
+                cls.flush()
+                cls._console_handler.setLevel(console_level)
+            if log_file != cls._log_file:
+                cls._set_log_file(log_file)
+            cls._labels.add(type_label)
+        return logging.getLogger(type_label)
 
 
 class TemplateGenerator:
@@ -289,6 +394,10 @@ class SysCmd:
     out_std: str = field(default=None, init=False)
     err_std: str = field(default=None, init=False)
     timeout_secs: float = None
+    # when set, the output is streamed line by line to the callback instead of being buffered
+    stream_lines_cb: Callable[[str, str], None] = None
+    # number of lines kept from each stream in streaming mode
+    max_buffered_lines: int = 1000
 
     def has_failed(self):
         return self.expected != self.res and not self.fail_ok
@@ -307,28 +416,7 @@ class SysCmd:
                 sys_env_vars.append(val)
         return sys_env_vars
 
-    def exec(self) -> str:
-        def process_credentials_option(cmd: list):
-            res = []
-            for i, arg in enumerate(cmd):
-                if 'account-key' in cmd[i - 1]:
-                    arg = 'MY_ACCESS_KEY'
-                elif 'fs.azure.account.key' in arg:
-                    arg = arg.split('=')[0] + '=MY_ACCESS_KEY'
-                res.append(arg)
-            return res
-
-        # pylint: disable=subprocess-run-check
-        if isinstance(self.cmd, str):
-            cmd_args = [self.cmd]
-        else:
-            cmd_args = self.cmd[:]
-        # do not dump the entire command to debugging to avoid exposing the env-variables
-        self.logger.debug('submitting system command: <%s>',
-                          Utils.gen_joined_str(' ', process_credentials_option(cmd_args)))
-        full_cmd = self._process_env_vars()
-        full_cmd.extend(cmd_args)
-        actual_cmd = Utils.gen_joined_str(' ', full_cmd)
+    def _run_buffered(self, actual_cmd: str) -> None:
         stdout = subprocess.PIPE
         stderr = subprocess.PIPE
         # pylint: disable=subprocess-run-check
@@ -352,6 +440,87 @@ class SysCmd:
         self.res = c.returncode
         # pylint: enable=subprocess-run-check
         self.err_std = c.stderr if isinstance(c.stderr, str) else c.stderr.decode('utf-8', errors='ignore')
+        self.out_std = c.stdout if isinstance(c.stdout, str) else c.stdout.decode('utf-8', errors='ignore')
+
+    def _run_streaming(self, actual_cmd: str) -> None:
+        """
+        Runs the command while reading its streams line by line on background threads. Each line is
+        passed to stream_lines_cb as soon as it is read. Only the last max_buffered_lines of each
+        stream are kept in memory to report errors and to return the output.
+        """
+        out_lines = deque(maxlen=self.max_buffered_lines)
+        err_lines = deque(maxlen=self.max_buffered_lines)
+        cb_lock = threading.Lock()
+
+        def read_stream(stream, stream_name: str, lines_buffer: deque):
+            for line in stream:
+                line = line.rstrip('\n')
+                lines_buffer.append(line)
+                # the callback is not required to be thread-safe
+                with cb_lock:
+                    self.stream_lines_cb(stream_name, line)
+            stream.close()
+
+        with subprocess.Popen(actual_cmd,
+                              executable='/bin/bash',
+                              shell=True,
+                              stdin=subprocess.DEVNULL if self.cmd_input is None else subprocess.PIPE,
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE,
+                              text=True,
+                              errors='ignore',
+                              start_new_session=True) as proc:
+            readers = [
+                threading.Thread(target=read_stream, args=(proc.stdout, 'stdout', out_lines), daemon=True),
+                threading.Thread(target=read_stream, args=(proc.stderr, 'stderr', err_lines), daemon=True)
+            ]
+            for reader in readers:
+                reader.start()
+            if self.cmd_input is not None:
+                proc.stdin.write(self.cmd_input)
+                proc.stdin.close()
+            try:
+                proc.wait(timeout=self.timeout_secs)
+            except subprocess.TimeoutExpired:
+                # kill the whole group because the children of the shell keep the streams open
+                os.killpg(proc.pid, signal.SIGKILL)
+                raise
+            finally:
+                for reader in readers:
+                    reader.join()
+        self.res = proc.returncode
+        self.out_std = '\n'.join(out_lines)
+        self.err_std = '\n'.join(err_lines)
+
+    def exec(self) -> str:
+        def process_credentials_option(cmd: list):
+            res = []
+            for i, arg in enumerate(cmd):
+                if 'account-key' in cmd[i - 1]:
+                    arg = 'MY_ACCESS_KEY'
+                elif 'fs.azure.account.key' in arg:
+                    arg = arg.split('=')[0] + '=MY_ACCESS_KEY'
+                res.append(arg)
+            return res
+
+        if isinstance(self.cmd, str):
+            cmd_args = [self.cmd]
+        else:
+            cmd_args = self.cmd[:]
+        # do not dump the entire command to debugging to avoid exposing the env-variables
+        self.logger.debug('submitting system command: <%s>',
+                          Utils.gen_joined_str(' ', process_credentials_option(cmd_args)))
+        full_cmd = self._process_env_vars()
+        full_cmd.extend(cmd_args)
+        actual_cmd = Utils.gen_joined_str(' ', full_cmd)
+        # only the executable is traced to avoid exposing the arguments
+        cmd_executable = cmd_args[0].split(maxsplit=1)[0] if cmd_args and cmd_args[0] else 'cmd'
+        with ToolTracer.span(f'CMD {cmd_executable}', 'cmd', children_cpu=True) as span_args:
+            if self.stream_lines_cb is None:
+                self._run_buffered(actual_cmd)
+            else:
+                self._run_streaming(actual_cmd)
+            span_args['returnCode'] = self.res
         if self.has_failed():
             std_error_lines = [f'\t| {line}' for line in self.err_std.splitlines()]
             stderr_str = ''
@@ -362,7 +531,6 @@ class SysCmd:
             cmd_err_msg = f'Error invoking CMD <{Utils.gen_joined_str(" ", processed_cmd_args)}>: {stderr_str}'
             raise RuntimeError(f'{cmd_err_msg}')
 
-        self.out_std = c.stdout if isinstance(c.stdout, str) else c.stdout.decode('utf-8', errors='ignore')
         if self.process_streams_cb is not None:
             self.process_streams_cb(self.out_std, self.err_std)
         if self.out_std:
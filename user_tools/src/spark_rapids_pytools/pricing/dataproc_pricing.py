@@ -19,15 +19,36 @@ from dataclasses import dataclass
 
 from spark_rapids_pytools.common.prop_manager import JSONPropertiesContainer
 from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.pricing.price_index import PriceIndex
 from spark_rapids_pytools.pricing.price_provider import PriceProvider
 
 
 @dataclass
 class DataprocCatalogContainer(JSONPropertiesContainer):
+    """
+    The GCP price list used to lookup the costs of Dataproc resources.
+    """
     def _init_fields(self) -> None:
         # the prices of the products are defined under 'gcp_price_list'
         self.props = self.props['gcp_price_list']
 
+    @classmethod
+    def build_price_index(cls, catalog_file: str) -> dict:
+        """
+        Extracts the entries used for lookups from the catalog file. Each product keeps only its
+        scalar fields (i.e., prices per region, cores and memory) dropping nested structures.
+        :param catalog_file: path to the GCP price list
+        :return: a dictionary having the same layout as the catalog file
+        """
+        catalog = cls(prop_arg=catalog_file)
+        price_list = {}
+        for product_key, product_info in catalog.props.items():
+            if isinstance(product_info, dict):
+                price_list[product_key] = {
+                    k: v for k, v in product_info.items() if isinstance(v, (int, float, str))
+                }
+        return {'gcp_price_list': price_list}
+
 
 @dataclass
 class DataprocPriceProvider(PriceProvider):
@@ -46,7 +67,8 @@ class DataprocPriceProvider(PriceProvider):
                 break
 
     def _create_catalogs(self):
-        self.catalogs = {'gcloud': DataprocCatalogContainer(prop_arg=self.cache_files['gcloud'])}
+        price_index = PriceIndex(self.cache_files['gcloud'], build_cb=DataprocCatalogContainer.build_price_index)
+        self.catalogs = {'gcloud': DataprocCatalogContainer(prop_arg=price_index.props, file_load=False)}
 
     def get_ssd_price(self, machine_type: str) -> float:
         lookup_key = 'CP-COMPUTEENGINE-LOCAL-SSD'
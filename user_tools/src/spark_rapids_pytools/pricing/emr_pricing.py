@@ -15,10 +15,12 @@
 """providing absolute costs of resources in AWS"""
 
 from dataclasses import dataclass, field
+from typing import Callable
 
 from spark_rapids_tools import get_elem_from_dict, get_elem_non_safe
-from spark_rapids_pytools.common.prop_manager import JSONPropertiesContainer
+from spark_rapids_pytools.common.prop_manager import JSONStreamReader
 from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.pricing.price_index import PriceIndex
 from spark_rapids_pytools.pricing.price_provider import PriceProvider
 
 
@@ -26,51 +28,85 @@ from spark_rapids_pytools.pricing.price_provider import PriceProvider
 class AWSCatalogContainer:
     """
     An AWS pricing catalog. It is initialized by a list of catalog_files.
-    The final pricing will be loaded inside a dictionary for lookup
+    The final pricing will be loaded inside a dictionary for lookup.
+    The instance prices are extracted once per catalog file and kept in a price index.
     """
     catalog_files: dict  # [str, str]
     props: dict = field(default_factory=dict, init=False)
 
-    def __load_instance_type_price_by_sku(self,
-                                          comp_key: str,
-                                          comp_props: JSONPropertiesContainer,
-                                          sku_to_instance_type: dict):
+    @classmethod
+    def _get_on_demand_price(cls, sku_info: dict) -> float:
+        # the price is defined by the last term and the last price dimension of the sku
+        sku_info_value = list(sku_info.values())[-1]
+        price_dimensions = sku_info_value['priceDimensions']
+        price_dimensions_value = list(price_dimensions.values())[-1]
+        return float(price_dimensions_value['pricePerUnit']['USD'])
+
+    @classmethod
+    def _load_offer_prices(cls, catalog_file: str, attr_filter_cb: Callable[[dict], bool]) -> dict:
+        """
+        Extracts the on-demand price of the instance types from an AWS offer file in a single pass.
+        The offer file is streamed so that only the products passing the filter and their
+        on-demand terms are kept in memory.
+        :param catalog_file: path to the AWS offer file
+        :param attr_filter_cb: predicate applied on the attributes of each product
+        :return: a dictionary of instance types and their prices
+        """
+        sku_to_instance_type = {}
+        sku_to_price = {}
+        products_loaded = False
+        with open(catalog_file, 'r', encoding='utf-8') as offer_file:
+            reader = JSONStreamReader(offer_file)
+            for top_key in reader.iter_object():
+                if top_key == 'products':
+                    for sku in reader.iter_object():
+                        attr = reader.read_value().get('attributes')
+                        if attr and attr_filter_cb(attr):
+                            sku_to_instance_type[sku] = attr['instanceType']
+                    products_loaded = True
+                elif top_key == 'terms':
+                    for term_type in reader.iter_object():
+                        if term_type != 'OnDemand':
+                            reader.skip_value()
+                            continue
+                        for sku in reader.iter_object():
+                            # products precede the terms in the offer files. Otherwise, keep all the prices
+                            if products_loaded and sku not in sku_to_instance_type:
+                                reader.skip_value()
+                            else:
+                                sku_to_price[sku] = cls._get_on_demand_price(reader.read_value())
+                else:
+                    reader.skip_value()
         price_map = {}
         for sku, instance_type in sku_to_instance_type.items():
-            sku_info = comp_props.get_value('terms', 'OnDemand', sku)
-            _, sku_info_value = sku_info.popitem()
-            price_dimensions = sku_info_value['priceDimensions']
-            _, price_dimensions_value = price_dimensions.popitem()
-            price = float(price_dimensions_value['pricePerUnit']['USD'])
-            price_map[instance_type] = price
-        self.props.update({comp_key: price_map})
+            if sku not in sku_to_price:
+                raise RuntimeError(f'Could not find the on-demand price of sku {sku} in {catalog_file}')
+            price_map[instance_type] = sku_to_price[sku]
+        return price_map
 
-    def _load_instance_types_emr(self, prop_key: str, catalog_file: str):
-        emr_props = JSONPropertiesContainer(catalog_file)
-        sku_to_instance_type = {}
-        for sku in emr_props.get_value('products'):
-            if sw_type := emr_props.get_value_silent('products', sku, 'attributes', 'softwareType'):
-                if sw_type == 'EMR':
-                    sku_to_instance_type[sku] = emr_props.get_value('products', sku, 'attributes', 'instanceType')
-        self.__load_instance_type_price_by_sku(prop_key, emr_props, sku_to_instance_type)
+    @classmethod
+    def _build_price_map_emr(cls, catalog_file: str) -> dict:
+        return cls._load_offer_prices(catalog_file, lambda attr: attr.get('softwareType') == 'EMR')
 
-    def _load_instance_types_ec2(self, prop_key: str, catalog_file: str):
-        ec2_props = JSONPropertiesContainer(catalog_file)
-        ec2_sku_to_instance_type = {}
+    @classmethod
+    def _build_price_map_ec2(cls, catalog_file: str) -> dict:
         cond_dict = {
             'tenancy': 'Shared',
             'operatingSystem': 'Linux',
             'operation': 'RunInstances',
             'capacitystatus': 'Used'
         }
-        for sku in ec2_props.get_value('products'):
-            if attr := ec2_props.get_value_silent('products', sku, 'attributes'):
-                precheck = True
-                for cond_k, cond_v in cond_dict.items():
-                    precheck = precheck and attr.get(cond_k) == cond_v
-                if precheck:
-                    ec2_sku_to_instance_type[sku] = attr['instanceType']
-        self.__load_instance_type_price_by_sku(prop_key, ec2_props, ec2_sku_to_instance_type)
+        return cls._load_offer_prices(
+            catalog_file,
+            lambda attr: all(attr.get(cond_k) == cond_v for cond_k, cond_v in cond_dict.items()))
+
+    def _load_instance_types_emr(self, prop_key: str, catalog_file: str):
+        price_index = PriceIndex(catalog_file, build_cb=self._build_price_map_emr)
+        self.props.update({prop_key: price_index.props})
+
+    def _load_instance_types_ec2(self, prop_key: str, catalog_file: str):
+        price_index = PriceIndex(catalog_file, build_cb=self._build_price_map_ec2)
+        self.props.update({prop_key: price_index.props})
 
     def get_value(self, *key_strs):
         return get_elem_from_dict(self.props, key_strs)
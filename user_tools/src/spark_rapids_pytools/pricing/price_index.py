@@ -0,0 +1,94 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact price indices compiled from the pricing catalogs"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Callable, ClassVar, Optional
+
+from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.common.utilities import ToolLogging
+
+
+@dataclass
+class PriceIndex:
+    """
+    A compact lookup table extracted from a pricing catalog file.
+    The catalogs are large JSON documents while the tools need only a small subset of their
+    content. The subset is built once by build_cb and serialized next to the catalog file.
+    Later runs load the index directly as long as the size and the modification time of the
+    catalog file did not change since the index was built.
+    """
+    catalog_file: str
+    build_cb: Callable[[str], dict]
+    index_file: str = field(default=None, init=False)
+    props: dict = field(default=None, init=False)
+    logger: Logger = field(default=None, init=False)
+
+    # bump the version whenever the layout of the serialized index changes
+    index_version: ClassVar[int] = 1
+
+    @classmethod
+    def get_index_file(cls, catalog_file: str) -> str:
+        return f'{FSUtil.remove_ext(catalog_file)}.index.json'
+
+    def _get_source_stamp(self) -> dict:
+        file_stat = os.stat(self.catalog_file)
+        return {'size': file_stat.st_size, 'mtime': file_stat.st_mtime_ns}
+
+    def _load_index(self, source_stamp: dict) -> Optional[dict]:
+        if not os.path.exists(self.index_file):
+            return None
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as index_fd:
+                index_content = json.load(index_fd)
+        except (OSError, ValueError) as ex:
+            self.logger.warning('Could not read the price index %s: %s', self.index_file, ex)
+            return None
+        if (index_content.get('version') != self.index_version or
+                index_content.get('source') != source_stamp):
+            return None
+        return index_content.get('prices')
+
+    def _write_index(self, source_stamp: dict, prices: dict) -> None:
+        index_content = {
+            'version': self.index_version,
+            'source': source_stamp,
+            'prices': prices
+        }
+        # write into a temporary file first so that concurrent runs never read a partial index
+        tmp_file = f'{self.index_file}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as index_fd:
+                json.dump(index_content, index_fd, separators=(',', ':'))
+            os.replace(tmp_file, self.index_file)
+        except OSError as ex:
+            # the index is an optimization. Failing to write it should not fail the tool
+            self.logger.warning('Could not write the price index %s: %s', self.index_file, ex)
+            FSUtil.remove_path(tmp_file, fail_ok=True)
+
+    def __post_init__(self):
+        self.logger = ToolLogging.get_and_setup_logger('rapids.tools.price.index')
+        self.index_file = self.get_index_file(self.catalog_file)
+        source_stamp = self._get_source_stamp()
+        self.props = self._load_index(source_stamp)
+        if self.props is not None:
+            self.logger.debug('Loaded the price index %s', self.index_file)
+            return
+        self.logger.info('Building the price index of the catalog file %s', self.catalog_file)
+        self.props = self.build_cb(self.catalog_file)
+        self._write_index(source_stamp, self.props)
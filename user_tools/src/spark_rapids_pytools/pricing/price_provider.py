@@ -16,11 +16,18 @@
 
 import datetime
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from logging import Logger
+from typing import Any, Callable, ClassVar
+
+import numpy as np
 
 from spark_rapids_pytools.cloud_api.sp_types import ClusterGetAccessor
 from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.common.tracing import ToolTracer
 from spark_rapids_pytools.common.utilities import ToolLogging, Utils
 
 
@@ -34,7 +41,8 @@ class PriceProvider:
     cache_files: dict = field(default_factory=dict, init=False)  # [str, str]
     resource_urls: dict = field(default_factory=dict, init=False)  # [str, str]
     name: str = field(default=None, init=False)
-    cache_expiration_secs: int = field(default=604800, init=False)  # download the file once a week
+    # check the catalogs once a week unless the pricing configs define cacheExpirationSecs
+    cache_expiration_secs: int = field(default=604800, init=False)
     meta: dict = field(default_factory=dict)
     catalogs: dict = field(default_factory=dict, init=False)  # [str, AbstractPropertiesContainer]
     comments: list = field(default_factory=lambda: [], init=False)
@@ -51,13 +59,22 @@ class PriceProvider:
     def _generate_cache_files(self):
         # resource_urls and cache_files should have the same keys
         cache_checks = {'cacheExpirationSecs': self.cache_expiration_secs}
-        for file_key, resource_url in self.resource_urls.items():
-            files_updated = FSUtil.cache_from_url(resource_url,
-                                                  self.cache_files[file_key],
-                                                  file_checks=cache_checks)
-            self.logger.info('The catalog file %s is %s',
-                             self.cache_files[file_key],
-                             'updated' if files_updated else 'not modified, using the cached content')
+        if not self.resource_urls:
+            return
+        # the catalogs are independent, so they are refreshed concurrently
+        with ThreadPoolExecutor(max_workers=len(self.resource_urls)) as executor:
+            futures = {
+                file_key: executor.submit(FSUtil.cache_from_url_conditional,
+                                          resource_url,
+                                          self.cache_files[file_key],
+                                          file_checks=cache_checks)
+                for file_key, resource_url in self.resource_urls.items()
+            }
+            for file_key, future in futures.items():
+                files_updated = future.result()
+                self.logger.info('The catalog file %s is %s',
+                                 self.cache_files[file_key],
+                                 'updated' if files_updated else 'not modified, using the cached content')
 
     def __post_init__(self):
         self.logger = ToolLogging.get_and_setup_logger(f'rapids.tools.price.{self.name}')
@@ -68,12 +85,29 @@ class PriceProvider:
     def get_cached_files(self) -> list:
         return list(self.cache_files.values())
 
+    def get_catalogs_stamp(self) -> tuple:
+        """
+        :return: the size and the modified time of the catalog files. It changes when one of the
+                 catalogs is refreshed.
+        """
+        stamp = []
+        for c_file in self.get_cached_files():
+            try:
+                file_stat = os.stat(c_file)
+                stamp.append((c_file, file_stat.st_size, file_stat.st_mtime_ns))
+            except OSError:
+                stamp.append((c_file, None, None))
+        return tuple(stamp)
+
+    def catalogs_expired(self) -> bool:
+        return self._caches_expired(self.get_cached_files())
+
     def _caches_expired(self, cache_files: list) -> bool:
         for c_file in cache_files:
             if not os.path.exists(c_file):
                 return True
-            modified_time = os.path.getmtime(c_file)
-            diff_time = int(datetime.datetime.now().timestamp() - modified_time)
+            validation_time = FSUtil.get_last_validation_time(c_file)
+            diff_time = int(datetime.datetime.now().timestamp() - validation_time)
             if diff_time > self.cache_expiration_secs:
                 return True
         return False
@@ -81,12 +115,20 @@ class PriceProvider:
     def _process_resource_configs(self):
         pass
 
+    def _process_expiration_configs(self):
+        for pricing_config in self.pricing_configs.values():
+            expiration_secs = pricing_config.get_value_silent('catalog', 'cacheExpirationSecs')
+            if expiration_secs is not None:
+                self.cache_expiration_secs = int(expiration_secs)
+
     def _process_configs(self):
+        self._process_expiration_configs()
         self._process_resource_configs()
 
     def _create_catalogs(self):
         pass
 
+    @ToolTracer.traced('Loading price catalogs', 'catalog')
     def _init_catalogs(self):
         self._init_cache_files()
         self._create_catalogs()
@@ -165,3 +207,100 @@ class SavingsEstimator:
         gpu_cost = self.target_cost * estimated_gpu_duration_ms / (60.0 * 60 * 1000)
         estimated_savings = 100.0 - ((100.0 * gpu_cost) / cpu_cost)
         return cpu_cost, gpu_cost, estimated_savings
+
+    def get_costs_and_savings_vectorized(self,
+                                         app_durations_ms,
+                                         estimated_gpu_durations_ms) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Column-wise equivalent of get_costs_and_savings(). It calculates the costs for a batch of
+        applications in one pass instead of invoking the scalar method once per application.
+        :param app_durations_ms: array-like of total execution times in milliseconds
+        :param estimated_gpu_durations_ms: array-like of the estimated execution times on GPU
+        :return: a tuple of 3 arrays representing cpu_cost, gpu_cost, and percent of savings
+        """
+        cpu_cost = self.source_cost * np.asarray(app_durations_ms, dtype=float) / (60.0 * 60 * 1000)
+        gpu_cost = self.target_cost * np.asarray(estimated_gpu_durations_ms, dtype=float) / (60.0 * 60 * 1000)
+        non_positive_mask = cpu_cost <= 0.0
+        if non_positive_mask.any():
+            self.logger.info('Force costs to 0 for %d apps because the original cost is not positive',
+                             non_positive_mask.sum())
+            # avoid division by zero
+            cpu_cost[non_positive_mask] = 0.0
+            gpu_cost[non_positive_mask] = 0.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            estimated_savings = 100.0 - ((100.0 * gpu_cost) / cpu_cost)
+        estimated_savings[non_positive_mask] = 0.0
+        return cpu_cost, gpu_cost, estimated_savings
+
+
+class SavingsEstimatorPool:
+    """
+    A process-wide pool of savings estimators. Creating an estimator walks through the pricing
+    catalogs. Therefore, the estimators are reused across all the invocations running in the same
+    process as long as they are created for the same key.
+    Each estimator is kept with the stamp of the catalogs it was created from. An estimator is
+    dropped once its catalogs are refreshed or expired, so that a long-lived process (i.e., the
+    batch mode) does not keep serving stale prices.
+    The pool is bounded and evicts the least recently used estimators.
+    """
+    max_size: ClassVar[int] = 16
+    hits: ClassVar[int] = 0
+    misses: ClassVar[int] = 0
+    _estimators: ClassVar[OrderedDict] = OrderedDict()
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def _get_catalogs_stamp(estimator: SavingsEstimator) -> tuple:
+        price_provider = getattr(estimator, 'price_provider', None)
+        if price_provider is None:
+            return ()
+        return price_provider.get_catalogs_stamp()
+
+    @classmethod
+    def _is_outdated(cls, estimator: SavingsEstimator, catalogs_stamp: tuple) -> bool:
+        price_provider = getattr(estimator, 'price_provider', None)
+        if price_provider is None:
+            return False
+        return cls._get_catalogs_stamp(estimator) != catalogs_stamp or price_provider.catalogs_expired()
+
+    @classmethod
+    def get_or_create(cls, key: Any, create_cb: Callable[[], SavingsEstimator]) -> SavingsEstimator:
+        """
+        Gets the estimator mapped to the key, or creates a new one and adds it to the pool.
+        :param key: a hashable key identifying the estimator. If None, the estimator is not pooled.
+        :param create_cb: a callback used to create the estimator when it is not in the pool or when
+               its catalogs changed.
+        :return: the savings estimator.
+        """
+        if key is None:
+            return create_cb()
+        with cls._lock:
+            entry = cls._estimators.get(key)
+        if entry is not None and not cls._is_outdated(*entry):
+            with cls._lock:
+                cls.hits += 1
+                if key in cls._estimators:
+                    cls._estimators.move_to_end(key)
+            return entry[0]
+        with cls._lock:
+            cls.misses += 1
+        # create the estimator outside the lock because it can take long to load the catalogs
+        estimator = create_cb()
+        with cls._lock:
+            cls._estimators[key] = (estimator, cls._get_catalogs_stamp(estimator))
+            cls._estimators.move_to_end(key)
+            while len(cls._estimators) > cls.max_size:
+                cls._estimators.popitem(last=False)
+        return estimator
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._lock:
+            return {'hits': cls.hits, 'misses': cls.misses, 'size': len(cls._estimators)}
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._estimators.clear()
+            cls.hits = 0
+            cls.misses = 0
@@ -0,0 +1,181 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Implementation of the store of the verified dependencies used by the local runs"""
+
+import hashlib
+import json
+import os
+import tarfile
+from dataclasses import dataclass, field
+from logging import Logger
+
+from spark_rapids_pytools.common.sys_storage import FSUtil, FileVerifier
+from spark_rapids_pytools.common.utilities import ToolLogging
+
+
+@dataclass
+class DependencyCache:
+    """
+    A store of the dependencies (i.e., Hadoop/Spark tarballs and jars) shared by all the runs using
+    the same cache folder.
+    1. downloaded files are verified once. The verified checks are saved in a sidecar file next to
+       the download and the verification is skipped as long as the size and the modification time
+       of the file did not change.
+    2. archives are extracted once into a directory versioned by the checks of the archive.
+    Runs link the stored files and directories into their work directory instead of copying them.
+    """
+    cache_folder: str
+    store_dir: str = field(default=None, init=False)
+    logger: Logger = field(default=None, init=False)
+
+    def __post_init__(self):
+        self.logger = ToolLogging.get_and_setup_logger('rapids.tools.dependency.cache')
+        self.store_dir = FSUtil.build_path(self.cache_folder, 'extracted')
+        FSUtil.make_dirs(self.store_dir)
+
+    @classmethod
+    def _get_file_checks(cls, dep: dict) -> dict:
+        file_checks = {'size': dep['size']}
+        algorithm = FileVerifier.get_integrity_algorithm(dep)
+        if algorithm is not None:
+            file_checks['hashlib'] = {
+                'algorithm': algorithm,
+                'hash': dep[algorithm]
+            }
+        return file_checks
+
+    @classmethod
+    def _get_sidecar_file(cls, resource_file: str) -> str:
+        return f'{resource_file}.verified.json'
+
+    @classmethod
+    def _get_file_stamp(cls, resource_file: str) -> dict:
+        file_stat = os.stat(resource_file)
+        return {'size': file_stat.st_size, 'mtimeNs': file_stat.st_mtime_ns}
+
+    def _is_verified(self, resource_file: str, file_checks: dict) -> bool:
+        sidecar_file = self._get_sidecar_file(resource_file)
+        if not os.path.exists(resource_file) or not os.path.exists(sidecar_file):
+            return False
+        try:
+            with open(sidecar_file, 'r', encoding='utf-8') as sidecar_fd:
+                sidecar = json.load(sidecar_fd)
+        except (OSError, ValueError):
+            return False
+        return sidecar.get('checks') == file_checks and sidecar.get('stamp') == self._get_file_stamp(resource_file)
+
+    def _mark_verified(self, resource_file: str, file_checks: dict) -> None:
+        sidecar_file = self._get_sidecar_file(resource_file)
+        tmp_file = f'{sidecar_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as sidecar_fd:
+            json.dump({'checks': file_checks, 'stamp': self._get_file_stamp(resource_file)}, sidecar_fd)
+        os.replace(tmp_file, sidecar_file)
+
+    def fetch_verified_file(self, dep: dict) -> str:
+        """
+        Downloads the dependency into the cache folder unless a verified copy already exists.
+        :param dep: the dependency entry of the platform configurations
+        :return: the path of the verified file
+        """
+        resource_file = FSUtil.build_path(self.cache_folder, FSUtil.get_resource_name(dep['uri']))
+        file_checks = self._get_file_checks(dep)
+        if self._is_verified(resource_file, file_checks):
+            self.logger.info('Using the verified dependency %s', resource_file)
+            return resource_file
+        download_checks = dict(file_checks)
+        signature_file = FileVerifier.get_signature_file(dep['uri'], self.cache_folder)
+        if signature_file is not None:
+            download_checks['signatureFile'] = signature_file
+        if FSUtil.cache_from_url(dep['uri'], resource_file, file_checks=download_checks):
+            self.logger.info('The dependency %s has been downloaded into %s', dep['uri'], resource_file)
+        self._mark_verified(resource_file, file_checks)
+        return resource_file
+
+    @classmethod
+    def _check_archive_members(cls, tar: tarfile.TarFile, dest_dir: str) -> None:
+        """
+        Rejects the members that would be written outside the destination directory. It is used
+        when the tarfile module does not provide the extraction filters.
+        """
+        dest_root = os.path.realpath(dest_dir)
+
+        def is_inside(member_path: str) -> bool:
+            return os.path.commonpath([dest_root, os.path.realpath(member_path)]) == dest_root
+
+        for member in tar.getmembers():
+            member_path = os.path.join(dest_root, member.name)
+            if os.path.isabs(member.name) or not is_inside(member_path):
+                raise RuntimeError(f'Archive member {member.name} is outside the extraction directory')
+            if member.isdev():
+                raise RuntimeError(f'Archive member {member.name} is a device file')
+            if member.issym():
+                link_path = os.path.join(os.path.dirname(member_path), member.linkname)
+            elif member.islnk():
+                link_path = os.path.join(dest_root, member.linkname)
+            else:
+                continue
+            if os.path.isabs(member.linkname) or not is_inside(link_path):
+                raise RuntimeError(f'Archive member {member.name} links outside the extraction directory')
+
+    @classmethod
+    def _extract_members(cls, resource_file: str, dest_dir: str) -> None:
+        with tarfile.open(resource_file, mode='r:*') as tar:
+            if hasattr(tarfile, 'data_filter'):
+                tar.extractall(dest_dir, filter='data')
+            else:
+                cls._check_archive_members(tar, dest_dir)
+                tar.extractall(dest_dir)
+
+    def _extract_archive(self, resource_file: str, file_checks: dict) -> str:
+        version_digest = hashlib.sha256(json.dumps(file_checks, sort_keys=True).encode('utf-8')).hexdigest()
+        extract_dir = FSUtil.build_path(self.store_dir,
+                                        f'{FSUtil.remove_ext(FSUtil.get_resource_name(resource_file))}'
+                                        f'-{version_digest[:16]}')
+        if os.path.isdir(extract_dir):
+            return extract_dir
+        self.logger.info('Extracting the dependency %s into %s', resource_file, extract_dir)
+        tmp_dir = f'{extract_dir}.{os.getpid()}.tmp'
+        FSUtil.remove_path(tmp_dir, fail_ok=True)
+        try:
+            self._extract_members(resource_file, tmp_dir)
+            try:
+                os.replace(tmp_dir, extract_dir)
+            except OSError:
+                # another run extracted the same archive concurrently. Its directory is used instead
+                if not os.path.isdir(extract_dir):
+                    raise
+        finally:
+            FSUtil.remove_path(tmp_dir, fail_ok=True)
+        return extract_dir
+
+    def fetch_dependency(self, dep: dict, dest_dir: str) -> str:
+        """
+        Links the verified dependency into the destination directory. Archives are linked as their
+        extracted entries.
+        :param dep: the dependency entry of the platform configurations
+        :param dest_dir: the work directory of the run
+        :return: the path of the dependency inside the destination directory
+        """
+        resource_file = self.fetch_verified_file(dep)
+        resource_name = FSUtil.get_resource_name(resource_file)
+        if dep['type'] != 'archive':
+            return FSUtil.link_resource(resource_file, FSUtil.build_path(dest_dir, resource_name))
+        extract_dir = self._extract_archive(resource_file, self._get_file_checks(dep))
+        for entry_name in os.listdir(extract_dir):
+            FSUtil.link_resource(FSUtil.build_path(extract_dir, entry_name), FSUtil.build_path(dest_dir, entry_name))
+        dep_item = FSUtil.remove_ext(resource_name)
+        if dep.get('relativePath') is not None:
+            dep_item = FSUtil.build_path(dep_item, dep.get('relativePath'))
+        return FSUtil.build_path(dest_dir, dep_item)
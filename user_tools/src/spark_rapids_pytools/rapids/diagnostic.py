@@ -111,10 +111,10 @@ class Diagnostic(RapidsTool):
         :return:
         """
         with ThreadPoolExecutor(max_workers=self.thread_num) as executor:
-            for e in executor.map(self._collect_info, self.all_nodes):
-                # Raise exception if any error occurred
-                if e:
-                    raise e
+            futures = [executor.submit(self._collect_info, node) for node in self.all_nodes]
+        # all the nodes are processed before raising the first error
+        for future in futures:
+            future.result()
 
     def _download_output(self):
         self.logger.info('Downloading results from remote nodes:')
@@ -136,10 +136,10 @@ class Diagnostic(RapidsTool):
                 raise e
 
         with ThreadPoolExecutor(max_workers=self.thread_num) as executor:
-            for e in executor.map(_download_result, self.all_nodes):
-                # Raise exception if any error occurred
-                if e:
-                    raise e
+            futures = [executor.submit(_download_result, node) for node in self.all_nodes]
+        # all the nodes are processed before raising the first error
+        for future in futures:
+            future.result()
 
     def _process_output(self):
         self.logger.info('Processing the collected results.')
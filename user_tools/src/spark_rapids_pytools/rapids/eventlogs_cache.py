@@ -0,0 +1,264 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Implementation of the local disk cache of the remote eventlogs"""
+
+import datetime
+import fcntl
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Dict, List, Optional, Tuple
+
+from pyarrow.fs import FileInfo, FileType
+
+from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.common.utilities import ToolLogging
+from spark_rapids_tools.storagelib import CspPath
+
+
+@dataclass
+class EventlogsCache:
+    """
+    A size-bounded cache of the remote eventlogs shared by all the runs using the same cache folder.
+    The remote files are streamed concurrently into the store and the tool is given local paths
+    instead of the remote urls. Each file is keyed by its url and its version (size and
+    modification time), so a log rewritten in the remote storage is fetched again.
+    The least recently used files are evicted when the store exceeds max_size_bytes. The index is
+    updated under an exclusive lock, and the files used within eviction_grace_secs are not evicted
+    because they may still be read by other runs.
+    """
+    cache_folder: str
+    max_size_bytes: int
+    max_workers: int = 8
+    eviction_grace_secs: float = 6 * 3600
+    chunk_size: int = 1 << 20
+    remote_prefixes: Tuple[str, ...] = ('s3://', 'gs://', 'abfss://')
+    store_dir: str = field(default=None, init=False)
+    logger: Logger = field(default=None, init=False)
+
+    def __post_init__(self):
+        self.logger = ToolLogging.get_and_setup_logger('rapids.tools.eventlogs.cache')
+        self.store_dir = FSUtil.build_path(self.cache_folder, 'eventlogs')
+        FSUtil.make_dirs(self.store_dir)
+
+    def is_remote(self, eventlog: str) -> bool:
+        return eventlog.startswith(self.remote_prefixes)
+
+    def _get_index_file(self) -> str:
+        return FSUtil.build_path(self.store_dir, 'index.json')
+
+    @contextmanager
+    def _lock_index(self):
+        """Holds the lock of the index shared by the runs using the same cache folder."""
+        with open(FSUtil.build_path(self.store_dir, 'index.lock'), 'a', encoding='utf-8') as lock_fd:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fd, fcntl.LOCK_UN)
+
+    def _load_index(self) -> Dict[str, dict]:
+        index_file = self._get_index_file()
+        if not os.path.exists(index_file):
+            return {}
+        try:
+            with open(index_file, 'r', encoding='utf-8') as index_fd:
+                return json.load(index_fd)
+        except (OSError, ValueError) as ex:
+            self.logger.warning('Ignoring corrupted index %s: %s', index_file, ex)
+            return {}
+
+    def _save_index(self, index: Dict[str, dict]) -> None:
+        index_file = self._get_index_file()
+        tmp_file = f'{index_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as index_fd:
+            json.dump(index, index_fd)
+        os.replace(tmp_file, index_file)
+
+    @classmethod
+    def _get_entry_key(cls, file_url: str, f_info: FileInfo) -> str:
+        # the object stores do not expose the etag through pyArrow. The size and the modification
+        # time identify the version of the object
+        return hashlib.sha256(f'{file_url}|{f_info.size}|{f_info.mtime_ns}'.encode('utf-8')).hexdigest()
+
+    def _get_blob_path(self, entry_key: str, file_name: str) -> str:
+        # keep the file name because the tool detects the compression codec from the extension
+        return FSUtil.build_path(FSUtil.build_path(self.store_dir, entry_key), file_name)
+
+    def _is_cached(self, index: Dict[str, dict], entry_key: str, f_info: FileInfo) -> bool:
+        entry = index.get(entry_key)
+        if entry is None:
+            return False
+        blob_path = self._get_blob_path(entry_key, entry['fileName'])
+        return os.path.exists(blob_path) and os.path.getsize(blob_path) == f_info.size
+
+    def _fetch_file(self, eventlog_path: CspPath, f_info: FileInfo, blob_path: str) -> int:
+        FSUtil.make_dirs(os.path.dirname(blob_path))
+        tmp_file = f'{blob_path}.{os.getpid()}.tmp'
+        fetched_bytes = 0
+        try:
+            with eventlog_path.fs_obj.open_input_stream(f_info.path) as in_stream:
+                with open(tmp_file, 'wb') as out_fd:
+                    while True:
+                        chunk = in_stream.read(self.chunk_size)
+                        if not chunk:
+                            break
+                        out_fd.write(chunk)
+                        fetched_bytes += len(chunk)
+            os.replace(tmp_file, blob_path)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+        return fetched_bytes
+
+    def _scan_store(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Scans the store instead of trusting the index, so the files fetched by other runs are counted.
+        :return: the size and the modification time of the directory of each entry
+        """
+        entries = {}
+        with os.scandir(self.store_dir) as store_entries:
+            for store_entry in store_entries:
+                if not store_entry.is_dir(follow_symlinks=False):
+                    continue
+                entry_size = 0
+                try:
+                    entry_mtime = store_entry.stat().st_mtime
+                    with os.scandir(store_entry.path) as entry_files:
+                        for entry_file in entry_files:
+                            entry_size += entry_file.stat(follow_symlinks=False).st_size
+                except OSError:
+                    # the entry is being evicted or its file is being fetched by another run
+                    continue
+                entries[store_entry.name] = (entry_size, entry_mtime)
+        return entries
+
+    def _evict(self, index: Dict[str, dict], used_keys: set, curr_time_stamp: float) -> None:
+        store_entries = self._scan_store()
+        for entry_key in [entry_key for entry_key in index if entry_key not in store_entries]:
+            del index[entry_key]
+        # the entries missing from the index were last accessed when their directory was modified
+        last_access = {entry_key: index[entry_key]['lastAccess'] if entry_key in index else entry_mtime
+                       for entry_key, (_, entry_mtime) in store_entries.items()}
+        total_size = sum(entry_size for entry_size, _ in store_entries.values())
+        for entry_key in sorted(store_entries, key=last_access.get):
+            if total_size <= self.max_size_bytes:
+                break
+            if entry_key in used_keys or last_access[entry_key] > curr_time_stamp - self.eviction_grace_secs:
+                continue
+            FSUtil.remove_path(FSUtil.build_path(self.store_dir, entry_key), fail_ok=True)
+            total_size -= store_entries[entry_key][0]
+            index.pop(entry_key, None)
+        if total_size > self.max_size_bytes:
+            self.logger.info('The eventlogs cache exceeds its size (%.2f MB) until the recent files are released',
+                             total_size / (1 << 20))
+
+    def _list_eventlog(self, eventlog: str) -> Tuple[CspPath, List[Tuple[str, FileInfo]]]:
+        eventlog_path = CspPath(eventlog.rstrip('/'))
+        if eventlog_path.is_dir():
+            root = eventlog_path.no_prefix.rstrip('/')
+            f_infos = [f_info for f_info in eventlog_path.list_file_infos(recursive=True)
+                       if f_info.type == FileType.File]
+            return eventlog_path, [(os.path.relpath(f_info.path, root), f_info) for f_info in f_infos]
+        if not eventlog_path.exists():
+            raise FileNotFoundError(f'Eventlog {eventlog} does not exist')
+        return eventlog_path, [(None, eventlog_path.file_info)]
+
+    def stage(self, eventlogs: List[str], dest_dir: str) -> List[str]:
+        """
+        Makes the remote eventlogs available on local disk. Files found in the cache are not
+        downloaded. The local eventlogs and the remote ones that cannot be staged (i.e., missing
+        credentials or larger than the cache) are returned unchanged.
+        :param eventlogs: the list of the eventlogs passed to the tool
+        :param dest_dir: local directory where the staged eventlogs are linked
+        :return: the list of the eventlogs to pass to the tool
+        """
+        staged_size = 0
+        # the files of each remote eventlog: (eventlog index, path object, relative path, file info, entry key)
+        staged_files = []
+        for eventlog_ind, eventlog in enumerate(eventlogs):
+            if not self.is_remote(eventlog):
+                continue
+            try:
+                eventlog_path, eventlog_files = self._list_eventlog(eventlog)
+            except Exception as ex:  # pylint: disable=broad-except
+                self.logger.warning('Could not list the eventlog %s. It is read by the tool remotely: %s',
+                                    eventlog, ex)
+                continue
+            eventlog_size = sum(f_info.size or 0 for _, f_info in eventlog_files)
+            if staged_size + eventlog_size > self.max_size_bytes:
+                self.logger.warning('The eventlog %s does not fit in the cache. It is read by the tool remotely',
+                                    eventlog)
+                continue
+            staged_size += eventlog_size
+            for rel_path, f_info in eventlog_files:
+                entry_key = self._get_entry_key(f'{eventlog.rstrip("/")}/{rel_path or ""}', f_info)
+                staged_files.append((eventlog_ind, eventlog_path, rel_path, f_info, entry_key))
+        if not staged_files:
+            return eventlogs
+        with self._lock_index():
+            index = self._load_index()
+            missing_files = {entry[4]: entry for entry in staged_files
+                             if not self._is_cached(index, entry[4], entry[3])}
+            # the cached files are marked as used, so other runs do not evict them while they are linked
+            curr_time_stamp = datetime.datetime.now().timestamp()
+            for entry_key in {entry[4] for entry in staged_files} - set(missing_files):
+                index[entry_key]['lastAccess'] = curr_time_stamp
+            self._save_index(index)
+
+        def fetch_single_file(entry: tuple) -> Optional[int]:
+            _, eventlog_path, _, f_info, entry_key = entry
+            try:
+                return self._fetch_file(eventlog_path, f_info, self._get_blob_path(entry_key, f_info.base_name))
+            except Exception as ex:  # pylint: disable=broad-except
+                self.logger.warning('Could not fetch %s: %s', f_info.path, ex)
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            fetch_results = dict(zip(missing_files, executor.map(fetch_single_file, missing_files.values())))
+        failed_logs = {missing_files[entry_key][0] for entry_key, res in fetch_results.items() if res is None}
+        with self._lock_index():
+            # the index is loaded again because the other runs may have updated it while fetching
+            index = self._load_index()
+            curr_time_stamp = datetime.datetime.now().timestamp()
+            used_keys = set()
+            for _, _, _, f_info, entry_key in staged_files:
+                if fetch_results.get(entry_key, 0) is None:
+                    continue
+                used_keys.add(entry_key)
+                index[entry_key] = {'fileName': f_info.base_name, 'size': f_info.size,
+                                    'lastAccess': curr_time_stamp}
+            self._evict(index, used_keys, curr_time_stamp)
+            self._save_index(index)
+        # link the cached files into the destination directory using the layout of the remote eventlogs
+        res = list(eventlogs)
+        for eventlog_ind, eventlog_path, rel_path, f_info, entry_key in staged_files:
+            if eventlog_ind in failed_logs:
+                continue
+            eventlog_dir = FSUtil.build_path(dest_dir, str(eventlog_ind))
+            local_eventlog = FSUtil.build_path(eventlog_dir, eventlog_path.base_name())
+            local_file = local_eventlog if rel_path is None else FSUtil.build_path(local_eventlog, rel_path)
+            FSUtil.make_dirs(os.path.dirname(local_file))
+            FSUtil.link_resource(self._get_blob_path(entry_key, f_info.base_name), local_file)
+            res[eventlog_ind] = local_eventlog
+        fetched_sizes = [res_bytes for res_bytes in fetch_results.values() if res_bytes is not None]
+        self.logger.info('Staged %d remote files: %d read from the cache, %d downloaded (%.2f MB), %d failed',
+                         len(staged_files), len(staged_files) - len(missing_files), len(fetched_sizes),
+                         sum(fetched_sizes) / (1 << 20), len(missing_files) - len(fetched_sizes))
+        return res
@@ -0,0 +1,216 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Implementation of the automatic sizing of the JVM running the tools locally"""
+
+import math
+import os
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Optional, List, Tuple
+
+from pyarrow.fs import FileType
+
+from spark_rapids_pytools.common.utilities import ToolLogging
+from spark_rapids_tools.storagelib import CspPath
+
+GIB = 1 << 30
+
+
+@dataclass
+class HostResources:
+    """
+    The memory and the cores available to the current process. The limits of the cgroup (v1 or v2)
+    take precedence over the resources of the host because containers see the memory and the cores
+    of the whole machine.
+    """
+    cgroup_root: str = '/sys/fs/cgroup'
+    meminfo_file: str = '/proc/meminfo'
+    memory_bytes: int = field(default=None, init=False)
+    cpu_cores: int = field(default=None, init=False)
+
+    def __post_init__(self):
+        self.memory_bytes = self._detect_memory()
+        self.cpu_cores = self._detect_cores()
+
+    def _read_values(self, *path_parts: str) -> Optional[List[str]]:
+        try:
+            with open(os.path.join(self.cgroup_root, *path_parts), 'r', encoding='utf-8') as f:
+                return f.read().split()
+        except (OSError, ValueError):
+            return None
+
+    def _read_int(self, *path_parts: str) -> Optional[int]:
+        values = self._read_values(*path_parts)
+        if not values or not values[0].lstrip('-').isdigit():
+            # cgroup v2 uses "max" for unlimited values
+            return None
+        return int(values[0])
+
+    def _read_meminfo(self) -> Optional[int]:
+        meminfo = {}
+        try:
+            with open(self.meminfo_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    meminfo[key] = int(value.split()[0]) * 1024
+        except (OSError, ValueError, IndexError):
+            return None
+        return meminfo.get('MemAvailable', meminfo.get('MemTotal'))
+
+    def _get_cgroup_memory(self) -> Optional[int]:
+        # cgroup v2 first, then v1. v1 reports a huge number when the limit is not set
+        for limit_file, usage_file in [(('memory.max',), ('memory.current',)),
+                                       (('memory', 'memory.limit_in_bytes'), ('memory', 'memory.usage_in_bytes'))]:
+            limit = self._read_int(*limit_file)
+            if limit is not None and 0 < limit < (1 << 60):
+                usage = self._read_int(*usage_file) or 0
+                return max(limit - usage, 0)
+        return None
+
+    def _detect_memory(self) -> Optional[int]:
+        candidates = [v for v in [self._read_meminfo(), self._get_cgroup_memory()] if v is not None]
+        if not candidates:
+            return None
+        return min(candidates)
+
+    def _get_cgroup_cores(self) -> Optional[int]:
+        quota_values = self._read_values('cpu.max')
+        if quota_values and len(quota_values) == 2 and quota_values[0].isdigit():
+            quota, period = int(quota_values[0]), int(quota_values[1])
+        else:
+            quota = self._read_int('cpu', 'cpu.cfs_quota_us')
+            period = self._read_int('cpu', 'cpu.cfs_period_us')
+        if quota is None or period is None or quota <= 0 or period <= 0:
+            return None
+        return max(1, math.ceil(quota / period))
+
+    def _detect_cores(self) -> int:
+        if hasattr(os, 'sched_getaffinity'):
+            host_cores = len(os.sched_getaffinity(0))
+        else:
+            host_cores = os.cpu_count() or 1
+        cgroup_cores = self._get_cgroup_cores()
+        if cgroup_cores is not None:
+            return min(host_cores, cgroup_cores)
+        return host_cores
+
+
+def get_eventlogs_size(eventlogs: List[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Calculates the total size and the number of the files of the eventlogs. Directories are listed
+    recursively.
+    :param eventlogs: list of the eventlogs paths passed to the tool
+    :return: a tuple of the size in bytes and the number of files. Both are None if any of the
+             paths cannot be listed (i.e., missing credentials).
+    """
+    total_size = 0
+    files_count = 0
+    try:
+        eventlog_paths = [CspPath(eventlog) for eventlog in eventlogs]
+        # eventlogs in the same directory are resolved by a single listing
+        CspPath.prefetch_file_infos(eventlog_paths)
+        for eventlog_path in eventlog_paths:
+            if eventlog_path.is_dir():
+                f_infos = [f_info for f_info in eventlog_path.list_file_infos(recursive=True)
+                           if f_info.type == FileType.File]
+            else:
+                f_infos = [eventlog_path.file_info]
+            for f_info in f_infos:
+                total_size += f_info.size or 0
+                files_count += 1
+    except Exception:  # pylint: disable=broad-except
+        return None, None
+    return total_size, files_count
+
+
+@dataclass
+class JvmSizing:
+    """
+    Picks the heap size, the number of threads and the GC flags of the JVM running the tool.
+    The heap grows with the size of the eventlogs and with the number of threads processing them in
+    parallel. It is capped by a fraction of the memory available to the process so that the JVM
+    does not get killed on small machines.
+    The settings are loaded from the "jvmSizing" section of the tool configurations.
+    """
+    sizing_conf: dict
+    host: HostResources = field(default_factory=HostResources)
+    eventlogs_size: Optional[int] = None
+    eventlogs_count: Optional[int] = None
+    # a heap size set by the user. Only the threads are calculated in that case
+    user_heap_gb: Optional[int] = None
+    heap_gb: int = field(default=None, init=False)
+    num_threads: int = field(default=None, init=False)
+    gc_args: List[str] = field(default_factory=list, init=False)
+    logger: Logger = field(default=None, init=False)
+
+    def __post_init__(self):
+        self.logger = ToolLogging.get_and_setup_logger('rapids.tools.jvm.sizing')
+        self._calculate()
+
+    def _get_conf(self, key: str) -> float:
+        return float(self.sizing_conf.get(key))
+
+    def _get_max_heap_gb(self) -> int:
+        max_heap_gb = int(self._get_conf('maxHeapGB'))
+        if self.host.memory_bytes is None:
+            return max_heap_gb
+        available_gb = int(self.host.memory_bytes * self._get_conf('memoryFraction') / GIB)
+        return max(int(self._get_conf('minHeapGB')), min(max_heap_gb, available_gb))
+
+    def _calculate(self):
+        heap_per_thread_gb = self._get_conf('heapGBPerThread')
+        desired_threads = self.host.cpu_cores
+        if self.eventlogs_count:
+            # there is no gain from running more threads than the eventlogs
+            desired_threads = min(desired_threads, self.eventlogs_count)
+        desired_threads = max(1, desired_threads)
+        if self.user_heap_gb is not None:
+            self.heap_gb = int(self.user_heap_gb)
+        else:
+            if self.eventlogs_size is None:
+                # unknown input size. Pick the largest heap the machine can afford
+                needed_heap_gb = self._get_conf('maxHeapGB')
+            else:
+                needed_heap_gb = max(
+                    self._get_conf('baseHeapGB') + self._get_conf('heapGBPerEventlogGB') * self.eventlogs_size / GIB,
+                    desired_threads * heap_per_thread_gb)
+            self.heap_gb = min(max(int(math.ceil(needed_heap_gb)), int(self._get_conf('minHeapGB'))),
+                               self._get_max_heap_gb())
+        self.num_threads = int(max(1, min(desired_threads, self.heap_gb // heap_per_thread_gb)))
+        if self.heap_gb < self._get_conf('g1MinHeapGB'):
+            # G1 has an overhead that is not worth it on small heaps
+            self.gc_args = ['XX:+UseParallelGC', f'XX:ParallelGCThreads={self.host.cpu_cores}']
+        else:
+            self.gc_args = ['XX:+UseG1GC',
+                            f'XX:ParallelGCThreads={self.host.cpu_cores}',
+                            f'XX:ConcGCThreads={max(1, self.host.cpu_cores // 4)}']
+
+    def get_jvm_args(self) -> dict:
+        """
+        :return: the JVM arguments in the format expected by the job "jvmArgs"
+        """
+        jvm_args = {f'Xmx{self.heap_gb}g': ''}
+        jvm_args.update({gc_arg: '' for gc_arg in self.gc_args})
+        return jvm_args
+
+    def log_settings(self) -> None:
+        memory_str = 'unknown' if self.host.memory_bytes is None else f'{self.host.memory_bytes / GIB:.1f} GB'
+        eventlogs_str = 'unknown' if self.eventlogs_size is None else \
+            f'{self.eventlogs_size / GIB:.2f} GB in {self.eventlogs_count} files'
+        self.logger.info('Available resources: memory %s, cores %d. Eventlogs: %s',
+                         memory_str, self.host.cpu_cores, eventlogs_str)
+        self.logger.info('JVM settings: heap %dg%s, threads %d, GC [%s]',
+                         self.heap_gb, ' (set by the user)' if self.user_heap_gb is not None else '',
+                         self.num_threads, ' '.join(f'-{gc_arg}' for gc_arg in self.gc_args))
@@ -14,20 +14,73 @@
 
 """Implementation class representing wrapper around the RAPIDS acceleration Profiling tool."""
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from dataclasses import dataclass
+from functools import partial
 from itertools import chain
-from typing import List
+from typing import List, Optional
 
+import pandas as pd
 import yaml
 from tabulate import tabulate
 
 from spark_rapids_pytools.cloud_api.sp_types import ClusterBase
+from spark_rapids_pytools.common.columnar import get_columnar_file_path, write_parquet_report
 from spark_rapids_pytools.common.sys_storage import FSUtil
-from spark_rapids_pytools.common.utilities import Utils
+from spark_rapids_pytools.common.tracing import ToolTracer
+from spark_rapids_pytools.common.utilities import ToolLogging, Utils
 from spark_rapids_pytools.rapids.rapids_tool import RapidsJarTool
 
+APP_NAME_PATTERN = re.compile(r'(\|spark\.app\.name\s+\|)(.+)\|')
+
+
+def read_app_recommendations(file_path: str, headers: dict) -> Optional[tuple]:
+    """
+    Scans the profile log of a single app line by line to collect the app name and the recommended
+    properties and comments listed in the recommendations section. It is defined at the module
+    level to be run by the workers of a process pool.
+    :param file_path: the path of the profile log of the app
+    :param headers: the patterns of the headers of the recommendations section
+    :return: a tuple of the app name, the properties and the comments. None if the file cannot be read.
+    """
+    section_pattern = headers.get('section')
+    props_pattern = headers.get('sparkProperties')
+    comments_pattern = headers.get('comments')
+    app_name = None
+    props_list = []
+    comments_list = []
+    # the state is one of: before the section, in the section, in the properties or in the comments
+    state = 'preamble'
+    try:
+        with open(file_path, 'rt', encoding='utf-8') as app_profiler:
+            for raw_line in app_profiler:
+                line = raw_line.strip()
+                if not line:
+                    continue
+                if app_name is None and 'spark.app.name' in line:
+                    app_name_match = APP_NAME_PATTERN.search(line)
+                    if app_name_match:
+                        app_name = app_name_match.group(2).strip()
+                if state == 'preamble':
+                    if section_pattern in line:
+                        state = 'section'
+                    else:
+                        continue
+                if state == 'comments':
+                    comments_list.append(line)
+                elif comments_pattern in line:
+                    state = 'comments'
+                elif state == 'props':
+                    props_list.append(line)
+                elif props_pattern in line:
+                    state = 'props'
+    except OSError:
+        return None
+    return app_name or '', props_list, comments_list
+
 
 @dataclass
 class Profiling(RapidsJarTool):
@@ -132,59 +185,11 @@ class Profiling(RapidsJarTool):
             return ['--auto-tuner']
         return ['--auto-tuner', '--worker-info', autotuner_path]
 
-    def __read_single_app_output(self, file_path: str) -> (str, List[str], List[str]):
-        def split_list_str_by_pattern(input_seq: List[str], pattern: str) -> int:
-            ind = 0
-            while ind < len(input_seq):
-                if input_seq[ind].find(pattern) != -1:
-                    return ind
-                ind += 1
-            return -1
-
-        try:
-            props_list = []
-            comments_list = []
-            app_name: str = ''
-            with open(file_path, 'rt', encoding='utf-8') as app_profiler:
-                raw_lines = [line.strip() for line in app_profiler.readlines() if line.strip()]
-                # find the app_name
-                app_name_candidates = re.findall(r'(\|spark\.app\.name\s+\|)(.+)\|',
-                                                 Utils.gen_multiline_str(raw_lines),
-                                                 flags=re.MULTILINE)
-                if len(app_name_candidates) > 0:
-                    _, grp_2 = app_name_candidates[0]
-                    app_name = grp_2.strip()
-                header_pattern = self.ctxt.get_value('toolOutput', 'recommendations', 'headers',
-                                                     'section')
-                spark_pattern = self.ctxt.get_value('toolOutput', 'recommendations', 'headers',
-                                                    'sparkProperties')
-                comments_pattern = self.ctxt.get_value('toolOutput', 'recommendations', 'headers',
-                                                       'comments')
-                begin_props_ind = -1
-                last_props_ind = -1
-                begin_comm_ind = -1
-                last_comm_ind = -1
-                section_ind = split_list_str_by_pattern(raw_lines, header_pattern)
-                if section_ind != -1:
-                    recom_section = raw_lines[section_ind:]
-                    recom_properties_ind = split_list_str_by_pattern(recom_section,
-                                                                     spark_pattern)
-                    if recom_properties_ind not in (-1, len(recom_section) - 1):
-                        begin_props_ind = recom_properties_ind + 1
-                    recom_comments_ind = split_list_str_by_pattern(recom_section, comments_pattern)
-                    if recom_comments_ind != -1:
-                        last_props_ind = recom_comments_ind
-                        begin_comm_ind = recom_comments_ind + 1
-                        last_comm_ind = len(recom_section)
-                    else:
-                        last_props_ind = len(recom_section)
-                        last_comm_ind = len(recom_section)
-                if begin_props_ind != -1:
-                    props_list = recom_section[begin_props_ind: last_props_ind]
-                if begin_comm_ind != -1:
-                    comments_list = recom_section[begin_comm_ind: last_comm_ind]
-        except OSError:
+    def __complete_app_output(self, file_path: str, app_output: Optional[tuple]) -> (str, List[str], List[str]):
+        if app_output is None:
             self.logger.error('Could not open output of profiler %s', file_path)
+            app_output = '', [], []
+        app_name, props_list, comments_list = app_output
         if len(props_list) == 0:
             props_list = ['- No recommendations']
         if len(comments_list) == 0:
@@ -196,14 +201,37 @@ class Profiling(RapidsJarTool):
         props_list.sort()
         return app_name, props_list, comments_list
 
+    def __read_apps_output(self, app_folders: List[str]) -> List[tuple]:
+        """
+        Parses the logs of the apps in the same order as their folders. The logs are parsed by a
+        pool of processes when there are enough apps to pay off starting the workers.
+        """
+        profiling_log = self.ctxt.get_value('toolOutput', 'recommendations', 'fileName')
+        log_files = [f'{app_folder}/{profiling_log}' for app_folder in app_folders]
+        read_cb = partial(read_app_recommendations,
+                          headers=self.ctxt.get_value('toolOutput', 'recommendations', 'headers'))
+        parser_conf = self.ctxt.get_value('local', 'output', 'recommendationsParser')
+        max_workers = min(parser_conf.get('maxWorkers'), os.cpu_count() or 1)
+        if len(log_files) < parser_conf.get('minAppsForProcessPool') or max_workers < 2:
+            apps_output = [read_cb(log_file) for log_file in log_files]
+        else:
+            self.logger.info('Parsing the output of %d apps using %d processes', len(log_files), max_workers)
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=ToolLogging.get_process_pool_context()) as executor:
+                # map() yields the results in the order of the files
+                apps_output = list(executor.map(read_cb, log_files,
+                                                chunksize=max(1, len(log_files) // (max_workers * 4))))
+        return [self.__complete_app_output(log_file, app_output)
+                for log_file, app_output in zip(log_files, apps_output)]
+
     def _write_summary(self):
         print(Utils.gen_multiline_str(self._report_tool_full_location(),
                                       self.ctxt.get_ctxt('wrapperOutputContent')))
 
     def __generate_report_with_recommendations(self):
         prof_app_dirs = FSUtil.get_subdirectories(self.ctxt.get_rapids_output_folder())
-        profiling_log = self.ctxt.get_value('toolOutput', 'recommendations', 'fileName')
         recommendations_table = []
+        recommendations_records = []
         log_lines = []
 
         header_str = '### Recommended configurations ###'
@@ -211,9 +239,9 @@ class Profiling(RapidsJarTool):
         sec_comments_head = ['\tComments:']
         log_lines.append(header_str)
         headers = self.ctxt.get_value('local', 'output', 'summaryColumns')
-        for app_folder in prof_app_dirs:
+        for app_folder, app_output in zip(prof_app_dirs, self.__read_apps_output(prof_app_dirs)):
             app_id = FSUtil.get_resource_name(app_folder)
-            app_name, recommendations, comments = self.__read_single_app_output(f'{app_folder}/{profiling_log}')
+            app_name, recommendations, comments = app_output
             row = [app_id,
                    app_name,
                    Utils.gen_multiline_str(recommendations),
@@ -226,12 +254,20 @@ class Profiling(RapidsJarTool):
             log_lines.append(f'{sec_props}')
             log_lines.append(f'{sec_comments}')
             recommendations_table.append(row)
+            recommendations_records.append([app_id, app_name, recommendations, comments])
         log_file_name = self.ctxt.get_value('local', 'output', 'fileName')
         summary_file = FSUtil.build_path(self.ctxt.get_output_folder(), log_file_name)
-        self.logger.info('Writing recommendations into local file %s', summary_file)
         log_file_lines_str = Utils.gen_multiline_str(log_lines)
-        with open(summary_file, 'w', encoding='utf-8') as wrapper_summary:
-            wrapper_summary.write(log_file_lines_str)
+        output_format = self._get_output_format()
+        if output_format.writes_csv():
+            self.logger.info('Writing recommendations into local file %s', summary_file)
+            with open(summary_file, 'w', encoding='utf-8') as wrapper_summary:
+                wrapper_summary.write(log_file_lines_str)
+        if output_format.writes_parquet():
+            parquet_file = get_columnar_file_path(summary_file)
+            self.logger.info('Writing recommendations into local file %s', parquet_file)
+            write_parquet_report(pd.DataFrame(recommendations_records, columns=headers), parquet_file,
+                                 self.ctxt.get_value('local', 'output', 'columnarSchema'))
         self.logger.info('Generating Full STDOUT summary report')
         # wrapper STDOUT report contains both tabular and plain text format of recommendations
         wrapper_content = [Utils.gen_report_sec_header('Recommendations'),
@@ -244,7 +280,8 @@ class Profiling(RapidsJarTool):
         if not self._evaluate_rapids_jar_tool_output_exist():
             return
 
-        self.__generate_report_with_recommendations()
+        with ToolTracer.span('Generating the recommendations report', 'dataframe'):
+            self.__generate_report_with_recommendations()
 
     def _init_rapids_arg_list(self) -> List[str]:
         return self._create_autotuner_rapids_args()
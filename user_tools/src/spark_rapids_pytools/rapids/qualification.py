@@ -16,17 +16,19 @@
 
 import textwrap
 from dataclasses import dataclass, field
-from math import ceil
 from typing import Any, List, Callable
 
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 
 from spark_rapids_tools.enums import QualFilterApp, QualGpuClusterReshapeType
 from spark_rapids_pytools.cloud_api.sp_types import ClusterReshape, NodeHWInfo
+from spark_rapids_pytools.common.columnar import get_columnar_file_path, read_tabular_report, write_parquet_report
 from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.common.tracing import ToolTracer
 from spark_rapids_pytools.common.utilities import Utils, TemplateGenerator
-from spark_rapids_pytools.pricing.price_provider import SavingsEstimator
+from spark_rapids_pytools.pricing.price_provider import SavingsEstimator, SavingsEstimatorPool
 from spark_rapids_pytools.rapids.rapids_tool import RapidsJarTool
 
 
@@ -87,6 +89,7 @@ class QualificationSummary:
     def generate_report(self,
                         app_name: str,
                         wrapper_csv_file: str = None,
+                        wrapper_parquet_file: str = None,
                         csp_report_provider: Callable[[], List[str]] = lambda: [],
                         df_pprinter: Any = None,
                         output_pprinter: Any = None):
@@ -114,6 +117,9 @@ class QualificationSummary:
             if wrapper_csv_file is not None:
                 abs_path = FSUtil.get_abs_path(wrapper_csv_file)
                 report_content.append(f'    - Full savings and speedups CSV report: {abs_path}')
+            if wrapper_parquet_file is not None:
+                abs_path = FSUtil.get_abs_path(wrapper_parquet_file)
+                report_content.append(f'    - Full savings and speedups Parquet report: {abs_path}')
 
             pretty_df = df_pprinter(self.df_result)
             if pretty_df.empty:
@@ -511,25 +517,24 @@ class Qualification(RapidsJarTool):
         cpu_dur_col = 'App Duration'
 
         def f_cell(x):
-            return ceil(x * 100) / 100
+            return np.ceil(x * 100) / 100
 
-        def calc_cluster_shape_col(df_row, min_worker_cnt: int, old_workers_cnt: int) -> pd.Series:
-            gpu_speedup = df_row[speedup_col]
+        def calc_cluster_shape_col(apps_df: pd.DataFrame, min_worker_cnt: int, old_workers_cnt: int) -> np.ndarray:
+            gpu_speedups = apps_df[speedup_col].to_numpy(dtype=float)
             # We should not worry about division by 0 because speedup is BGE 1.0
-            cluster_shape = max(min_worker_cnt, ceil(scale_f * old_workers_cnt / gpu_speedup))
-            return pd.Series([cluster_shape])
+            cluster_shapes = np.ceil(scale_f * old_workers_cnt / gpu_speedups)
+            return np.maximum(min_worker_cnt, cluster_shapes).astype('int64')
 
         def update_cols_with_new_shape(apps_df: pd.DataFrame,
-                                       old_workers_cnt: int) -> (pd.DataFrame, bool):
-            apps_df[gpu_dur_col] = apps_df.apply(lambda row: f_cell(
-                (old_workers_cnt / row[reshape_col]) * scale_f * row[cpu_dur_col] / row[speedup_col]), axis=1)
-            apps_df[speedup_col] = apps_df.apply(
-                lambda row: f_cell(row[cpu_dur_col] / row[gpu_dur_col]), axis=1
-            )
+                                       old_workers_cnt: int) -> pd.DataFrame:
+            apps_df[gpu_dur_col] = f_cell(
+                (old_workers_cnt / apps_df[reshape_col]) * scale_f * apps_df[cpu_dur_col] / apps_df[speedup_col])
+            apps_df[speedup_col] = f_cell(apps_df[cpu_dur_col] / apps_df[gpu_dur_col])
             return apps_df
 
-        all_apps[[reshape_col]] = all_apps.apply(
-            lambda row: calc_cluster_shape_col(row, min_w_cnt, cluster_workers_cnt), axis=1)
+        # all the columns are calculated on the entire frame at once instead of applying the
+        # calculations row by row
+        all_apps[reshape_col] = calc_cluster_shape_col(all_apps, min_w_cnt, cluster_workers_cnt)
         recalc_speedups_flag = True
         if cluster_shape_t == QualGpuClusterReshapeType.CLUSTER:
             # the column value should be reset to the maximum of all the rows
@@ -559,11 +564,37 @@ class Qualification(RapidsJarTool):
             apps_df = all_apps
         return apps_df, per_row_flag
 
+    def __create_saving_estimator(self, reshaped_cluster: ClusterReshape) -> SavingsEstimator:
+        """
+        Gets a savings estimator from the process-wide pool. The estimators are identified by the
+        platform, the region, the hardware of both clusters and the external costs.
+        """
+        cpu_cluster = self.ctxt.get_ctxt('cpuClusterProxy')
+        target_cost = self.ctxt.get_ctxt('target_cost')
+        source_cost = self.ctxt.get_ctxt('source_cost')
+        cpu_fingerprint = cpu_cluster.get_shape_fingerprint()
+        gpu_fingerprint = reshaped_cluster.get_shape_fingerprint()
+        pool_key = None
+        if cpu_fingerprint is not None and gpu_fingerprint is not None:
+            pool_key = (self.ctxt.platform.get_platform_name(),
+                        self.ctxt.get_ctxt('targetPlatform'),
+                        self.ctxt.platform.cli.get_region(),
+                        cpu_fingerprint,
+                        gpu_fingerprint,
+                        target_cost,
+                        source_cost)
+        return SavingsEstimatorPool.get_or_create(
+            pool_key,
+            lambda: self.ctxt.platform.create_saving_estimator(cpu_cluster, reshaped_cluster,
+                                                               target_cost, source_cost))
+
     def __calc_apps_cost(self,
                          app_df_set: pd.DataFrame,
                          shape_col: str,
                          speedup_rec_col: str,
                          cost_per_row: bool = False):
+        if self.ctxt.get_value_silent('local', 'output', 'processDFProps', 'vectorizedCostCalculation'):
+            return self.__calc_apps_cost_vectorized(app_df_set, shape_col, speedup_rec_col, cost_per_row)
         # used for the caching of the per-row estimator for optimizations
         saving_estimator_cache = {}
         savings_ranges = self.ctxt.get_value('local', 'output', 'processDFProps',
@@ -601,10 +632,7 @@ class Qualification(RapidsJarTool):
                 # create the object and add it to the caching dict
                 reshaped_cluster = ClusterReshape(self.ctxt.get_ctxt('gpuClusterProxy'),
                                                   reshape_workers_cnt=lambda x: workers_cnt)
-                estimator_obj = self.ctxt.platform.create_saving_estimator(self.ctxt.get_ctxt('cpuClusterProxy'),
-                                                                           reshaped_cluster,
-                                                                           self.ctxt.get_ctxt('target_cost'),
-                                                                           self.ctxt.get_ctxt('source_cost'))
+                estimator_obj = self.__create_saving_estimator(reshaped_cluster)
                 saving_estimator_cache.setdefault(workers_cnt, estimator_obj)
             cost_pd_series = get_costs_for_single_app(df_row, estimator_obj)
             return cost_pd_series
@@ -613,18 +641,87 @@ class Qualification(RapidsJarTool):
         if not cost_per_row:
             # initialize the savings estimator only once
             reshaped_gpu_cluster = ClusterReshape(self.ctxt.get_ctxt('gpuClusterProxy'))
-            savings_estimator = self.ctxt.platform.create_saving_estimator(self.ctxt.get_ctxt('cpuClusterProxy'),
-                                                                           reshaped_gpu_cluster,
-                                                                           self.ctxt.get_ctxt('target_cost'),
-                                                                           self.ctxt.get_ctxt('source_cost'))
+            savings_estimator = self.__create_saving_estimator(reshaped_gpu_cluster)
             app_df_set[cost_cols] = app_df_set.apply(
                 lambda row: get_costs_for_single_app(row, estimator=savings_estimator), axis=1)
         else:
             # this is per row calculation and saving estimator should be created for each row
             app_df_set[cost_cols] = app_df_set.apply(
                 lambda row: get_cost_per_row(row, shape_col), axis=1)
+        self.logger.debug('Savings estimators pool stats: %s', SavingsEstimatorPool.get_stats())
+        return app_df_set
+
+    def __calc_apps_cost_vectorized(self,
+                                    app_df_set: pd.DataFrame,
+                                    shape_col: str,
+                                    speedup_rec_col: str,
+                                    cost_per_row: bool = False):
+        """
+        Column-wise implementation of the cost calculations. It generates the same values as the
+        per-row implementation, but it processes all the applications in a single pass.
+        """
+        savings_ranges = self.ctxt.get_value('local', 'output', 'processDFProps',
+                                             'savingRecommendationsRanges')
+        cpu_discount = self.ctxt.get_ctxt('cpu_discount')
+        gpu_discount = self.ctxt.get_ctxt('gpu_discount')
+        app_durations = app_df_set['App Duration'].to_numpy(dtype=float)
+        gpu_durations = app_df_set['Estimated GPU Duration'].to_numpy(dtype=float)
+        if not cost_per_row:
+            # initialize the savings estimator only once
+            savings_estimator = self.__create_saving_estimator(ClusterReshape(self.ctxt.get_ctxt('gpuClusterProxy')))
+            raw_cpu_cost, raw_gpu_cost, _ = savings_estimator.get_costs_and_savings_vectorized(app_durations,
+                                                                                               gpu_durations)
+        else:
+            # create a single estimator for each distinct cluster shape
+            raw_cpu_cost = np.zeros(len(app_df_set))
+            raw_gpu_cost = np.zeros(len(app_df_set))
+            for workers_cnt, row_positions in app_df_set.groupby(shape_col).indices.items():
+                reshaped_cluster = ClusterReshape(self.ctxt.get_ctxt('gpuClusterProxy'),
+                                                  reshape_workers_cnt=lambda x, cnt=workers_cnt: cnt)
+                savings_estimator = self.__create_saving_estimator(reshaped_cluster)
+                group_cpu_cost, group_gpu_cost, _ = savings_estimator.get_costs_and_savings_vectorized(
+                    app_durations[row_positions], gpu_durations[row_positions])
+                raw_cpu_cost[row_positions] = group_cpu_cost
+                raw_gpu_cost[row_positions] = group_gpu_cost
+
+        cpu_cost = (100 - cpu_discount) / 100 * raw_cpu_cost
+        gpu_cost = (100 - gpu_discount) / 100 * raw_gpu_cost
+        with np.errstate(divide='ignore', invalid='ignore'):
+            est_savings = 100.0 - ((100.0 * gpu_cost) / cpu_cost)
+        savings_recommendations = np.full(len(app_df_set), None, dtype=object)
+        # iterate in the reverse order so that the first matching range takes precedence
+        for s_range in reversed(list(savings_ranges.values())):
+            range_mask = (s_range.get('lowerBound') <= est_savings) & (est_savings < s_range.get('upperBound'))
+            savings_recommendations[range_mask] = s_range.get('title')
+        # We do not want to mistakenly mark a Not-applicable app as Recommended in the savings column
+        savings_recommendations[(app_df_set[speedup_rec_col] == 'Not Applicable').to_numpy()] = 'Not Applicable'
+        # For TCO, calculating annual cost savings based on job frequency
+        if 'Estimated Job Frequency (monthly)' in app_df_set.columns:
+            job_frequency = app_df_set['Estimated Job Frequency (monthly)'].to_numpy()
+        else:
+            job_frequency = np.full(len(app_df_set), 30)  # default frequency is daily
+        annual_cost_savings = job_frequency * 12 * (cpu_cost - gpu_cost)
+
+        cost_cols = self.ctxt.get_value('local', 'output', 'costColumns')
+        cost_values = [savings_recommendations, cpu_cost, gpu_cost,
+                       est_savings, job_frequency, annual_cost_savings]
+        for cost_col, col_values in zip(cost_cols, cost_values):
+            app_df_set[cost_col] = col_values
+        self.logger.debug('Savings estimators pool stats: %s', SavingsEstimatorPool.get_stats())
         return app_df_set
 
+    def __write_summary_files(self, apps_df: pd.DataFrame, csv_out: str):
+        output_format = self._get_output_format()
+        if output_format.writes_csv():
+            self.logger.info('Writing the summary report into %s', csv_out)
+            # we can use the general format as well but this will transform numbers to E+. So, stick with %f
+            apps_df.to_csv(csv_out, float_format='%.2f')
+        if output_format.writes_parquet():
+            parquet_out = get_columnar_file_path(csv_out)
+            self.logger.info('Writing the summary report into %s', parquet_out)
+            write_parquet_report(apps_df, parquet_out,
+                                 self.ctxt.get_value('local', 'output', 'columnarSchema'))
+
     def __build_global_report_summary(self,
                                       all_apps: pd.DataFrame,
                                       csv_out: str) -> QualificationSummary:
@@ -632,8 +729,9 @@ class Qualification(RapidsJarTool):
             # No need to run saving estimator or process the data frames.
             return QualificationSummary(comments=self.__generate_mc_types_conversion_report())
 
-        apps_pruned_df, prune_notes = self.__remap_columns_and_prune(all_apps)
-        recommended_apps = self.__get_recommended_apps(apps_pruned_df)
+        with ToolTracer.span('Pruning the applications', 'dataframe', rows=len(all_apps)):
+            apps_pruned_df, prune_notes = self.__remap_columns_and_prune(all_apps)
+            recommended_apps = self.__get_recommended_apps(apps_pruned_df)
         # if the gpu_reshape_type is set to JOB then, then we should ignore recommended apps
         speedups_irrelevant_flag = self.__recommendation_is_non_standard()
         reshaped_notes = self.__generate_cluster_shape_report()
@@ -655,26 +753,27 @@ class Qualification(RapidsJarTool):
         reshape_col = self.ctxt.get_value('local', 'output', 'processDFProps',
                                           'clusterShapeCols', 'columnName')
         speed_recommendation_col = self.ctxt.get_value('local', 'output', 'speedupRecommendColumn')
-        apps_reshaped_df, per_row_flag = self.__apply_gpu_cluster_reshape(apps_pruned_df)
+        with ToolTracer.span('Reshaping the GPU clusters', 'dataframe', rows=len(apps_pruned_df)):
+            apps_reshaped_df, per_row_flag = self.__apply_gpu_cluster_reshape(apps_pruned_df)
 
         if launch_savings_calc:
             # Now, the dataframe is ready to calculate the cost and the savings
-            apps_working_set = self.__calc_apps_cost(apps_reshaped_df,
-                                                     reshape_col,
-                                                     speed_recommendation_col,
-                                                     per_row_flag)
+            with ToolTracer.span('Calculating the savings', 'dataframe', rows=len(apps_reshaped_df)):
+                apps_working_set = self.__calc_apps_cost(apps_reshaped_df,
+                                                         reshape_col,
+                                                         speed_recommendation_col,
+                                                         per_row_flag)
             df_final_result = apps_working_set
             if not apps_working_set.empty:
-                self.logger.info('Generating GPU Estimated Speedup and Savings as: %s', csv_out)
-                # we can use the general format as well but this will transform numbers to E+. So, stick with %f
-                apps_working_set.to_csv(csv_out, float_format='%.2f')
+                self.logger.info('Generating GPU Estimated Speedup and Savings')
+                self.__write_summary_files(apps_working_set, csv_out)
         else:
             df_final_result = apps_reshaped_df
             if not apps_reshaped_df.empty:
                 # Do not include estimated job frequency in csv file
                 apps_reshaped_df = apps_reshaped_df.drop(columns=['Estimated Job Frequency (monthly)'])
-                self.logger.info('Generating GPU Estimated Speedup: as %s', csv_out)
-                apps_reshaped_df.to_csv(csv_out, float_format='%.2f')
+                self.logger.info('Generating GPU Estimated Speedup')
+                self.__write_summary_files(apps_reshaped_df, csv_out)
 
         return QualificationSummary(comments=report_comments,
                                     all_apps=apps_pruned_df,
@@ -754,15 +853,21 @@ class Qualification(RapidsJarTool):
         rapids_summary_file = FSUtil.build_path(rapids_output_dir,
                                                 self.ctxt.get_value('toolOutput', 'csv', 'summaryReport', 'fileName'))
         self.ctxt.logger.debug('Rapids CSV summary file is located as: %s', rapids_summary_file)
-        df = pd.read_csv(rapids_summary_file)
+        with ToolTracer.span('Reading the summary report', 'dataframe'):
+            df = read_tabular_report(rapids_summary_file)
         csv_file_name = self.ctxt.get_value('local', 'output', 'fileName')
         csv_summary_file = FSUtil.build_path(self.ctxt.get_output_folder(), csv_file_name)
         report_gen = self.__build_global_report_summary(df, csv_summary_file)
-        summary_report = report_gen.generate_report(app_name=self.pretty_name(),
-                                                    wrapper_csv_file=csv_summary_file,
-                                                    csp_report_provider=self._generate_platform_report_sections,
-                                                    df_pprinter=process_df_for_stdout,
-                                                    output_pprinter=self._report_tool_full_location)
+        output_format = self._get_output_format()
+        wrapper_csv_file = csv_summary_file if output_format.writes_csv() else None
+        wrapper_parquet_file = get_columnar_file_path(csv_summary_file) if output_format.writes_parquet() else None
+        with ToolTracer.span('Formatting the summary report', 'dataframe'):
+            summary_report = report_gen.generate_report(app_name=self.pretty_name(),
+                                                        wrapper_csv_file=wrapper_csv_file,
+                                                        wrapper_parquet_file=wrapper_parquet_file,
+                                                        csp_report_provider=self._generate_platform_report_sections,
+                                                        df_pprinter=process_df_for_stdout,
+                                                        output_pprinter=self._report_tool_full_location)
         self.ctxt.set_ctxt('wrapperOutputContent', summary_report)
 
     def _write_summary(self):
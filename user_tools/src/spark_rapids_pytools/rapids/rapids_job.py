@@ -14,9 +14,10 @@
 
 """Abstract representation of a wrapper Job"""
 
+from collections import deque
 from dataclasses import dataclass, field
 from logging import Logger
-from typing import List
+from typing import Callable, ClassVar, List
 
 from spark_rapids_pytools.common.prop_manager import JSONPropertiesContainer
 from spark_rapids_pytools.common.utilities import ToolLogging, Utils
@@ -54,9 +55,15 @@ class RapidsJob:
     """
     prop_container: RapidsJobPropContainer
     exec_ctxt: ToolContext
+    # optional hook called with (stream_name, line) for each line emitted while the job is running
+    progress_cb: Callable[[str, str], None] = field(default=None)
     output_path: str = field(default=None, init=False)
+    output_streamed: bool = field(default=False, init=False)
     job_label: str = field(default=None, init=False)
     logger: Logger = field(default=None, init=False)
+    # the last lines of the stderr of the job, reported when the job fails
+    stderr_tail: deque = field(default=None, init=False)
+    stderr_tail_size: ClassVar[int] = 50
 
     def get_platform_name(self):
         return self.exec_ctxt.get_platform_name()
@@ -64,6 +71,7 @@ class RapidsJob:
     def _init_fields(self):
         self.logger = ToolLogging.get_and_setup_logger(f'rapids.tools.submit.{self.job_label}')
         self.output_path = self.prop_container.get_value_silent('outputDirectory')
+        self.stderr_tail = deque(maxlen=self.stderr_tail_size)
 
     def __post_init__(self):
         self._init_fields()
@@ -91,6 +99,14 @@ class RapidsJob:
     def _submit_job(self, cmd_args: list) -> str:
         raise NotImplementedError
 
+    def _process_output_line(self, stream_name: str, line: str):
+        # the output of the job is written to the log file as soon as it is emitted
+        self.logger.debug('%s | %s', stream_name, line)
+        if stream_name == 'stderr':
+            self.stderr_tail.append(line)
+        if self.progress_cb is not None:
+            self.progress_cb(stream_name, line)
+
     def _print_job_output(self, job_output: str):
         stdout_splits = job_output.splitlines()
         if len(stdout_splits) > 0:
@@ -98,12 +114,23 @@ class RapidsJob:
             stdout_str = f'\n\t<STDOUT>\n{std_out_lines}'
             self.logger.info('%s job output:%s', self.get_platform_name(), stdout_str)
 
+    def _print_stderr_tail(self):
+        std_err_lines = Utils.gen_multiline_str([f'\t| {line}' for line in self.stderr_tail])
+        self.logger.error('%s job failed. Last %d lines of the job stderr:\n\t<STDERR>\n%s',
+                          self.get_platform_name(), len(self.stderr_tail), std_err_lines)
+
     def run_job(self):
         self.logger.info('Prepare job submission command')
         cmd_args = self._build_submission_cmd()
         self.logger.info('Running the Rapids Job...')
-        job_output = self._submit_job(cmd_args)
-        if not ToolLogging.is_debug_mode_enabled():
+        try:
+            job_output = self._submit_job(cmd_args)
+        except Exception:
+            # the streamed lines are logged at debug level, so the cause of the failure is reported here
+            if self.output_streamed and self.stderr_tail:
+                self._print_stderr_tail()
+            raise
+        if not (ToolLogging.is_debug_mode_enabled() or self.output_streamed):
             # we check the debug level because we do not want the output to be displayed twice
             self._print_job_output(job_output)
         return job_output
@@ -148,6 +175,9 @@ class RapidsLocalJob(RapidsJob):
 
     def _submit_job(self, cmd_args: list) -> str:
         env_args = self.prop_container.get_value_silent('platformArgs', 'envArgs')
+        # stream the output of the JVM instead of buffering it until the job completes
+        self.output_streamed = True
         out_std = self.exec_ctxt.platform.cli.run_sys_cmd(cmd=cmd_args,
-                                                          env_vars=env_args)
+                                                          env_vars=env_args,
+                                                          stream_lines_cb=self._process_output_line)
         return out_std
@@ -24,17 +24,23 @@ import time
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from logging import Logger
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
+
+from tabulate import tabulate
 
 import spark_rapids_pytools
 from spark_rapids_tools import CspEnv
+from spark_rapids_tools.enums import ToolOutputFormat
 from spark_rapids_pytools.cloud_api.sp_types import get_platform, \
     ClusterBase, DeployMode, NodeHWInfo
 from spark_rapids_pytools.common.prop_manager import YAMLPropertiesContainer
 from spark_rapids_pytools.common.sys_storage import FSUtil, FileVerifier
+from spark_rapids_pytools.common.tracing import ToolTracer
 from spark_rapids_pytools.common.utilities import ToolLogging, Utils, ToolsSpinner
+from spark_rapids_pytools.rapids.jvm_sizing import JvmSizing, get_eventlogs_size
 from spark_rapids_pytools.rapids.rapids_job import RapidsJobPropContainer
 from spark_rapids_pytools.rapids.tool_ctxt import ToolContext
+from spark_rapids_pytools.rapids.tools_jar_cache import ToolsJarCache
 
 
 @dataclass
@@ -50,6 +56,7 @@ class RapidsTool(object):
     :param name: the name of the tool
     :param ctxt: context manager for the current tool execution.
     :param logger: the logger instant associated to the current tool.
+    :param tracer: records the timing of the phases and the steps of the current execution.
     """
     platform_type: CspEnv
     cluster: str = None
@@ -61,6 +68,11 @@ class RapidsTool(object):
     ctxt: ToolContext = field(default=None, init=False)
     logger: Logger = field(default=None, init=False)
     spinner: ToolsSpinner = field(default=None, init=False)
+    tracer: ToolTracer = field(default=None, init=False)
+    # the trace file is written into the output folder in the Chrome trace-event format
+    TRACE_FILE_NAME = 'rapids_tools_trace.json'
+    # number of the longest spans listed at the end of the report
+    TRACE_TOP_SPANS = 10
 
     def pretty_name(self):
         return self.name.capitalize()
@@ -92,7 +104,8 @@ class RapidsTool(object):
         def decorator(func_cb: Callable):
             def wrapper(self, *args, **kwargs):
                 start_time = time.monotonic()
-                func_cb(self, *args, **kwargs)  # pylint: disable=not-callable
+                with ToolTracer.span(timed_item, 'step'):
+                    func_cb(self, *args, **kwargs)  # pylint: disable=not-callable
                 end_time = time.monotonic()
                 self.logger.info('Total Execution Time: %s => %s seconds', timed_item,
                                  f'{(end_time-start_time):,.3f}')
@@ -105,15 +118,17 @@ class RapidsTool(object):
         def decorator(func_cb: Callable):
             def wrapper(self, *args, **kwargs):
                 try:
-                    if enable_prologue:
-                        self.logger.info('******* [%s]: Starting *******', phase_name)
-                    func_cb(self, *args, **kwargs)  # pylint: disable=not-callable
-                    if enable_epilogue:
-                        self.logger.info('======= [%s]: Finished =======', phase_name)
+                    with ToolTracer.span(phase_name, 'phase'):
+                        if enable_prologue:
+                            self.logger.info('******* [%s]: Starting *******', phase_name)
+                        func_cb(self, *args, **kwargs)  # pylint: disable=not-callable
+                        if enable_epilogue:
+                            self.logger.info('======= [%s]: Finished =======', phase_name)
                 except Exception:    # pylint: disable=broad-except
                     logging.exception('%s. Raised an error in phase [%s]\n',
                                       self.pretty_name(),
                                       phase_name)
+                    ToolLogging.flush()
                     sys.exit(1)
             return wrapper
         return decorator
@@ -135,6 +150,14 @@ class RapidsTool(object):
         self.logger.debug('Root directory of local storage is set as: %s', self.output_folder)
         self.ctxt.set_local_workdir(self.output_folder)
         self.ctxt.load_prepackaged_resources()
+        output_format = self.wrapper_options.get('outputFormat') or ToolOutputFormat.get_default()
+        self.ctxt.set_ctxt('outputFormat', ToolOutputFormat(output_format))
+
+    def _get_output_format(self) -> ToolOutputFormat:
+        output_format = self.ctxt.get_ctxt('outputFormat')
+        if output_format is None:
+            return ToolOutputFormat.get_default()
+        return output_format
 
     def _process_rapids_args(self):
         pass
@@ -277,14 +300,72 @@ class RapidsTool(object):
     def launch(self):
         # Spinner should not be enabled in debug mode
         enable_spinner = not ToolLogging.is_debug_mode_enabled()
-        with ToolsSpinner(enabled=enable_spinner) as self.spinner:
-            self._init_tool()
-            self._connect_to_execution_cluster()
-            self._process_arguments()
-            self._execute()
-            self._collect_result()
-            self._archive_phase()
-            self._finalize()
+        if self._is_tracing_enabled():
+            self.tracer = ToolTracer(self.pretty_name()).activate()
+        try:
+            with ToolTracer.span(self.pretty_name(), 'tool', is_root=True):
+                with ToolsSpinner(enabled=enable_spinner) as self.spinner:
+                    self._init_tool()
+                    self._connect_to_execution_cluster()
+                    self._process_arguments()
+                    self._execute()
+                    self._collect_result()
+                    self._archive_phase()
+                    self._finalize()
+            self._report_timing_summary()
+        finally:
+            self._write_trace_file()
+            # the records are written before the caller reads the console output
+            ToolLogging.flush()
+
+    @classmethod
+    def _is_tracing_enabled(cls) -> bool:
+        """
+        The tracing is enabled by default. It can be disabled by setting the env-var
+        RAPIDS_USER_TOOLS_TRACE to false.
+        """
+        return str(Utils.get_rapids_tools_env('TRACE', 'True')).lower() in ('true', '1')
+
+    def _get_trace_file(self) -> Optional[str]:
+        if self.tracer is None or self.ctxt is None:
+            return None
+        output_folder = self.ctxt.get_output_folder()
+        if output_folder is None or not os.path.isdir(output_folder):
+            return None
+        return FSUtil.build_path(output_folder, self.TRACE_FILE_NAME)
+
+    def _write_trace_file(self) -> None:
+        if self.tracer is None:
+            return
+        self.tracer.deactivate()
+        trace_file = self._get_trace_file()
+        if trace_file is None:
+            return
+        try:
+            self.tracer.write_trace_file(trace_file)
+            self.logger.info('The timing trace of the execution is written to %s', trace_file)
+        except OSError as trace_ex:
+            self.logger.warning('Could not write the timing trace %s: %s', trace_file, trace_ex)
+
+    def _report_timing_summary(self) -> None:
+        """Lists the phases and the steps that took the longest time at the end of the report."""
+        if self.tracer is None:
+            return
+        top_spans = self.tracer.get_top_spans(self.TRACE_TOP_SPANS)
+        if not top_spans:
+            return
+        timing_rows = [[span.name, span.category, f'{span.wall_secs:,.3f}', f'{span.cpu_secs:,.3f}',
+                        f'{span.peak_rss_mb:,.1f}', f'{span.children_peak_rss_mb:,.1f}'] for span in top_spans]
+        report_lines = [Utils.gen_report_sec_header('Timing Summary'),
+                        tabulate(timing_rows,
+                                 headers=['Step', 'Category', 'Wall (s)', 'CPU (s)', 'Peak RSS (MB)',
+                                          'Children Peak RSS (MB)'],
+                                 colalign=('left', 'left', 'right', 'right', 'right', 'right'),
+                                 disable_numparse=True)]
+        trace_file = self._get_trace_file()
+        if trace_file is not None:
+            report_lines.append(f'Trace file: {trace_file}')
+        print(Utils.gen_multiline_str(report_lines))
 
     def _report_tool_full_location(self) -> str:
         pass
@@ -381,13 +462,27 @@ class RapidsJarTool(RapidsTool):
 
     def _process_jar_arg(self):
         tools_jar_url = self.wrapper_options.get('toolsJar')
+        jar_cache = None
         if tools_jar_url is None:
             tools_jar_url = self.ctxt.get_rapids_jar_url()
-        # download the jar
-        jar_path = self.ctxt.platform.storage.download_resource(tools_jar_url,
-                                                                self.ctxt.get_local_work_dir(),
-                                                                fail_ok=False,
-                                                                create_dir=True)
+            # only the releases resolved from the maven repository are cached. A jar passed by the
+            # user can be republished at the same url, so it is always downloaded
+            jar_cache = self.ctxt.get_tools_jar_cache()
+        if jar_cache is not None and ToolsJarCache.is_cacheable_url(tools_jar_url):
+            # reuse the jar downloaded by previous runs
+            jar_path = jar_cache.fetch_jar(
+                tools_jar_url,
+                self.ctxt.get_local_work_dir(),
+                download_cb=lambda dest_dir: self.ctxt.platform.storage.download_resource(tools_jar_url,
+                                                                                          dest_dir,
+                                                                                          fail_ok=False,
+                                                                                          create_dir=True))
+        else:
+            # download the jar
+            jar_path = self.ctxt.platform.storage.download_resource(tools_jar_url,
+                                                                    self.ctxt.get_local_work_dir(),
+                                                                    fail_ok=False,
+                                                                    create_dir=True)
         self.logger.info('RAPIDS accelerator jar is downloaded to work_dir %s', jar_path)
         # get the jar file name
         jar_file_name = FSUtil.get_resource_name(jar_path)
@@ -475,7 +570,8 @@ class RapidsJarTool(RapidsTool):
         def decorator(func_cb: Callable):
             def wrapper(self, *args, **kwargs):
                 start_time = time.monotonic()
-                func_cb(self, *args, **kwargs)  # pylint: disable=not-callable
+                with ToolTracer.span(timed_item, 'step'):
+                    func_cb(self, *args, **kwargs)  # pylint: disable=not-callable
                 end_time = time.monotonic()
                 self.logger.info('Total Execution Time: %s => %s seconds', timed_item,
                                  f'{(end_time-start_time):,.3f}')
@@ -491,12 +587,26 @@ class RapidsJarTool(RapidsTool):
             if exception:
                 self.logger.error('Error while downloading dependency: %s', exception)
 
+        dependency_cache = self.ctxt.get_dependency_cache()
+
         def cache_single_dependency(dep: dict) -> str:
             """
             Downloads the specified URL and saves it to disk
             """
             start_time = time.monotonic()
             self.logger.info('Checking dependency %s', dep['name'])
+            if dependency_cache is not None:
+                # the verified dependencies are linked from the cache folder
+                dep_item = dependency_cache.fetch_dependency(dep, self.ctxt.get_local_work_dir())
+            else:
+                dep_item = download_single_dependency(dep)
+            end_time = time.monotonic()
+            self.logger.info('Completed downloading of dependency [%s] => %s seconds',
+                             dep['name'],
+                             f'{(end_time-start_time):,.3f}')
+            return dep_item
+
+        def download_single_dependency(dep: dict) -> str:
             dest_folder = self.ctxt.get_cache_folder()
             resource_file_name = FSUtil.get_resource_name(dep['uri'])
             resource_file = FSUtil.build_path(dest_folder, resource_file_name)
@@ -528,10 +638,6 @@ class RapidsJarTool(RapidsTool):
                 # copy the jar into dependency folder
                 dep_item = self.ctxt.platform.storage.download_resource(resource_file,
                                                                         self.ctxt.get_local_work_dir())
-            end_time = time.monotonic()
-            self.logger.info('Completed downloading of dependency [%s] => %s seconds',
-                             dep['name'],
-                             f'{(end_time-start_time):,.3f}')
             return dep_item
 
         def cache_all_dependencies(dep_arr: List[dict]):
@@ -540,7 +646,8 @@ class RapidsJarTool(RapidsTool):
             """
             futures_list = []
             results = []
-            with ThreadPoolExecutor(max_workers=4) as executor:
+            # the downloads are bound by the network. Fetch all the dependencies at once
+            with ThreadPoolExecutor(max_workers=max(1, len(dep_arr))) as executor:
                 for dep in dep_arr:
                     futures = executor.submit(cache_single_dependency, dep)
                     futures.add_done_callback(exception_handler)
@@ -623,7 +730,18 @@ class RapidsJarTool(RapidsTool):
                               'The cluster Spark properties may be missing "spark.eventLog.dir". '
                               'Re-run the command passing "--eventlogs" flag to the wrapper.')
             raise RuntimeError('Invalid arguments. The list of Apache Spark event logs is empty.')
-        self.ctxt.set_ctxt('eventLogs', spark_event_logs)
+        self.ctxt.set_ctxt('eventLogs', self._stage_eventlogs(spark_event_logs))
+
+    def _stage_eventlogs(self, eventlogs: List[str]) -> List[str]:
+        """
+        Copies the remote eventlogs into the local cache when it is enabled so that the tool reads
+        them from local disk. Repeated runs over the same eventlogs do not download them again.
+        """
+        eventlogs_cache = self.ctxt.get_eventlogs_cache()
+        if eventlogs_cache is None:
+            return eventlogs
+        staging_dir = FSUtil.build_path(self.ctxt.get_local_work_dir(), 'eventlogs')
+        return eventlogs_cache.stage(eventlogs, staging_dir)
 
     def _create_migration_cluster(self, cluster_type: str, cluster_arg: str) -> ClusterBase:
         if cluster_arg is None:
@@ -752,9 +870,37 @@ class RapidsJarTool(RapidsTool):
             ctxt_rapids_args = self.ctxt.get_ctxt('rapidsArgs')
             dependencies = ctxt_rapids_args.get('javaDependencies')
             processed_platform_args.update({'dependencies': dependencies})
+            self._size_local_jvm(platform_args, processed_platform_args)
             job_args['platformArgs'] = processed_platform_args
         self.ctxt.update_job_args(job_args)
 
+    def _size_local_jvm(self, platform_args: dict, processed_platform_args: dict):
+        """
+        Picks the heap size, the GC flags and the number of threads of the tool based on the
+        resources of the machine and the size of the eventlogs. Values set by the user are kept.
+        """
+        sizing_conf = self.ctxt.get_value_silent('sparkRapids', 'jvmSizing')
+        if not sizing_conf or not sizing_conf.get('enabled'):
+            return
+        user_heap_gb = platform_args.get('jvmMaxHeapSize')
+        rapids_opts = self.ctxt.get_ctxt('rapidsArgs').get('rapidsOpts')
+        if rapids_opts is None:
+            rapids_opts = []
+            self.ctxt.add_rapids_args('rapidsOpts', rapids_opts)
+        user_threads = '--num-threads' in rapids_opts
+        if user_heap_gb is not None and user_threads:
+            return
+        eventlogs_size, eventlogs_count = get_eventlogs_size(self.ctxt.get_ctxt('eventLogs') or [])
+        jvm_sizing = JvmSizing(sizing_conf,
+                               eventlogs_size=eventlogs_size,
+                               eventlogs_count=eventlogs_count,
+                               user_heap_gb=user_heap_gb)
+        jvm_sizing.log_settings()
+        if user_heap_gb is None:
+            processed_platform_args['jvmArgs'].update(jvm_sizing.get_jvm_args())
+        if not user_threads:
+            rapids_opts.extend(['--num-threads', str(jvm_sizing.num_threads)])
+
     def _init_rapids_arg_list(self) -> List[str]:
         return []
 
@@ -798,5 +944,5 @@ class RapidsJarTool(RapidsTool):
         remote_work_dir = self.ctxt.get_remote('workDir')
         if remote_work_dir and self._rapids_jar_tool_has_output():
             local_folder = self.ctxt.get_output_folder()
-            # TODO make sure it worth issuing the command
-            self.ctxt.platform.storage.upload_resource(local_folder, remote_work_dir)
+            # only the files that changed since the previous run in the same remote folder are copied
+            self.ctxt.platform.storage.sync_resource(local_folder, remote_work_dir)
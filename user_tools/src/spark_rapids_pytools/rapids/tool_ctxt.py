@@ -19,13 +19,16 @@ import tarfile
 from glob import glob
 from dataclasses import dataclass, field
 from logging import Logger
-from typing import Type, Any, ClassVar, List
+from typing import Type, Any, ClassVar, List, Optional
 
 from spark_rapids_tools import CspEnv
 from spark_rapids_pytools.cloud_api.sp_types import PlatformBase
 from spark_rapids_pytools.common.prop_manager import YAMLPropertiesContainer
 from spark_rapids_pytools.common.sys_storage import FSUtil
 from spark_rapids_pytools.common.utilities import ToolLogging, Utils
+from spark_rapids_pytools.rapids.dependency_cache import DependencyCache
+from spark_rapids_pytools.rapids.eventlogs_cache import EventlogsCache
+from spark_rapids_pytools.rapids.tools_jar_cache import ToolsJarCache
 
 
 @dataclass
@@ -177,10 +180,56 @@ class ToolContext(YAMLPropertiesContainer):
                 raise FileNotFoundError('In Fat Mode. No matching JAR files found.')
             return matching_files[0]
         mvn_base_url = self.get_value('sparkRapids', 'mvnUrl')
-        jar_version = Utils.get_latest_available_jar_version(mvn_base_url, Utils.get_base_release())
+        base_release = Utils.get_base_release()
+        jar_cache = self.get_tools_jar_cache()
+        if jar_cache is None:
+            jar_version = Utils.get_latest_available_jar_version(mvn_base_url, base_release)
+        else:
+            jar_version = jar_cache.get_resolved_version(
+                mvn_base_url, base_release,
+                resolve_cb=lambda: Utils.get_latest_available_jar_version(mvn_base_url, base_release))
         rapids_url = self.get_value('sparkRapids', 'repoUrl').format(mvn_base_url, jar_version, jar_version)
         return rapids_url
 
+    def get_tools_jar_cache(self) -> Optional[ToolsJarCache]:
+        """
+        Gets the persistent cache of the tools jar shared across runs.
+        :return: the jar cache or None if it is disabled in the configurations
+        """
+        if not self.get_value_silent('sparkRapids', 'jarCache', 'enabled'):
+            return None
+        expiration_secs = self.get_value_silent('sparkRapids', 'jarCache', 'versionExpirationSecs')
+        return ToolsJarCache(self.get_cache_folder(), version_expiration_secs=int(expiration_secs or 0))
+
+    def get_dependency_cache(self) -> Optional[DependencyCache]:
+        """
+        Gets the store of the verified dependencies shared across runs.
+        :return: the dependency cache or None if it is disabled in the configurations
+        """
+        if not self.get_value_silent('sparkRapids', 'dependencyCache', 'enabled'):
+            return None
+        return DependencyCache(self.get_cache_folder())
+
+    def get_eventlogs_cache(self) -> Optional[EventlogsCache]:
+        """
+        Gets the local cache of the remote eventlogs shared across runs. The configuration can be
+        overridden by the EVENTLOGS_CACHE env-var.
+        :return: the eventlogs cache or None if it is disabled
+        """
+        def_enabled = bool(self.get_value_silent('sparkRapids', 'eventlogsCache', 'enabled'))
+        cache_enabled = Utils.get_rapids_tools_env('EVENTLOGS_CACHE', str(def_enabled))
+        if str(cache_enabled).lower() not in ('true', '1'):
+            return None
+        max_size_gb = self.get_value_silent('sparkRapids', 'eventlogsCache', 'maxSizeGB') or 20
+        max_workers = self.get_value_silent('sparkRapids', 'eventlogsCache', 'maxWorkers') or 8
+        grace_hours = self.get_value_silent('sparkRapids', 'eventlogsCache', 'evictionGraceHours')
+        if grace_hours is None:
+            grace_hours = 6
+        return EventlogsCache(self.get_cache_folder(),
+                              max_size_bytes=int(float(max_size_gb) * (1 << 30)),
+                              max_workers=int(max_workers),
+                              eviction_grace_secs=float(grace_hours) * 3600)
+
     def get_tool_main_class(self) -> str:
         return self.get_value('sparkRapids', 'mainClass')
 
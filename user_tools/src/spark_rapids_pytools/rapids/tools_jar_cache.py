@@ -0,0 +1,159 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Implementation of the persistent cache of the tools jar"""
+
+import datetime
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Callable
+
+from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.common.utilities import ToolLogging
+
+
+@dataclass
+class ToolsJarCache:
+    """
+    A persistent cache of the tools jar shared by all the runs using the same cache folder.
+    It holds two records:
+    1. the version resolved from the maven repository. The record is valid for
+       version_expiration_secs to avoid querying the repository on every run.
+    2. a content-addressed store of the downloaded jars. Jars are saved by their sha256 digest and
+       an index maps each url to its digest. Runs link the stored jar into their work directory.
+    Only immutable urls (i.e., the releases resolved from the maven repository) should be cached
+    because the url is the lookup key. A jar republished at the same url would never be fetched
+    again.
+    """
+    cache_folder: str
+    version_expiration_secs: int = 86400
+    store_dir: str = field(default=None, init=False)
+    logger: Logger = field(default=None, init=False)
+
+    def __post_init__(self):
+        self.logger = ToolLogging.get_and_setup_logger('rapids.tools.jar.cache')
+        self.store_dir = FSUtil.build_path(self.cache_folder, 'tools-jars')
+        FSUtil.make_dirs(self.store_dir)
+
+    @classmethod
+    def is_cacheable_url(cls, jar_url: str) -> bool:
+        """
+        :param jar_url: the url of a release jar resolved from the maven repository
+        :return: True if the url points to an immutable release. Snapshots are republished at the
+                 same url, so they are not cacheable.
+        """
+        return jar_url.startswith(('http://', 'https://')) and 'SNAPSHOT' not in jar_url
+
+    def _get_record_file(self, record_name: str) -> str:
+        return FSUtil.build_path(self.store_dir, f'{record_name}.json')
+
+    def _load_record(self, record_name: str) -> dict:
+        record_file = self._get_record_file(record_name)
+        if not os.path.exists(record_file):
+            return {}
+        try:
+            with open(record_file, 'r', encoding='utf-8') as record_fd:
+                return json.load(record_fd)
+        except (OSError, ValueError) as ex:
+            self.logger.warning('Ignoring corrupted record %s: %s', record_file, ex)
+            return {}
+
+    def _update_record(self, record_name: str, key: str, value: dict) -> None:
+        # concurrent runs may update the same record. The last writer wins, which is fine because
+        # all the writers store valid entries
+        record = self._load_record(record_name)
+        record[key] = value
+        record_file = self._get_record_file(record_name)
+        tmp_file = f'{record_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as record_fd:
+            json.dump(record, record_fd)
+        os.replace(tmp_file, record_file)
+
+    def get_resolved_version(self, mvn_url: str, base_release: str, resolve_cb: Callable[[], str]) -> str:
+        """
+        Gets the jar version matching the base release. The repository is queried through
+        resolve_cb only when the saved version is missing or expired.
+        :param mvn_url: the url of the maven repository
+        :param base_release: the release of the python package
+        :param resolve_cb: callback that queries the repository and returns the version
+        :return: the string value of the jar version
+        """
+        record_key = f'{mvn_url}|{base_release}'
+        curr_time_stamp = datetime.datetime.now().timestamp()
+        version_entry = self._load_record('versions').get(record_key)
+        if version_entry is not None:
+            entry_age = curr_time_stamp - version_entry.get('resolvedAt', 0)
+            if 0 <= entry_age <= self.version_expiration_secs:
+                self.logger.info('Using the cached tools jar version %s', version_entry['version'])
+                return version_entry['version']
+        jar_version = resolve_cb()
+        self._update_record('versions', record_key, {'version': jar_version, 'resolvedAt': curr_time_stamp})
+        return jar_version
+
+    def _get_blob_path(self, digest: str) -> str:
+        return FSUtil.build_path(self.store_dir, f'{digest}.jar')
+
+    @classmethod
+    def _calc_digest(cls, file_path: str) -> str:
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def _lookup_blob(self, jar_url: str):
+        jar_entry = self._load_record('jars').get(jar_url)
+        if jar_entry is None:
+            return None
+        blob_path = self._get_blob_path(jar_entry['sha256'])
+        if not os.path.exists(blob_path) or os.path.getsize(blob_path) != jar_entry['size']:
+            return None
+        return blob_path
+
+    def _store_blob(self, jar_url: str, download_cb: Callable[[str], str]) -> str:
+        staging_dir = FSUtil.build_path(self.store_dir, f'staging_{os.getpid()}')
+        FSUtil.make_dirs(staging_dir)
+        try:
+            downloaded_file = download_cb(staging_dir)
+            digest = self._calc_digest(downloaded_file)
+            blob_path = self._get_blob_path(digest)
+            os.replace(downloaded_file, blob_path)
+        finally:
+            FSUtil.remove_path(staging_dir, fail_ok=True)
+        self._update_record('jars', jar_url, {'sha256': digest, 'size': os.path.getsize(blob_path)})
+        return blob_path
+
+    def fetch_jar(self, jar_url: str, dest_dir: str, download_cb: Callable[[str], str]) -> str:
+        """
+        Links the jar into the destination directory. The jar is downloaded only if it is not
+        already in the store.
+        :param jar_url: the url of the jar
+        :param dest_dir: the directory where the jar is linked
+        :param download_cb: callback that downloads the jar into the given directory and returns
+               the path of the downloaded file
+        :return: the path of the jar inside the destination directory
+        """
+        blob_path = self._lookup_blob(jar_url)
+        if blob_path is None:
+            self.logger.info('Downloading tools jar %s into the cache', jar_url)
+            blob_path = self._store_blob(jar_url, download_cb)
+        else:
+            self.logger.info('Using the cached tools jar %s', blob_path)
+        FSUtil.make_dirs(dest_dir)
+        jar_path = FSUtil.build_path(dest_dir, FSUtil.get_resource_name(jar_url))
+        FSUtil.link_resource(blob_path, jar_path)
+        return jar_path
@@ -14,6 +14,7 @@
 
 """init file of the Accelerated Spark python implementations"""
 
+import importlib
 
 from .enums import (
     EnumeratedType, CspEnv
@@ -23,9 +24,19 @@ from .utils import (
     get_elem_from_dict, get_elem_non_safe
 )
 
-from .storagelib.csppath import (
-    CspPath, path_impl_registry, CspPathT
-)
+# the storagelib loads pyArrow and the clients of the cloud storages. It is imported on first access
+_lazy_members = {
+    'CspPath': '.storagelib.csppath',
+    'path_impl_registry': '.storagelib.csppath',
+    'CspPathT': '.storagelib.csppath'
+}
+
+
+def __getattr__(name):
+    if name in _lazy_members:
+        return getattr(importlib.import_module(_lazy_members[name], __name__), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 __all__ = [
     'EnumeratedType',
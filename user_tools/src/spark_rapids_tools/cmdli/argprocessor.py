@@ -29,8 +29,7 @@ from spark_rapids_tools.cloud import ClientCluster
 from spark_rapids_tools.utils import AbstractPropContainer, is_http_file
 from spark_rapids_pytools.cloud_api.sp_types import DeployMode
 from spark_rapids_pytools.common.utilities import ToolLogging
-from spark_rapids_pytools.rapids.qualification import QualGpuClusterReshapeType
-from ..enums import QualFilterApp, CspEnv
+from ..enums import QualFilterApp, CspEnv, QualGpuClusterReshapeType, ToolOutputFormat
 from ..storagelib.csppath import CspPath
 from ..tools.autotuner import AutoTunerPropMgr
 from ..utils.util import dump_tool_usage
@@ -244,6 +243,12 @@ class ToolUserArgModel(AbsToolUserArgModel):
     This is used as doing preliminary validation against some of the common pattern
     """
     eventlogs: Optional[str] = None
+    output_format: Optional[ToolOutputFormat] = None
+
+    def get_output_format(self) -> ToolOutputFormat:
+        if self.output_format is None:
+            return ToolOutputFormat.get_default()
+        return self.output_format
 
     def init_extra_arg_cases(self) -> list:
         if self.eventlogs is None:
@@ -406,7 +411,8 @@ class QualifyUserArgModel(ToolUserArgModel):
             'jobSubmissionProps': {
                 'remoteFolder': None,
                 'platformArgs': {
-                    'jvmMaxHeapSize': 24
+                    # the JVM heap is sized automatically based on the machine and the eventlogs
+                    'jvmMaxHeapSize': None
                 }
             },
             'savingsCalculations': self.p_args['toolArgs']['savingsCalculations'],
@@ -420,7 +426,8 @@ class QualifyUserArgModel(ToolUserArgModel):
             'estimatedGpuClusterPrice': self.p_args['toolArgs']['estimatedGpuClusterPrice'],
             'cpuDiscount': self.p_args['toolArgs']['cpuDiscount'],
             'gpuDiscount': self.p_args['toolArgs']['gpuDiscount'],
-            'globalDiscount': self.p_args['toolArgs']['globalDiscount']
+            'globalDiscount': self.p_args['toolArgs']['globalDiscount'],
+            'outputFormat': self.get_output_format()
         }
         return wrapped_args
 
@@ -494,12 +501,14 @@ class ProfileUserArgModel(ToolUserArgModel):
             'jobSubmissionProps': {
                 'remoteFolder': None,
                 'platformArgs': {
-                    'jvmMaxHeapSize': 24
+                    # the JVM heap is sized automatically based on the machine and the eventlogs
+                    'jvmMaxHeapSize': None
                 }
             },
             'eventlogs': self.eventlogs,
             'toolsJar': None,
-            'autoTunerFileInput': self.p_args['toolArgs']['autotuner']
+            'autoTunerFileInput': self.p_args['toolArgs']['autotuner'],
+            'outputFormat': self.get_output_format()
         }
 
         return wrapped_args
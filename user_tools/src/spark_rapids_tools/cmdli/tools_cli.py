@@ -20,10 +20,10 @@ import fire
 from spark_rapids_tools.enums import QualGpuClusterReshapeType
 from spark_rapids_tools.utils.util import gen_app_banner, init_environment
 from spark_rapids_pytools.common.utilities import ToolLogging
-from spark_rapids_pytools.rapids.bootstrap import Bootstrap
-from spark_rapids_pytools.rapids.profiling import ProfilingAsLocal
-from spark_rapids_pytools.rapids.qualification import QualificationAsLocal
-from .argprocessor import AbsToolUserArgModel
+
+# The argument processors (pydantic) and the modules implementing the tools (pandas, pyArrow, the
+# cloud providers, etc.) are slow to import. They are loaded by each cmd when it runs, so "--help"
+# does not load them and the argument errors are reported before the tools are loaded.
 
 
 class ToolsCLI(object):  # pylint: disable=too-few-public-methods
@@ -48,7 +48,9 @@ class ToolsCLI(object):  # pylint: disable=too-few-public-methods
                       global_discount: int = None,
                       gpu_cluster_recommendation: str = QualGpuClusterReshapeType.tostring(
                           QualGpuClusterReshapeType.get_default()),
+                      output_format: str = None,
                       verbose: bool = False,
+                      batch: str = None,
                       **rapids_options):
         """The Qualification cmd provides estimated running costs and speedups by migrating Apache
         Spark applications to GPU accelerated clusters.
@@ -98,7 +100,19 @@ class ToolsCLI(object):  # pylint: disable=too-few-public-methods
                 "MATCH": keep GPU cluster same number of nodes as CPU cluster;
                 "CLUSTER": recommend optimal GPU cluster by cost for entire cluster;
                 "JOB": recommend optimal GPU cluster by cost per job
+        :param output_format: format of the summary report written into the output folder.
+                It accepts one of the following:
+                "CSV": the CSV file (default);
+                "PARQUET": a Parquet file having typed columns and a stable schema;
+                "BOTH": both the CSV and the Parquet files
         :param verbose: True or False to enable verbosity of the script.
+        :param batch: path to a manifest file (yaml or json) listing groups of eventlogs to be
+                qualified in one invocation. Each group accepts the arguments of this cmd in
+                camelCase (i.e., eventlogs, cluster, platform, outputFolder, rapidsOptions) and
+                requires a unique "name". The manifest may define "defaults" applied to all the
+                groups, and "maxParallel" to set the number of groups running concurrently.
+                The groups are written to separate folders under output_folder unless they define
+                their own outputFolder. The remaining arguments of the cmd are ignored.
         :param rapids_options: A list of valid Qualification tool options.
                 Note that the wrapper ignores ["output-directory", "platform"] flags, and it does not support
                 multiple "spark-property" arguments.
@@ -107,7 +121,14 @@ class ToolsCLI(object):  # pylint: disable=too-few-public-methods
         """
         if verbose:
             ToolLogging.enable_debug_mode()
+        if batch is not None:
+            from spark_rapids_tools.tools.qualification_batch import \
+                QualificationBatch  # pylint: disable=import-outside-toplevel
+            init_environment('qual_batch')
+            QualificationBatch(manifest_file=batch, output_folder=output_folder, verbose=verbose).run()
+            return
         init_environment('qual')
+        from .argprocessor import AbsToolUserArgModel  # pylint: disable=import-outside-toplevel
         qual_args = AbsToolUserArgModel.create_tool_args('qualification',
                                                          eventlogs=eventlogs,
                                                          cluster=cluster,
@@ -120,8 +141,11 @@ class ToolsCLI(object):  # pylint: disable=too-few-public-methods
                                                          cpu_discount=cpu_discount,
                                                          gpu_discount=gpu_discount,
                                                          global_discount=global_discount,
-                                                         gpu_cluster_recommendation=gpu_cluster_recommendation)
+                                                         gpu_cluster_recommendation=gpu_cluster_recommendation,
+                                                         output_format=output_format)
         if qual_args:
+            from spark_rapids_pytools.rapids.qualification import \
+                QualificationAsLocal  # pylint: disable=import-outside-toplevel
             tool_obj = QualificationAsLocal(platform_type=qual_args['runtimePlatform'],
                                             output_folder=qual_args['outputFolder'],
                                             wrapper_options=qual_args,
@@ -133,6 +157,7 @@ class ToolsCLI(object):  # pylint: disable=too-few-public-methods
                   cluster: str = None,
                   platform: str = None,
                   output_folder: str = None,
+                  output_format: str = None,
                   verbose: bool = False,
                   **rapids_options):
         """The Profiling cmd provides information which can be used for debugging and profiling
@@ -152,6 +177,11 @@ class ToolsCLI(object):  # pylint: disable=too-few-public-methods
         :param platform: defines one of the following "onprem", "emr", "dataproc", "databricks-aws",
                 and "databricks-azure".
         :param output_folder: path to store the output.
+        :param output_format: format of the recommendations summary written into the output folder.
+                It accepts one of the following:
+                "CSV": the text log of the recommendations (default);
+                "PARQUET": a Parquet file listing the recommendations and the comments of each app;
+                "BOTH": both the text log and the Parquet file
         :param verbose: True or False to enable verbosity of the script.
         :param rapids_options: A list of valid Profiling tool options.
                 Note that the wrapper ignores ["output-directory", "worker-info"] flags, and it does not support
@@ -162,12 +192,15 @@ class ToolsCLI(object):  # pylint: disable=too-few-public-methods
         if verbose:
             ToolLogging.enable_debug_mode()
         init_environment('prof')
+        from .argprocessor import AbsToolUserArgModel  # pylint: disable=import-outside-toplevel
         prof_args = AbsToolUserArgModel.create_tool_args('profiling',
                                                          eventlogs=eventlogs,
                                                          cluster=cluster,
                                                          platform=platform,
-                                                         output_folder=output_folder)
+                                                         output_folder=output_folder,
+                                                         output_format=output_format)
         if prof_args:
+            from spark_rapids_pytools.rapids.profiling import ProfilingAsLocal  # pylint: disable=import-outside-toplevel
             tool_obj = ProfilingAsLocal(platform_type=prof_args['runtimePlatform'],
                                         output_folder=prof_args['outputFolder'],
                                         wrapper_options=prof_args,
@@ -198,12 +231,14 @@ class ToolsCLI(object):  # pylint: disable=too-few-public-methods
         if verbose:
             ToolLogging.enable_debug_mode()
         init_environment('boot')
+        from .argprocessor import AbsToolUserArgModel  # pylint: disable=import-outside-toplevel
         boot_args = AbsToolUserArgModel.create_tool_args('bootstrap',
                                                          cluster=cluster,
                                                          platform=platform,
                                                          output_folder=output_folder,
                                                          dry_run=dry_run)
         if boot_args:
+            from spark_rapids_pytools.rapids.bootstrap import Bootstrap  # pylint: disable=import-outside-toplevel
             tool_obj = Bootstrap(platform_type=boot_args['runtimePlatform'],
                                  cluster=cluster,
                                  output_folder=boot_args['outputFolder'],
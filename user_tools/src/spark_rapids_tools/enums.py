@@ -129,3 +129,20 @@ class QualGpuClusterReshapeType(EnumeratedType):
     @classmethod
     def get_default(cls):
         return cls.MATCH
+
+
+class ToolOutputFormat(EnumeratedType):
+    """Values used to select the format of the summary files written by the tools"""
+    CSV = 'csv'
+    PARQUET = 'parquet'
+    BOTH = 'both'
+
+    @classmethod
+    def get_default(cls):
+        return cls.CSV
+
+    def writes_csv(self) -> bool:
+        return self in [ToolOutputFormat.CSV, ToolOutputFormat.BOTH]
+
+    def writes_parquet(self) -> bool:
+        return self in [ToolOutputFormat.PARQUET, ToolOutputFormat.BOTH]
@@ -54,6 +54,15 @@ class CspPathAttributeError(CspPathException, ValueError):
     pass
 
 
+class CspTransferError(CspPathException, OSError):
+    """
+    Raised when some files could not be copied after all the retries
+    """
+    def __init__(self, msg: str, failed_files: Optional[dict] = None):
+        self.failed_files = failed_files or {}
+        super().__init__(msg)
+
+
 class InvalidPropertiesSchema(CspPathException, ValueError):
     """
     Defines a class to represent errors caused by invalid properties schema
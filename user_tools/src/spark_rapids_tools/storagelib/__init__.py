@@ -26,6 +26,8 @@ from .local.localfs import LocalFs
 from .local.localpath import LocalPath
 from .csppath import CspPathT, path_impl_registry, CspPath
 from .cspfs import CspFs, BoundedArrowFsT, register_fs_class
+from .fscache import FileInfoCache, default_fs_cache
+from .transfer import TransferEngine, TransferOptions, TransferStats
 
 __all__ = [
     'AdlsFs',
@@ -33,6 +35,8 @@ __all__ = [
     'CspFs',
     'CspPath',
     'BoundedArrowFsT',
+    'default_fs_cache',
+    'FileInfoCache',
     'GcsFs',
     'GcsPath',
     'HdfsFs',
@@ -45,4 +49,7 @@ __all__ = [
     'register_fs_class',
     'S3Fs',
     'S3Path',
+    'TransferEngine',
+    'TransferOptions',
+    'TransferStats',
 ]
@@ -16,7 +16,6 @@
 
 from typing import Any
 
-import adlfs
 from pyarrow.fs import PyFileSystem, FSSpecHandler
 
 from ..cspfs import CspFs, BoundedArrowFsT, register_fs_class
@@ -40,7 +39,11 @@ class AdlsFs(CspFs):
     AZURE_STORAGE_TENANT_ID
     """
 
+    cache_file_info = True
+
     @classmethod
     def create_fs_handler(cls, *args: Any, **kwargs: Any) -> BoundedArrowFsT:
+        # adlfs pulls the azure SDK which is slow to import. Load it only when ADLS is accessed
+        import adlfs  # pylint: disable=import-outside-toplevel
         azure_fs = adlfs.AzureBlobFileSystem(*args, **kwargs)
         return PyFileSystem(FSSpecHandler(azure_fs))
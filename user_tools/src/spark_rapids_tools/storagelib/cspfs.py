@@ -15,16 +15,12 @@
 """Abstract class for FS that wraps on top of the remote clients"""
 
 import abc
-import os
-from typing import Generic, Callable, TypeVar, Any, Union
+from typing import Generic, Callable, TypeVar, Any, Union, Dict, FrozenSet, Optional
 
 from pyarrow import fs as arrow_fs
 
 from .csppath import CspPathImplementation, CspPath, path_impl_registry
-
-from ..exceptions import (
-    CspPathNotFoundException
-)
+from .transfer import TransferEngine, TransferOptions, TransferStats
 
 BoundedCspPath = TypeVar('BoundedCspPath', bound=CspPath)
 BoundedArrowFsT = TypeVar('BoundedArrowFsT', bound=arrow_fs.FileSystem)
@@ -67,6 +63,11 @@ class CspFs(abc.ABC, Generic[BoundedCspPath]):
     """
     _path_meta: CspPathImplementation
     _default_fs = None
+    # the public members of each pyArrow filesystem class. They are resolved once per class
+    _delegated_attrs: Dict[type, FrozenSet[str]] = {}
+    # whether the metadata of the paths is kept in the shared FileInfoCache. Only the remote
+    # filesystems opt in because their metadata calls are round trips to the storage service
+    cache_file_info: bool = False
 
     @classmethod
     def create_fs_handler(cls, *args: Any, **kwargs: Any) -> BoundedArrowFsT:
@@ -79,19 +80,32 @@ class CspFs(abc.ABC, Generic[BoundedCspPath]):
         return cls._default_fs
 
     @property
-    def _xtra(self):
+    def _xtra(self) -> FrozenSet[str]:
         """returns the members defined in the child class as long as they are not protected"""
-        return [o for o in dir(self.fs) if not o.startswith('_')]
+        fs_clzz = type(self.fs)
+        delegated_attrs = CspFs._delegated_attrs.get(fs_clzz)
+        if delegated_attrs is None:
+            delegated_attrs = frozenset(o for o in dir(fs_clzz) if not o.startswith('_'))
+            CspFs._delegated_attrs[fs_clzz] = delegated_attrs
+        return delegated_attrs
 
     def __getattr__(self, k):
         """returns the members defined in the child class as long as they are not protected"""
+        if k == 'fs':
+            # the handler is not created yet
+            raise AttributeError(k)
         if k in self._xtra:
-            return getattr(self.fs, k)
+            attr = getattr(self.fs, k)
+            if callable(attr):
+                # bind the method to the instance so that the next accesses do not go through
+                # __getattr__. Properties are not bound because their values may change
+                self.__dict__[k] = attr
+            return attr
         raise AttributeError(k)
 
     def __dir__(self):
         """extends the list of attributes to include the child class"""
-        return custom_dir(self, self._xtra)
+        return custom_dir(self, list(self._xtra))
 
     def __init__(self, *args: Any, **kwargs: Any):
         self.fs = self.create_fs_handler(*args, **kwargs)
@@ -100,13 +114,16 @@ class CspFs(abc.ABC, Generic[BoundedCspPath]):
         return self._path_meta.path_class(entry_path=entry_path, fs_obj=self)
 
     @classmethod
-    def copy_resources(cls, src: BoundedCspPath, dest: BoundedCspPath):
+    def copy_resources(cls, src: BoundedCspPath, dest: BoundedCspPath,
+                       options: Optional[TransferOptions] = None) -> TransferStats:
         """
         Copy files between FileSystems.
 
         This functions allows you to recursively copy directories of files from
-        one file system to another, such as from S3 to your local machine. Note that the
-        copy_resources uses threads by default. The chunk size is set to 1 MB.
+        one file system to another, such as from S3 to your local machine. The files are copied by
+        the TransferEngine using a pool of threads. Small files are batched and failed files are
+        retried. The files that are unchanged in the destination are skipped only when the resume
+        option is enabled.
 
         :param src: BoundedCspPath
             Source file path or URI to a single file or directory
@@ -117,21 +134,28 @@ class CspFs(abc.ABC, Generic[BoundedCspPath]):
             If the source is a file, then the final destination will be dest/file_name
             If the source is a directory, then a new folder is created under dest as
             "dest/src".
+        :param options: TransferOptions
+            Settings of the transfer such as the number of workers and the chunk size.
+        :return: the statistics of the transfer
+        """
+        return TransferEngine(options).copy(src, dest)
+
+    @classmethod
+    def sync_resources(cls, src: BoundedCspPath, dest: BoundedCspPath,
+                       options: Optional[TransferOptions] = None) -> TransferStats:
+        """
+        Copy only the new or changed files between FileSystems.
+
+        The destination layout is the same as copy_resources. A manifest of the relative path,
+        size and checksum of each file is stored in the destination folder. The following syncs
+        compare the source against that manifest and skip the files that did not change.
+
+        :param src: BoundedCspPath
+            Source file path or URI to a single file or directory
+        :param dest: BoundedCspPath
+            Destination directory where the source is synced to.
+        :param options: TransferOptions
+            Settings of the transfer such as the number of workers and the manifest name.
+        :return: the statistics of the transfer
         """
-        # check that the src path exists
-        if not src.exists():
-            raise CspPathNotFoundException(f'Source Path does not exist {src}')
-        dest_path = os.path.join(str(dest), src.base_name())
-        if src.is_dir():
-            # create a subfolder in the destination
-            dest_path = os.path.join(str(dest), src.base_name())
-            dest = dest.fs_obj.create_as_path(entry_path=dest_path)
-            # dest must be a directory. make sure it exists
-            dest.create_dirs()
-        else:
-            dest.create_dirs()
-            dest = dest.fs_obj.create_as_path(entry_path=dest_path)
-
-        arrow_fs.copy_files(src.no_prefix, dest.no_prefix,
-                            source_filesystem=src.fs_obj.fs,
-                            destination_filesystem=dest.fs_obj.fs)
+        return TransferEngine(options).sync(src, dest)
@@ -41,6 +41,7 @@ from ..exceptions import (
 )
 
 from ..utils.util import get_path_as_uri, is_http_file
+from .fscache import default_fs_cache
 
 if sys.version_info >= (3, 10):
     from typing import TypeGuard
@@ -283,7 +284,14 @@ class CspPath(metaclass=CspPathMeta):
         return self._fpath[len(self.protocol_prefix):]
 
     def _pull_file_info(self) -> FileInfo:
-        return self.fs_obj.get_file_info(self.no_prefix)
+        # paths of the same entry share the information through the metadata cache
+        return default_fs_cache.get_file_info(self.fs_obj, self.no_prefix)
+
+    def invalidate_file_info(self, recursive: bool = False):
+        default_fs_cache.invalidate(self.fs_obj, self.no_prefix, recursive=recursive)
+        # force the file information object to be retrieved again by invalidating the cached property
+        if 'file_info' in self.__dict__:
+            del self.__dict__['file_info']
 
     @cached_property
     def file_info(self) -> FileInfo:
@@ -309,16 +317,34 @@ class CspPath(metaclass=CspPathMeta):
             if self.exists():
                 raise CspFileExistsError(f'Path already Exists: {self}')
         self.fs_obj.create_dir(self.no_prefix)
-        # force the file information object to be retrieved again by invalidating the cached property
-        if 'file_info' in self.__dict__:
-            del self.__dict__['file_info']
+        self.invalidate_file_info()
 
     def open_input_stream(self):
         return self.fs_obj.open_input_stream(self.no_prefix)
 
     def open_output_stream(self):
+        self.invalidate_file_info()
         return self.fs_obj.open_output_stream(self.no_prefix)
 
+    def list_file_infos(self, recursive: bool = False) -> List[FileInfo]:
+        """
+        Lists the entries of the directory in a single call. The information of the entries is
+        cached so that creating paths for the listed entries does not query the storage again.
+        """
+        return default_fs_cache.list_dir(self.fs_obj, self.no_prefix, recursive=recursive)
+
+    @classmethod
+    def prefetch_file_infos(cls, paths: List['CspPath']) -> None:
+        """
+        Pulls the file information of many paths by listing their common parent directories
+        instead of querying each path. This is useful to validate a large list of eventlogs.
+        """
+        paths_by_fs = defaultdict(list)
+        for csp_path in paths:
+            paths_by_fs[csp_path.fs_obj].append(csp_path.no_prefix)
+        for fs_obj, fs_paths in paths_by_fs.items():
+            default_fs_cache.prefetch(fs_obj, fs_paths)
+
     @classmethod
     def download_files(cls, src_url: str, dest_url: str):
         fs.copy_files(src_url, dest_url)
@@ -0,0 +1,232 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Metadata cache shared by the paths of the storagelib to avoid repeating the same remote calls"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pyarrow.fs import FileInfo, FileSelector, FileType
+
+
+def _parent_of(path: str) -> str:
+    return path.rsplit('/', 1)[0] if '/' in path else ''
+
+
+def _ancestors_of(path: str) -> List[str]:
+    res = []
+    parent = _parent_of(path)
+    while parent:
+        res.append(parent)
+        parent = _parent_of(parent)
+    return res
+
+
+class FileInfoCache:
+    """
+    A bounded cache of the file information and the directory listings keyed by (fs, path).
+    Only the filesystems opting in through their cache_file_info attribute are cached. The local
+    filesystem is not cached because its files are also written by the JVM, pandas and shutil
+    without going through the storagelib.
+    Entries expire after ttl_secs and the least recently used entries are evicted when the cache
+    exceeds max_entries. Writes done through the storagelib (create_dirs, open_output_stream,
+    copy_resources) invalidate the entries of the written path and its ancestors.
+    A ttl_secs of 0 disables the cache.
+    """
+
+    def __init__(self, ttl_secs: float = 60.0, max_entries: int = 65536):
+        self.ttl_secs = ttl_secs
+        self.max_entries = max_entries
+        self._infos: 'OrderedDict[Tuple[Any, str], Tuple[float, FileInfo]]' = OrderedDict()
+        self._listings: 'OrderedDict[Tuple[Any, str, bool], Tuple[float, List[FileInfo]]]' = OrderedDict()
+        # the cached paths indexed by (fs, ancestor) so that a write drops the entries under a
+        # directory without scanning the whole cache
+        self._descendants: Dict[Tuple[Any, str], Set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def configure(self, ttl_secs: Optional[float] = None, max_entries: Optional[int] = None) -> None:
+        with self._lock:
+            if ttl_secs is not None:
+                self.ttl_secs = ttl_secs
+            if max_entries is not None:
+                self.max_entries = max_entries
+            self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._infos.clear()
+            self._listings.clear()
+            self._descendants.clear()
+            self.stats = {'hits': 0, 'misses': 0}
+
+    @classmethod
+    def _norm_path(cls, path: str) -> str:
+        return path.rstrip('/') or path
+
+    def _is_enabled(self, fs_obj: Any) -> bool:
+        return self.ttl_secs > 0 and self.max_entries > 0 and getattr(fs_obj, 'cache_file_info', False)
+
+    def _is_cached(self, fs_obj: Any, path: str) -> bool:
+        return ((fs_obj, path) in self._infos or (fs_obj, path, False) in self._listings
+                or (fs_obj, path, True) in self._listings)
+
+    def _index(self, fs_obj: Any, path: str) -> None:
+        for ancestor in _ancestors_of(path):
+            self._descendants[(fs_obj, ancestor)].add(path)
+
+    def _unindex(self, fs_obj: Any, path: str) -> None:
+        if self._is_cached(fs_obj, path):
+            return
+        for ancestor in _ancestors_of(path):
+            index_key = (fs_obj, ancestor)
+            paths = self._descendants.get(index_key)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._descendants[index_key]
+
+    def _drop(self, table: OrderedDict, key: Tuple) -> None:
+        if table.pop(key, None) is not None:
+            self._unindex(key[0], key[1])
+
+    def _lookup(self, table: OrderedDict, key: Tuple) -> Optional[Any]:
+        entry = table.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._drop(table, key)
+            return None
+        table.move_to_end(key)
+        return entry[1]
+
+    def _store(self, table: OrderedDict, key: Tuple, value: Any) -> None:
+        table[key] = (time.monotonic() + self.ttl_secs, value)
+        table.move_to_end(key)
+        self._index(key[0], key[1])
+        while len(table) > self.max_entries:
+            evicted_key, _ = table.popitem(last=False)
+            self._unindex(evicted_key[0], evicted_key[1])
+
+    def put_file_info(self, fs_obj: Any, f_info: FileInfo) -> None:
+        if not self._is_enabled(fs_obj):
+            return
+        with self._lock:
+            self._store(self._infos, (fs_obj, self._norm_path(f_info.path)), f_info)
+
+    def get_file_info(self, fs_obj: Any, path: str) -> FileInfo:
+        """
+        Gets the file information from the cache or from the filesystem if it is missing.
+        :param fs_obj: the filesystem object of the path
+        :param path: the path without the protocol prefix
+        :return: the FileInfo of the path
+        """
+        path = self._norm_path(path)
+        if self._is_enabled(fs_obj):
+            with self._lock:
+                f_info = self._lookup(self._infos, (fs_obj, path))
+                if f_info is not None:
+                    self.stats['hits'] += 1
+                    return f_info
+                self.stats['misses'] += 1
+        f_info = fs_obj.get_file_info(path)
+        self.put_file_info(fs_obj, f_info)
+        return f_info
+
+    def list_dir(self, fs_obj: Any, path: str, recursive: bool = False) -> List[FileInfo]:
+        """
+        Lists the entries of a directory using a single call to the filesystem. The information of
+        each entry is added to the cache so that later lookups of the entries are served locally.
+        :param fs_obj: the filesystem object of the directory
+        :param path: the directory path without the protocol prefix
+        :param recursive: whether to list the subdirectories recursively
+        :return: list of the FileInfo of the entries
+        """
+        path = self._norm_path(path)
+        listing_key = (fs_obj, path, recursive)
+        if self._is_enabled(fs_obj):
+            with self._lock:
+                f_infos = self._lookup(self._listings, listing_key)
+                if f_infos is not None:
+                    self.stats['hits'] += 1
+                    return f_infos
+                self.stats['misses'] += 1
+        f_infos = fs_obj.get_file_info(FileSelector(path, recursive=recursive))
+        if self._is_enabled(fs_obj):
+            with self._lock:
+                self._store(self._listings, listing_key, f_infos)
+                self._store(self._infos, (fs_obj, path), FileInfo(path, type=FileType.Directory))
+                for f_info in f_infos:
+                    self._store(self._infos, (fs_obj, self._norm_path(f_info.path)), f_info)
+        return f_infos
+
+    def prefetch(self, fs_obj: Any, paths: Iterable[str], min_siblings: int = 2) -> None:
+        """
+        Loads the information of many paths by listing their parent directories once instead of
+        querying each path separately. Paths missing from the listing of their parent are cached
+        as not found.
+        :param fs_obj: the filesystem object of the paths
+        :param paths: the paths without the protocol prefix
+        :param min_siblings: the minimum number of paths sharing the same parent to list the parent
+        """
+        if not self._is_enabled(fs_obj):
+            return
+        paths_by_parent: Dict[str, List[str]] = defaultdict(list)
+        for path in paths:
+            path = self._norm_path(path)
+            with self._lock:
+                if self._lookup(self._infos, (fs_obj, path)) is not None:
+                    continue
+            paths_by_parent[_parent_of(path)].append(path)
+        for parent, children in paths_by_parent.items():
+            if not parent or len(children) < min_siblings:
+                continue
+            try:
+                f_infos = self.list_dir(fs_obj, parent)
+            except (OSError, ValueError):
+                # the parent may not be accessible. The paths are pulled one by one later
+                continue
+            listed_paths = {self._norm_path(f_info.path) for f_info in f_infos}
+            for child in children:
+                if child not in listed_paths:
+                    self.put_file_info(fs_obj, FileInfo(child, type=FileType.NotFound))
+
+    def invalidate(self, fs_obj: Any, path: str, recursive: bool = False) -> None:
+        """
+        Drops the cached entries affected by a write to the path. This includes the path, its
+        ancestors and the listings containing it. If recursive is True, the entries under the path
+        are dropped as well.
+        """
+        if not self._is_enabled(fs_obj):
+            return
+        path = self._norm_path(path)
+        affected_paths = _ancestors_of(path)
+        affected_paths.append(path)
+        with self._lock:
+            descendants = list(self._descendants.get((fs_obj, path), ()))
+            for affected_path in affected_paths:
+                self._drop(self._infos, (fs_obj, affected_path))
+                self._drop(self._listings, (fs_obj, affected_path, False))
+                self._drop(self._listings, (fs_obj, affected_path, True))
+            for descendant in descendants:
+                self._drop(self._listings, (fs_obj, descendant, False))
+                self._drop(self._listings, (fs_obj, descendant, True))
+                if recursive:
+                    self._drop(self._infos, (fs_obj, descendant))
+
+
+# the cache shared by all the paths of the storagelib
+default_fs_cache = FileInfoCache()
@@ -34,3 +34,5 @@ class GcsFs(CspFs):
     the environment variable GOOGLE_APPLICATION_CREDENTIALS to point to a JSON file containing
     credentials.
     """
+
+    cache_file_info = True
@@ -37,3 +37,5 @@ class S3Fs(CspFs):
     provided, then attempts to initialize from AWS environment variables,
     otherwise both access_key and secret_key must be provided.
     """
+
+    cache_file_info = True
@@ -0,0 +1,304 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parallel engine copying files between the filesystems of the storagelib"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from pyarrow.fs import FileInfo, FileSelector, FileType
+
+from ..exceptions import CspPathNotFoundException, CspTransferError
+
+if TYPE_CHECKING:
+    from .csppath import CspPath
+
+
+@dataclass
+class TransferOptions:
+    """
+    Settings of the transfer engine.
+    Files smaller than small_file_threshold are grouped in batches of small_files_batch_size to
+    reduce the overhead of scheduling a task per file. Larger files are copied by their own task
+    using chunks of chunk_size bytes.
+    When resume is enabled, the files that already exist in the destination with the same size and
+    a modification time that is not older than the source are skipped. It is disabled by default so
+    that a copy always overwrites the destination. The sync mode enables it for the files missing
+    from its manifest.
+    """
+    max_workers: int = 8
+    chunk_size: int = 1 << 20
+    small_file_threshold: int = 256 << 10
+    small_files_batch_size: int = 64
+    max_retries: int = 3
+    retry_delay_secs: float = 0.5
+    resume: bool = False
+    # files matching the pattern (i.e., "*.tmp") are not copied
+    exclude_pattern: Optional[str] = None
+    # name of the manifest written in the destination folder by the sync mode
+    manifest_name: str = '.rapids_tools_sync.json'
+
+
+@dataclass
+class TransferStats:
+    """Statistics of a transfer"""
+    files_total: int = 0
+    files_copied: int = 0
+    files_skipped: int = 0
+    bytes_copied: int = 0
+    retries: int = 0
+    elapsed_secs: float = 0.0
+    failed_files: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def throughput_mbps(self) -> float:
+        if self.elapsed_secs <= 0:
+            return 0.0
+        return self.bytes_copied / (1 << 20) / self.elapsed_secs
+
+    def __str__(self) -> str:
+        return (f'{self.files_copied} files copied, {self.files_skipped} skipped, '
+                f'{len(self.failed_files)} failed, {self.bytes_copied / (1 << 20):.2f} MB in '
+                f'{self.elapsed_secs:.2f} seconds ({self.throughput_mbps:.2f} MB/s), {self.retries} retries')
+
+
+class TransferEngine:
+    """
+    Copies a file or a directory tree between two filesystems using a pool of threads.
+    The destination follows the same layout as CspFs.copy_resources: the source is copied into
+    dest/<source base name>.
+    """
+
+    def __init__(self, options: Optional[TransferOptions] = None):
+        self.options = options or TransferOptions()
+        self._stats_lock = threading.Lock()
+
+    def _list_source(self, src: 'CspPath') -> Tuple[str, List[FileInfo]]:
+        if src.is_dir():
+            f_infos = src.fs_obj.get_file_info(FileSelector(src.no_prefix, recursive=True))
+            return src.no_prefix.rstrip('/'), [f_info for f_info in f_infos if f_info.type == FileType.File]
+        return os.path.dirname(src.no_prefix), [src.file_info]
+
+    @classmethod
+    def _list_destination(cls, dest: 'CspPath', dest_root: str) -> Dict[str, FileInfo]:
+        dest_info = dest.fs_obj.get_file_info(dest_root)
+        if dest_info.type != FileType.Directory:
+            return {}
+        f_infos = dest.fs_obj.get_file_info(FileSelector(dest_root, recursive=True))
+        return {os.path.relpath(f_info.path, dest_root): f_info
+                for f_info in f_infos if f_info.type == FileType.File}
+
+    @classmethod
+    def _is_unchanged(cls, src_info: FileInfo, dest_info: Optional[FileInfo]) -> bool:
+        if dest_info is None or dest_info.size != src_info.size:
+            return False
+        if src_info.mtime is None or dest_info.mtime is None:
+            return True
+        return dest_info.mtime >= src_info.mtime
+
+    def _build_batches(self, files: List[Tuple[FileInfo, str]]) -> List[List[Tuple[FileInfo, str]]]:
+        batches = []
+        small_batch = []
+        for file_entry in files:
+            if (file_entry[0].size or 0) >= self.options.small_file_threshold:
+                batches.append([file_entry])
+                continue
+            small_batch.append(file_entry)
+            if len(small_batch) >= self.options.small_files_batch_size:
+                batches.append(small_batch)
+                small_batch = []
+        if small_batch:
+            batches.append(small_batch)
+        return batches
+
+    def _copy_file(self, src: 'CspPath', src_path: str, dest: 'CspPath', dest_path: str) -> int:
+        copied_bytes = 0
+        with src.fs_obj.open_input_stream(src_path) as in_stream:
+            with dest.fs_obj.open_output_stream(dest_path) as out_stream:
+                while True:
+                    chunk = in_stream.read(self.options.chunk_size)
+                    if not chunk:
+                        break
+                    out_stream.write(chunk)
+                    copied_bytes += len(chunk)
+        return copied_bytes
+
+    def _copy_batch(self, src: 'CspPath', dest: 'CspPath', batch: List[Tuple[FileInfo, str]],
+                    stats: TransferStats) -> None:
+        for src_info, dest_path in batch:
+            for attempt in range(self.options.max_retries + 1):
+                try:
+                    copied_bytes = self._copy_file(src, src_info.path, dest, dest_path)
+                    with self._stats_lock:
+                        stats.files_copied += 1
+                        stats.bytes_copied += copied_bytes
+                    break
+                except OSError as err:
+                    if attempt == self.options.max_retries:
+                        with self._stats_lock:
+                            stats.failed_files[src_info.path] = str(err)
+                        break
+                    with self._stats_lock:
+                        stats.retries += 1
+                    time.sleep(self.options.retry_delay_secs * (2 ** attempt))
+
+    def _run_batches(self, src: 'CspPath', dest: 'CspPath', pending_files: List[Tuple[FileInfo, str]],
+                     stats: TransferStats) -> None:
+        dest_dirs = {os.path.dirname(dest_path) for _, dest_path in pending_files}
+        for dest_dir in sorted(dest_dirs):
+            dest.fs_obj.create_dir(dest_dir)
+        batches = self._build_batches(pending_files)
+        if batches:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.options.max_workers, len(batches)))) as executor:
+                futures = [executor.submit(self._copy_batch, src, dest, batch, stats) for batch in batches]
+                for future in futures:
+                    future.result()
+        # the entries are written directly through the filesystem. Drop their cached information
+        dest.invalidate_file_info(recursive=True)
+
+    def _is_excluded(self, f_info: FileInfo) -> bool:
+        return bool(self.options.exclude_pattern) and fnmatch.fnmatch(f_info.base_name, self.options.exclude_pattern)
+
+    @classmethod
+    def _dest_root(cls, src: 'CspPath', dest: 'CspPath') -> str:
+        dest_root = dest.no_prefix.rstrip('/')
+        if src.is_dir():
+            dest_root = f'{dest_root}/{src.base_name()}'
+        return dest_root
+
+    @classmethod
+    def _raise_on_failures(cls, src: 'CspPath', dest: 'CspPath', stats: TransferStats) -> None:
+        if stats.failed_files:
+            raise CspTransferError(f'Failed to copy {len(stats.failed_files)} files from {src} to {dest}',
+                                   failed_files=stats.failed_files)
+
+    def copy(self, src: 'CspPath', dest: 'CspPath') -> TransferStats:
+        """
+        Copies the source into the destination directory.
+        :param src: path of a file or a directory
+        :param dest: the destination directory. It is created if it does not exist
+        :return: the statistics of the transfer
+        :raises CspTransferError: if some files could not be copied after all the retries
+        """
+        start_time = time.monotonic()
+        stats = TransferStats()
+        if not src.exists():
+            raise CspPathNotFoundException(f'Source Path does not exist {src}')
+        src_root, src_files = self._list_source(src)
+        dest_root = self._dest_root(src, dest)
+        dest_files = self._list_destination(dest, dest_root) if self.options.resume else {}
+        pending_files = []
+        dest.fs_obj.create_dir(dest_root)
+        for src_info in src_files:
+            if self._is_excluded(src_info):
+                continue
+            stats.files_total += 1
+            rel_path = os.path.relpath(src_info.path, src_root)
+            if self._is_unchanged(src_info, dest_files.get(rel_path)):
+                stats.files_skipped += 1
+                continue
+            pending_files.append((src_info, f'{dest_root}/{rel_path}'))
+        self._run_batches(src, dest, pending_files, stats)
+        stats.elapsed_secs = time.monotonic() - start_time
+        self._raise_on_failures(src, dest, stats)
+        return stats
+
+    def _checksum(self, src: 'CspPath', f_info: FileInfo) -> str:
+        hash_obj = hashlib.md5()
+        with src.fs_obj.open_input_stream(f_info.path) as in_stream:
+            while True:
+                chunk = in_stream.read(self.options.chunk_size)
+                if not chunk:
+                    break
+                hash_obj.update(chunk)
+        return hash_obj.hexdigest()
+
+    def _read_manifest(self, dest: 'CspPath', manifest_path: str) -> Dict[str, dict]:
+        if dest.fs_obj.get_file_info(manifest_path).type != FileType.File:
+            return {}
+        try:
+            with dest.fs_obj.open_input_stream(manifest_path) as in_stream:
+                manifest = json.loads(in_stream.read().decode('utf-8'))
+            return manifest.get('files', {})
+        except (OSError, ValueError, AttributeError):
+            # a corrupted manifest is ignored. All the files are compared again
+            return {}
+
+    @classmethod
+    def _write_manifest(cls, dest: 'CspPath', manifest_path: str, entries: Dict[str, dict]) -> None:
+        manifest = {'version': 1, 'algorithm': 'md5', 'files': dict(sorted(entries.items()))}
+        with dest.fs_obj.open_output_stream(manifest_path) as out_stream:
+            out_stream.write(json.dumps(manifest, indent=2).encode('utf-8'))
+
+    def sync(self, src: 'CspPath', dest: 'CspPath') -> TransferStats:
+        """
+        Copies only the new or changed files of the source into the destination directory.
+        A manifest of (relative path, size, checksum) is stored in the destination folder. The
+        files whose size and checksum match the manifest of the previous sync, and which still
+        exist in the destination, are skipped. Files deleted from the source are kept in the
+        destination. If resume is enabled, the files missing from the manifest (i.e., uploaded by a
+        previous copy) are compared by size and modification time instead.
+        :param src: path of a file or a directory
+        :param dest: the destination directory. It is created if it does not exist
+        :return: the statistics of the transfer
+        :raises CspTransferError: if some files could not be copied after all the retries
+        """
+        start_time = time.monotonic()
+        stats = TransferStats()
+        if not src.exists():
+            raise CspPathNotFoundException(f'Source Path does not exist {src}')
+        src_root, src_files = self._list_source(src)
+        src_files = [f_info for f_info in src_files
+                     if f_info.base_name != self.options.manifest_name and not self._is_excluded(f_info)]
+        dest_root = self._dest_root(src, dest)
+        manifest_path = f'{dest_root}/{self.options.manifest_name}'
+        dest_files = self._list_destination(dest, dest_root)
+        remote_entries = self._read_manifest(dest, manifest_path)
+        with ThreadPoolExecutor(max_workers=max(1, self.options.max_workers)) as executor:
+            checksums = list(executor.map(lambda f_info: self._checksum(src, f_info), src_files))
+        local_entries = {}
+        pending_files = []
+        dest.fs_obj.create_dir(dest_root)
+        for src_info, checksum in zip(src_files, checksums):
+            stats.files_total += 1
+            rel_path = os.path.relpath(src_info.path, src_root)
+            local_entries[rel_path] = {'size': src_info.size, 'checksum': checksum}
+            dest_info = dest_files.get(rel_path)
+            remote_entry = remote_entries.get(rel_path)
+            if remote_entry is None and self.options.resume:
+                is_unchanged = self._is_unchanged(src_info, dest_info)
+            else:
+                is_unchanged = (remote_entry == local_entries[rel_path]
+                                and dest_info is not None and dest_info.size == src_info.size)
+            if is_unchanged:
+                stats.files_skipped += 1
+                continue
+            pending_files.append((src_info, f'{dest_root}/{rel_path}'))
+        self._run_batches(src, dest, pending_files, stats)
+        # the failed files are not recorded so that the next sync copies them again
+        failed_paths = {os.path.relpath(path, src_root) for path in stats.failed_files}
+        self._write_manifest(dest, manifest_path,
+                             {rel_path: entry for rel_path, entry in local_entries.items()
+                              if rel_path not in failed_paths})
+        dest.invalidate_file_info(recursive=True)
+        stats.elapsed_secs = time.monotonic() - start_time
+        self._raise_on_failures(src, dest, stats)
+        return stats
@@ -0,0 +1,191 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Includes classes and wrappers to run the qualification tool on batches of event logs"""
+
+import contextlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Optional, ClassVar, Type, List
+
+from pydantic import ConfigDict, Field, ValidationError
+from tabulate import tabulate
+
+from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.common.utilities import ToolLogging, Utils
+from spark_rapids_tools.exceptions import InvalidPropertiesSchema
+from spark_rapids_tools.utils.propmanager import PropValidatorSchemaCamel, PropValidatorSchema, AbstractPropContainer
+from spark_rapids_tools.utils.util import to_camel_case
+
+
+class QualBatchGroupSchema(PropValidatorSchemaCamel):
+    """
+    A group of event logs qualified together. The fields match the arguments of the qualification cmd.
+    """
+    model_config = ConfigDict(alias_generator=to_camel_case, extra='forbid')
+    name: str
+    eventlogs: Optional[str] = None
+    cluster: Optional[str] = None
+    platform: Optional[str] = None
+    target_platform: Optional[str] = None
+    output_folder: Optional[str] = None
+    filter_apps: Optional[str] = None
+    cpu_cluster_price: Optional[float] = None
+    estimated_gpu_cluster_price: Optional[float] = None
+    cpu_discount: Optional[int] = None
+    gpu_discount: Optional[int] = None
+    global_discount: Optional[int] = None
+    gpu_cluster_recommendation: Optional[str] = None
+    output_format: Optional[str] = None
+    rapids_options: dict = Field(default_factory=dict)
+
+
+class QualBatchManifestSchema(PropValidatorSchemaCamel):
+    """
+    The manifest listing the groups of a qualification batch.
+    """
+    max_parallel: int = Field(default=2, ge=1)
+    # arguments applied to all the groups unless the group overrides them
+    defaults: dict = Field(default_factory=dict)
+    groups: List[dict] = Field(min_length=1)
+
+
+class QualBatchManifest(AbstractPropContainer):
+    """
+    Loads and validates the manifest file of a qualification batch.
+    """
+    schema_clzz: ClassVar[Type['PropValidatorSchema']] = QualBatchManifestSchema
+
+    def get_max_parallel(self) -> int:
+        return QualBatchManifestSchema(**self.props).max_parallel
+
+    def get_groups(self) -> List[QualBatchGroupSchema]:
+        defaults = self.props.get('defaults') or {}
+        res = []
+        group_names = set()
+        for group_props in self.props['groups']:
+            try:
+                group = QualBatchGroupSchema(**{**defaults, **group_props})
+            except ValidationError as exc:
+                raise InvalidPropertiesSchema('Invalid qualification batch group. ', exc) from exc
+            if group.name in group_names:
+                raise InvalidPropertiesSchema(f'Duplicate qualification batch group [{group.name}]')
+            group_names.add(group.name)
+            res.append(group)
+        return res
+
+
+def run_qualification_group(group_args: dict, verbose: bool) -> dict:
+    """
+    Runs the qualification tool on a single group. It is executed inside a worker process so that the
+    environment variables and the logging setup of each group do not interfere with each other.
+    The console output of the group is saved in its output folder.
+    :param group_args: the arguments of the qualification cmd for the group
+    :param verbose: True or False to enable verbosity of the tool
+    :return: dictionary summarizing the execution of the group
+    """
+    # pylint: disable=import-outside-toplevel
+    from spark_rapids_pytools.rapids.qualification import QualificationAsLocal
+    from spark_rapids_tools.cmdli.argprocessor import AbsToolUserArgModel
+    from spark_rapids_tools.utils.util import init_environment
+
+    group_name = group_args.pop('name')
+    rapids_options = group_args.pop('rapids_options')
+    output_folder = group_args['output_folder']
+    FSUtil.make_dirs(output_folder)
+    summary = {'name': group_name, 'outputFolder': output_folder, 'status': 'SUCCESS', 'error': None}
+    start_time = time.monotonic()
+    console_file = FSUtil.build_path(output_folder, 'qualification_console.log')
+    with open(console_file, 'w', encoding='utf-8') as console_fd:
+        with contextlib.redirect_stdout(console_fd), contextlib.redirect_stderr(console_fd):
+            try:
+                if verbose:
+                    ToolLogging.enable_debug_mode()
+                init_environment('qual')
+                summary['logFile'] = Utils.get_rapids_tools_env('LOG_FILE')
+                qual_args = AbsToolUserArgModel.create_tool_args('qualification', **group_args)
+                if qual_args:
+                    tool_obj = QualificationAsLocal(platform_type=qual_args['runtimePlatform'],
+                                                    output_folder=qual_args['outputFolder'],
+                                                    wrapper_options=qual_args,
+                                                    rapids_options=rapids_options)
+                    tool_obj.launch()
+            except (Exception, SystemExit) as ex:  # pylint: disable=broad-except
+                summary['status'] = 'FAILED'
+                summary['error'] = f'{type(ex).__name__}: {ex}'
+            finally:
+                ToolLogging.flush()
+    summary['duration'] = round(time.monotonic() - start_time, 3)
+    return summary
+
+
+@dataclass
+class QualificationBatch:
+    """
+    Runs the qualification tool on many groups of event logs described by a manifest file.
+    The groups are executed by a bounded pool of worker processes. Each group writes its output into
+    a separate folder, and the batch writes a summary of all the groups into the batch output folder.
+    """
+    manifest_file: str
+    output_folder: str = None
+    verbose: bool = False
+    manifest: QualBatchManifest = field(default=None, init=False)
+    logger: Logger = field(default=None, init=False)
+    summary_file_name: ClassVar[str] = 'qualification_batch_summary.json'
+
+    def __post_init__(self):
+        self.logger = ToolLogging.get_and_setup_logger('rapids.tools.qualification.batch')
+        self.manifest = QualBatchManifest.load_from_file(self.manifest_file)
+        if self.output_folder is None:
+            self.output_folder = Utils.get_rapids_tools_env('OUTPUT_DIRECTORY', os.getcwd())
+        self.output_folder = FSUtil.build_path(FSUtil.get_abs_path(self.output_folder),
+                                               Utils.gen_uuid_with_ts(pref='qual_batch', suffix_len=4))
+
+    def _build_group_args(self, group: QualBatchGroupSchema) -> dict:
+        group_args = group.model_dump()
+        if group_args['output_folder'] is None:
+            group_args['output_folder'] = FSUtil.build_path(self.output_folder, group.name)
+        return group_args
+
+    def _report_summary(self, summaries: List[dict]) -> None:
+        summary_file = FSUtil.build_path(self.output_folder, self.summary_file_name)
+        with open(summary_file, 'w', encoding='utf-8') as summary_fd:
+            json.dump(summaries, summary_fd, indent=2)
+        headers = ['name', 'status', 'duration', 'outputFolder']
+        rows = [[s[h] for h in headers] for s in summaries]
+        print(Utils.gen_report_sec_header('Qualification Batch Summary'))
+        print(tabulate(rows, headers=['Group', 'Status', 'Duration (s)', 'Output'], tablefmt='grid'))
+        for s in summaries:
+            if s['error']:
+                print(f'- {s["name"]}: {s["error"]}')
+        print(f'\nSummary of the batch: {summary_file}')
+
+    def run(self) -> List[dict]:
+        groups = self.manifest.get_groups()
+        max_parallel = min(self.manifest.get_max_parallel(), len(groups))
+        FSUtil.make_dirs(self.output_folder)
+        self.logger.info('Running %d qualification groups using %d workers', len(groups), max_parallel)
+        start_time = time.monotonic()
+        with ProcessPoolExecutor(max_workers=max_parallel,
+                                 mp_context=ToolLogging.get_process_pool_context()) as executor:
+            futures = [executor.submit(run_qualification_group, self._build_group_args(group), self.verbose)
+                       for group in groups]
+            summaries = [future.result() for future in futures]
+        self.logger.info('Qualification batch completed in %.3f seconds', time.monotonic() - start_time)
+        self._report_summary(summaries)
+        return summaries
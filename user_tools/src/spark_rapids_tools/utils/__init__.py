@@ -14,14 +14,24 @@
 
 """init file of the utils package for the Accelerated Spark tools"""
 
+import importlib
+
 from .util import (
     get_elem_from_dict, get_elem_non_safe, is_http_file
 )
 
-from .propmanager import (
-    AbstractPropContainer,
-    PropValidatorSchema
-)
+# the property containers load the storagelib (pyArrow). They are imported on first access
+_lazy_members = {
+    'AbstractPropContainer': '.propmanager',
+    'PropValidatorSchema': '.propmanager'
+}
+
+
+def __getattr__(name):
+    if name in _lazy_members:
+        return getattr(importlib.import_module(_lazy_members[name], __name__), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 __all__ = [
     'get_elem_from_dict',
@@ -23,7 +23,6 @@ from operator import getitem
 from typing import Any, Optional
 
 import fire
-from pydantic import ValidationError, AnyHttpUrl, TypeAdapter
 
 import spark_rapids_pytools
 from spark_rapids_tools.exceptions import CspPathAttributeError
@@ -59,6 +58,8 @@ def stringify_path(fpath) -> str:
 
 
 def is_http_file(value: Any) -> bool:
+    # pydantic is loaded on demand to keep the startup of the CLI fast
+    from pydantic import ValidationError, AnyHttpUrl, TypeAdapter  # pylint: disable=import-outside-toplevel
     try:
         TypeAdapter(AnyHttpUrl).validate_python(value)
         return True
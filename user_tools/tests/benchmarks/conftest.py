@@ -0,0 +1,210 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Synthetic outputs of the RAPIDS tools and mock contexts used by the benchmarks"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_tools import CspEnv
+from spark_rapids_pytools.common.prop_manager import JSONPropertiesContainer
+from spark_rapids_pytools.common.sys_storage import FSUtil, StorageDriver
+from spark_rapids_pytools.common.utilities import ToolLogging, Utils
+from spark_rapids_pytools.rapids.profiling import Profiling
+from spark_rapids_pytools.rapids.qualification import Qualification
+
+from .harness import BenchmarkRunner
+from ..test_qualification import MockCluster, MockPlatform, MockToolContext
+
+RECOMMENDATIONS = ['Strongly Recommended', 'Recommended', 'Not Recommended', 'Not Applicable']
+
+
+@dataclass
+class MockLocalPlatform(MockPlatform):
+    """Platform with a local storage and a flat pricing configuration."""
+    storage: StorageDriver = field(default_factory=StorageDriver)
+    configs: JSONPropertiesContainer = field(
+        default_factory=lambda: JSONPropertiesContainer(prop_arg={'pricing': {'catalog': 'mock'}},
+                                                        file_load=False))
+
+    @property
+    def ctxt(self) -> dict:
+        return {'notes': self.notes}
+
+
+@dataclass
+class MockLocalToolContext(MockToolContext):
+    """Tool context reading the output of the RAPIDS tool from a local folder."""
+    platform: MockLocalPlatform = field(default_factory=MockLocalPlatform)
+    output_folder: str = None
+    logger: Any = field(default=None, init=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.logger = ToolLogging.get_and_setup_logger('rapids.tools.benchmark')
+
+    def get_local(self, key: str):
+        return {'outputFolder': self.output_folder}.get(key)
+
+    def get_output_folder(self) -> str:
+        return self.output_folder
+
+    def get_rapids_output_folder(self) -> str:
+        return FSUtil.build_path(self.output_folder, self.get_value('toolOutput', 'subFolder'))
+
+
+def gen_qualification_output_df(apps_cnt: int) -> pd.DataFrame:
+    """
+    Generates the summary report of the Qualification tool. About one fifth of the apps share their
+    name with other apps, so that the grouping of the apps is part of the measures.
+    """
+    rand_gen = np.random.default_rng(seed=2023)
+    app_durations = rand_gen.integers(1000, 10000000, size=apps_cnt)
+    speedups = rand_gen.uniform(1.0, 6.0, size=apps_cnt)
+    sql_durations = (app_durations * rand_gen.uniform(0.1, 1.0, size=apps_cnt)).astype(np.int64)
+    name_ids = rand_gen.integers(0, max(1, int(apps_cnt * 0.8)), size=apps_cnt)
+    return pd.DataFrame({
+        'App Name': [f'synthetic_app_{name_id}' for name_id in name_ids],
+        'App ID': [f'application_1696000000000_{ind:07d}' for ind in range(apps_cnt)],
+        'Recommendation': rand_gen.choice(RECOMMENDATIONS, size=apps_cnt),
+        'Estimated GPU Speedup': speedups.round(2),
+        'Estimated GPU Duration': (app_durations / speedups).round(2),
+        'Estimated GPU Time Saved': (app_durations - app_durations / speedups).round(2),
+        'SQL DF Duration': sql_durations,
+        'SQL Dataframe Task Duration': sql_durations * rand_gen.integers(2, 64, size=apps_cnt),
+        'App Duration': app_durations,
+        'GPU Opportunity': (sql_durations * rand_gen.uniform(0.0, 1.0, size=apps_cnt)).astype(np.int64),
+        'Executor CPU Time Percent': rand_gen.uniform(0.0, 100.0, size=apps_cnt).round(1),
+        'SQL Ids with Failures': '',
+        'Unsupported Read File Formats and Types': rand_gen.choice(['', 'JSON[decimal]', 'Avro[*]'],
+                                                                   size=apps_cnt),
+        'Unsupported Write Data Format': '',
+        'Complex Types': '',
+        'Nested Complex Types': '',
+        'Potential Problems': rand_gen.choice(['', 'UDF', 'NESTED COMPLEX TYPE'], size=apps_cnt),
+        'Longest SQL Duration': (sql_durations * 0.6).astype(np.int64),
+        'Unsupported Execs': rand_gen.choice(['', 'Scan;WindowInPandas', 'FlatMapGroupsInPandas'],
+                                             size=apps_cnt),
+        'Unsupported Expressions': '',
+        'Estimated Job Frequency (monthly)': rand_gen.integers(1, 60, size=apps_cnt)
+    })
+
+
+def gen_profile_log_lines(app_ind: int, props_cnt: int = 40) -> list:
+    """Generates the profile.log of a single app including the recommendations section."""
+    lines = ['### A. Information Collected ###',
+             'Spark Properties:',
+             '+--------------------+--------------------+',
+             '|propertyName        |appIndex_1          |',
+             '+--------------------+--------------------+',
+             f'|spark.app.name      |synthetic_app_{app_ind} |']
+    lines.extend(f'|spark.synthetic.property.{prop_ind} |value_{prop_ind} |' for prop_ind in range(props_cnt))
+    lines.extend(['+--------------------+--------------------+',
+                  '',
+                  '### D. Recommended Configuration ###',
+                  '',
+                  'Spark Properties:',
+                  '--conf spark.executor.cores=16',
+                  '--conf spark.executor.instances=8',
+                  f'--conf spark.executor.memory={16 + app_ind % 16}g',
+                  '--conf spark.rapids.memory.pinnedPool.size=4096m',
+                  f'--conf spark.sql.shuffle.partitions={200 + app_ind % 400}',
+                  '--conf spark.task.resource.gpu.amount=0.0625',
+                  '',
+                  'Comments:',
+                  "- 'spark.executor.instances' was not set.",
+                  "- 'spark.rapids.memory.pinnedPool.size' was not set.",
+                  '- Average JVM GC time is very high. Other Garbage Collectors can be used.',
+                  ''])
+    return lines
+
+
+def gen_profiling_output_tree(output_folder: str, apps_cnt: int) -> str:
+    rapids_output_dir = os.path.join(output_folder, 'rapids_4_spark_profile')
+    for app_ind in range(apps_cnt):
+        app_dir = os.path.join(rapids_output_dir, f'application_1696000000000_{app_ind:07d}')
+        os.makedirs(app_dir)
+        with open(os.path.join(app_dir, 'profile.log'), 'w', encoding='utf-8') as profile_log:
+            profile_log.write(Utils.gen_multiline_str(gen_profile_log_lines(app_ind)))
+    return rapids_output_dir
+
+
+def gen_qualification_tool(output_folder: str) -> Qualification:
+    tool = Qualification(platform_type=CspEnv.DATAPROC)
+    tool.ctxt = MockLocalToolContext(prop_arg=Utils.resource_path('qualification-conf.yaml'),
+                                     output_folder=output_folder)
+    tool.ctxt.wrapper_ctxt.update({
+        'cpuClusterProxy': MockCluster(workers_cnt=8),
+        'gpuClusterProxy': MockCluster(workers_cnt=4),
+        'enableSavingsCalculations': True,
+        'rapidsOutputIsGenerated': True,
+        'cpu_discount': 15,
+        'gpu_discount': 30
+    })
+    return tool
+
+
+def gen_profiling_tool(output_folder: str) -> Profiling:
+    tool = Profiling(platform_type=CspEnv.DATAPROC)
+    tool.ctxt = MockLocalToolContext(prop_arg=Utils.resource_path('profiling-conf.yaml'),
+                                     output_folder=output_folder)
+    tool.ctxt.wrapper_ctxt['rapidsOutputIsGenerated'] = True
+    return tool
+
+
+@pytest.fixture(scope='session', name='bench_runner')
+def fixture_bench_runner():
+    runner = BenchmarkRunner.create_from_env()
+    yield runner
+    if runner.results:
+        print(f'\n{runner.gen_report()}')
+        baseline_file = Utils.get_rapids_tools_env('BENCHMARK_BASELINE')
+        if baseline_file and not runner.baseline:
+            print(f'Saved the benchmark results as the baseline {runner.save_results(baseline_file)}')
+
+
+@pytest.fixture(scope='session', name='qual_output_folder')
+def fixture_qual_output_folder(tmp_path_factory):
+    """Factory writing the summary report of the Qualification tool once per size."""
+    output_folders = {}
+
+    def get_output_folder(apps_cnt: int) -> str:
+        if apps_cnt not in output_folders:
+            output_folder = str(tmp_path_factory.mktemp(f'qual_{apps_cnt}'))
+            rapids_output_dir = os.path.join(output_folder, 'rapids_4_spark_qualification_output')
+            os.makedirs(rapids_output_dir)
+            gen_qualification_output_df(apps_cnt).to_csv(
+                os.path.join(rapids_output_dir, 'rapids_4_spark_qualification_output.csv'), index=False)
+            output_folders[apps_cnt] = output_folder
+        return output_folders[apps_cnt]
+    return get_output_folder
+
+
+@pytest.fixture(scope='session', name='prof_output_folder')
+def fixture_prof_output_folder(tmp_path_factory):
+    """Factory writing the output tree of the Profiling tool once per size."""
+    output_folders = {}
+
+    def get_output_folder(apps_cnt: int) -> str:
+        if apps_cnt not in output_folders:
+            output_folder = str(tmp_path_factory.mktemp(f'prof_{apps_cnt}'))
+            gen_profiling_output_tree(output_folder, apps_cnt)
+            output_folders[apps_cnt] = output_folder
+        return output_folders[apps_cnt]
+    return get_output_folder
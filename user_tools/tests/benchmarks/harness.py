@@ -0,0 +1,171 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Harness timing the steps of the tools and comparing the results to a baseline.
+
+The benchmarks are skipped unless the env-var RAPIDS_USER_TOOLS_BENCHMARK is set to one of the
+scales defined in BENCHMARK_SCALES. The results are compared to the baseline file defined by
+RAPIDS_USER_TOOLS_BENCHMARK_BASELINE. The baseline file is created with the results of the run
+if it does not exist. A benchmark fails when its time or its peak memory exceeds the baseline by
+more than RAPIDS_USER_TOOLS_BENCHMARK_THRESHOLD percent (default 25).
+
+    RAPIDS_USER_TOOLS_BENCHMARK=small \\
+    RAPIDS_USER_TOOLS_BENCHMARK_BASELINE=/tmp/baseline.json \\
+    pytest tests/benchmarks -s
+"""
+
+import gc
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from tabulate import tabulate
+
+from spark_rapids_pytools.common.utilities import Utils
+
+# sizes of the synthetic outputs used by each scale
+BENCHMARK_SCALES = {
+    'small': {
+        'qualificationApps': [1000, 10000],
+        'profilingApps': [100],
+        'storagePaths': [1000]
+    },
+    'full': {
+        'qualificationApps': [1000, 10000, 100000, 1000000],
+        'profilingApps': [100, 10000],
+        'storagePaths': [1000, 10000]
+    }
+}
+DEFAULT_THRESHOLD_PERCENT = 25
+# regressions smaller than those values are considered as noise
+WALL_NOISE_SECS = 0.01
+MEM_NOISE_MB = 1.0
+
+
+def get_benchmark_scale() -> Optional[dict]:
+    scale_name = Utils.get_rapids_tools_env('BENCHMARK')
+    if not scale_name:
+        return None
+    return BENCHMARK_SCALES.get(scale_name.lower(), BENCHMARK_SCALES['small'])
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The measures of a single benchmark.
+    :param wall_secs: the fastest elapsed time among the rounds
+    :param peak_mem_mb: the peak of the memory allocated by python during a round
+    """
+    name: str
+    wall_secs: float
+    peak_mem_mb: float
+
+    def to_dict(self) -> dict:
+        return {'wallSecs': round(self.wall_secs, 6), 'peakMemMB': round(self.peak_mem_mb, 3)}
+
+
+@dataclass
+class BenchmarkRunner:
+    """
+    Measures the benchmarks and compares them to the results of the baseline.
+    :param rounds: the number of the timed rounds of each benchmark
+    :param threshold: the ratio of the regression that fails a benchmark
+    :param baseline: the results of the baseline by benchmark name
+    """
+    rounds: int = 3
+    threshold: float = DEFAULT_THRESHOLD_PERCENT / 100
+    baseline: Dict[str, dict] = field(default_factory=dict)
+    results: Dict[str, BenchmarkResult] = field(default_factory=dict, init=False)
+
+    @classmethod
+    def create_from_env(cls) -> 'BenchmarkRunner':
+        threshold = Utils.get_rapids_tools_env('BENCHMARK_THRESHOLD', DEFAULT_THRESHOLD_PERCENT)
+        runner = cls(threshold=float(threshold) / 100)
+        baseline_file = Utils.get_rapids_tools_env('BENCHMARK_BASELINE')
+        if baseline_file and os.path.exists(baseline_file):
+            runner.baseline = cls.load_results(baseline_file)
+        return runner
+
+    @staticmethod
+    def load_results(file_path: str) -> Dict[str, dict]:
+        with open(file_path, 'r', encoding='utf-8') as results_fd:
+            return json.load(results_fd)
+
+    def save_results(self, file_path: str) -> str:
+        with open(file_path, 'w', encoding='utf-8') as results_fd:
+            json.dump({name: res.to_dict() for name, res in sorted(self.results.items())},
+                      results_fd, indent=2)
+        return file_path
+
+    def measure(self,
+                name: str,
+                func_cb: Callable,
+                setup_cb: Callable[[], tuple] = tuple,
+                rounds: int = None) -> BenchmarkResult:
+        """
+        Times the function then runs it once more while tracing the memory allocations.
+        :param name: the name of the benchmark in the baseline
+        :param func_cb: the function being measured
+        :param setup_cb: builds the arguments of each round outside the measures, so that the
+               rounds do not share mutable inputs
+        :param rounds: overrides the number of the timed rounds (i.e., for the largest inputs)
+        """
+        wall_secs = float('inf')
+        for _ in range(rounds or self.rounds):
+            args = setup_cb()
+            gc.collect()
+            start_time = time.perf_counter()
+            func_cb(*args)
+            wall_secs = min(wall_secs, time.perf_counter() - start_time)
+        args = setup_cb()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func_cb(*args)
+            _, peak_mem = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result = BenchmarkResult(name=name, wall_secs=wall_secs, peak_mem_mb=peak_mem / (1 << 20))
+        self.results[name] = result
+        return result
+
+    def get_regressions(self, result: BenchmarkResult) -> List[str]:
+        base_res = self.baseline.get(result.name)
+        if base_res is None:
+            return []
+        regressions = []
+        max_wall_secs = base_res['wallSecs'] * (1 + self.threshold) + WALL_NOISE_SECS
+        if result.wall_secs > max_wall_secs:
+            regressions.append(f'{result.name}: time {result.wall_secs:.4f}s exceeds the baseline '
+                               f'{base_res["wallSecs"]:.4f}s by more than {self.threshold:.0%}')
+        max_mem_mb = base_res['peakMemMB'] * (1 + self.threshold) + MEM_NOISE_MB
+        if result.peak_mem_mb > max_mem_mb:
+            regressions.append(f'{result.name}: peak memory {result.peak_mem_mb:.1f}MB exceeds the baseline '
+                               f'{base_res["peakMemMB"]:.1f}MB by more than {self.threshold:.0%}')
+        return regressions
+
+    def gen_report(self) -> str:
+        rows = []
+        for name, res in sorted(self.results.items()):
+            base_res = self.baseline.get(name, {})
+            rows.append([name,
+                         f'{res.wall_secs:.4f}', f'{base_res["wallSecs"]:.4f}' if base_res else '-',
+                         f'{res.peak_mem_mb:.1f}', f'{base_res["peakMemMB"]:.1f}' if base_res else '-'])
+        return tabulate(rows,
+                        headers=['Benchmark', 'Time(s)', 'Baseline(s)', 'Peak Mem(MB)', 'Baseline(MB)'],
+                        disable_numparse=True)
@@ -0,0 +1,48 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the harness measuring the benchmarks and detecting the regressions."""
+
+from .harness import BenchmarkResult, BenchmarkRunner
+
+
+class TestBenchmarkHarness:
+    """Test the measures and their comparison to the baseline."""
+
+    def test_measure_and_save_baseline(self, tmp_path):
+        runner = BenchmarkRunner(rounds=2)
+        setup_calls = []
+
+        def setup():
+            setup_calls.append(1)
+            return (10000,)
+        result = runner.measure('alloc', lambda cnt: [0] * cnt, setup_cb=setup)
+        # each timed round and the traced round get their own arguments
+        assert len(setup_calls) == 3
+        assert result.wall_secs > 0
+        assert result.peak_mem_mb > 0
+        baseline = BenchmarkRunner.load_results(runner.save_results(str(tmp_path / 'baseline.json')))
+        assert baseline == {'alloc': result.to_dict()}
+
+    def test_regressions_beyond_threshold(self):
+        runner = BenchmarkRunner(threshold=0.25, baseline={
+            'steady': {'wallSecs': 1.0, 'peakMemMB': 100.0},
+            'slower': {'wallSecs': 1.0, 'peakMemMB': 100.0},
+            'bigger': {'wallSecs': 1.0, 'peakMemMB': 100.0}
+        })
+        assert not runner.get_regressions(BenchmarkResult('steady', wall_secs=1.2, peak_mem_mb=120.0))
+        assert not runner.get_regressions(BenchmarkResult('new', wall_secs=10.0, peak_mem_mb=1000.0))
+        slower_regressions = runner.get_regressions(BenchmarkResult('slower', wall_secs=1.5, peak_mem_mb=100.0))
+        assert len(slower_regressions) == 1 and 'time' in slower_regressions[0]
+        bigger_regressions = runner.get_regressions(BenchmarkResult('bigger', wall_secs=1.0, peak_mem_mb=150.0))
+        assert len(bigger_regressions) == 1 and 'peak memory' in bigger_regressions[0]
@@ -0,0 +1,141 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the post-processing of the tools output on synthetic outputs of growing sizes."""
+
+import pandas as pd
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_tools.enums import QualGpuClusterReshapeType
+from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.pricing.price_provider import SavingsEstimatorPool
+
+from .conftest import gen_profiling_tool, gen_qualification_tool
+from .harness import get_benchmark_scale
+from ..test_qualification import gen_apps_df, reshape_apps_per_row
+
+BENCHMARK_SCALE = get_benchmark_scale() or {'qualificationApps': [], 'profilingApps': []}
+
+pytestmark = pytest.mark.skipif(get_benchmark_scale() is None,
+                                reason='Set RAPIDS_USER_TOOLS_BENCHMARK to run the benchmarks')
+
+
+def get_rounds(apps_cnt: int) -> int:
+    # a single round is enough to measure the largest inputs
+    return 1 if apps_cnt >= 100000 else 3
+
+
+# the vectorized cluster reshape is compared to its per-row reference on the mid-sized inputs. The
+# fixed costs dominate the smaller inputs and the per-row reshape is too slow on the larger ones
+PER_ROW_RESHAPE_APPS_RANGE = (10000, 100000)
+
+
+def assert_no_regressions(bench_runner, result):
+    regressions = bench_runner.get_regressions(result)
+    assert not regressions, '\n'.join(regressions)
+
+
+class TestQualificationBenchmarks:
+    """Benchmark the steps generating the Qualification report."""
+
+    @pytest.mark.parametrize('apps_cnt', BENCHMARK_SCALE['qualificationApps'])
+    def test_process_output(self, bench_runner, qual_output_folder, apps_cnt):
+        output_folder = qual_output_folder(apps_cnt)
+
+        def setup():
+            SavingsEstimatorPool.clear()
+            return (gen_qualification_tool(output_folder),)
+
+        def process_output(tool):
+            tool._process_output()  # pylint: disable=protected-access
+            assert tool.ctxt.get_ctxt('wrapperOutputContent')
+        result = bench_runner.measure(f'qualification.process_output[{apps_cnt}]', process_output,
+                                      setup_cb=setup, rounds=get_rounds(apps_cnt))
+        assert_no_regressions(bench_runner, result)
+
+    @pytest.mark.parametrize('apps_cnt', BENCHMARK_SCALE['qualificationApps'])
+    def test_savings_estimator(self, bench_runner, apps_cnt):
+        apps_df = gen_apps_df(apps_cnt)
+
+        def setup():
+            SavingsEstimatorPool.clear()
+            return gen_qualification_tool(output_folder=None), apps_df.copy()
+
+        def calc_apps_cost(tool, df):
+            tool._Qualification__calc_apps_cost(df,  # pylint: disable=protected-access
+                                                'Recommended Cluster Shape',
+                                                'Speedup Based Recommendation')
+        result = bench_runner.measure(f'qualification.savings_estimator[{apps_cnt}]', calc_apps_cost,
+                                      setup_cb=setup, rounds=get_rounds(apps_cnt))
+        assert_no_regressions(bench_runner, result)
+
+    @pytest.mark.parametrize('apps_cnt', BENCHMARK_SCALE['qualificationApps'])
+    def test_cluster_reshape(self, bench_runner, apps_cnt):
+        apps_df = gen_apps_df(apps_cnt).drop(columns=['Recommended Cluster Shape'])
+
+        def setup():
+            return gen_qualification_tool(output_folder=None), apps_df.copy()
+
+        def apply_gpu_shape(tool, df):
+            tool._Qualification__apply_non_standard_gpu_shape(df,  # pylint: disable=protected-access
+                                                              20,
+                                                              QualGpuClusterReshapeType.JOB)
+        result = bench_runner.measure(f'qualification.cluster_reshape[{apps_cnt}]', apply_gpu_shape,
+                                      setup_cb=setup, rounds=get_rounds(apps_cnt))
+        assert_no_regressions(bench_runner, result)
+        if PER_ROW_RESHAPE_APPS_RANGE[0] <= apps_cnt <= PER_ROW_RESHAPE_APPS_RANGE[1]:
+            per_row_result = bench_runner.measure(
+                f'qualification.cluster_reshape_per_row[{apps_cnt}]',
+                lambda df: reshape_apps_per_row(df, 20, QualGpuClusterReshapeType.JOB),
+                setup_cb=lambda: (apps_df.copy(),), rounds=1)
+            assert per_row_result.wall_secs >= 20 * result.wall_secs, \
+                f'Reshape took {result.wall_secs:.4f}s compared to {per_row_result.wall_secs:.4f}s per row'
+
+    @pytest.mark.parametrize('apps_cnt', BENCHMARK_SCALE['qualificationApps'])
+    def test_report_rendering(self, bench_runner, qual_output_folder, apps_cnt):
+        output_folder = qual_output_folder(apps_cnt)
+        tool = gen_qualification_tool(output_folder)
+        rapids_summary_file = FSUtil.build_path(tool.ctxt.get_rapids_output_folder(),
+                                                'rapids_4_spark_qualification_output.csv')
+        csv_summary_file = FSUtil.build_path(output_folder, 'qualification_summary.csv')
+        summary = tool._Qualification__build_global_report_summary(  # pylint: disable=protected-access
+            pd.read_csv(rapids_summary_file), csv_summary_file)
+        summary_cols = tool.ctxt.get_value('local', 'output', 'summaryColumns', 'savingsReportEnabledTrue')
+
+        def generate_report():
+            report_content = summary.generate_report(app_name=tool.pretty_name(),
+                                                     wrapper_csv_file=csv_summary_file,
+                                                     df_pprinter=lambda df: df.loc[:, summary_cols])
+            assert report_content
+        result = bench_runner.measure(f'qualification.report_rendering[{apps_cnt}]', generate_report,
+                                      rounds=get_rounds(apps_cnt))
+        assert_no_regressions(bench_runner, result)
+
+
+class TestProfilingBenchmarks:
+    """Benchmark the steps generating the Profiling report."""
+
+    @pytest.mark.parametrize('apps_cnt', BENCHMARK_SCALE['profilingApps'])
+    def test_report_with_recommendations(self, bench_runner, prof_output_folder, apps_cnt):
+        output_folder = prof_output_folder(apps_cnt)
+
+        def setup():
+            return (gen_profiling_tool(output_folder),)
+
+        def generate_report(tool):
+            tool._Profiling__generate_report_with_recommendations()  # pylint: disable=protected-access
+            wrapper_content = tool.ctxt.get_ctxt('wrapperOutputContent')
+            assert wrapper_content[1].count('--conf spark.executor.cores=16') == apps_cnt
+        result = bench_runner.measure(f'profiling.report_with_recommendations[{apps_cnt}]', generate_report,
+                                      setup_cb=setup, rounds=get_rounds(apps_cnt))
+        assert_no_regressions(bench_runner, result)
@@ -0,0 +1,59 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the path-heavy operations of the storagelib filesystems."""
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_tools.storagelib import LocalFs
+
+from .harness import get_benchmark_scale
+
+BENCHMARK_SCALE = get_benchmark_scale() or {'storagePaths': []}
+
+pytestmark = pytest.mark.skipif(get_benchmark_scale() is None,
+                                reason='Set RAPIDS_USER_TOOLS_BENCHMARK to run the benchmarks')
+
+# the calls delegated by LocalFs are compared to the calls made on the pyArrow filesystem directly.
+# Resolving the delegated members on each access made them about five times slower
+MAX_DELEGATION_OVERHEAD = 2
+
+
+def run_path_operations(fs_obj, paths: list) -> None:
+    for path in paths:
+        fs_obj.create_dir(path)
+        file_path = f'{path}/file.txt'
+        assert fs_obj.get_file_info(file_path).size == 4
+        with fs_obj.open_input_stream(file_path) as in_stream:
+            assert in_stream.read() == b'data'
+
+
+class TestStorageBenchmarks:
+    """Benchmark the filesystems delegating to pyArrow."""
+
+    @pytest.mark.parametrize('paths_cnt', BENCHMARK_SCALE['storagePaths'])
+    def test_path_operations(self, bench_runner, tmp_path, paths_cnt):
+        local_fs = LocalFs()
+        paths = [str(tmp_path / f'dir-{path_ind}') for path_ind in range(paths_cnt)]
+        for path in paths:
+            local_fs.create_dir(path)
+            with local_fs.open_output_stream(f'{path}/file.txt') as out_stream:
+                out_stream.write(b'data')
+        direct_result = bench_runner.measure(f'storage.path_operations_arrow_fs[{paths_cnt}]',
+                                             lambda: run_path_operations(local_fs.fs, paths), rounds=5)
+        result = bench_runner.measure(f'storage.path_operations[{paths_cnt}]',
+                                      lambda: run_path_operations(local_fs, paths), rounds=5)
+        regressions = bench_runner.get_regressions(result)
+        assert not regressions, '\n'.join(regressions)
+        assert result.wall_secs <= MAX_DELEGATION_OVERHEAD * direct_result.wall_secs, \
+            f'Delegated operations took {result.wall_secs:.4f}s compared to {direct_result.wall_secs:.4f}s directly'
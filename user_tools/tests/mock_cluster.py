@@ -14,6 +14,7 @@
 """Mock cluster configurations for unit testing."""
 
 import json
+from unittest.mock import Mock
 
 mock_live_cluster = {
     "dataproc": [
@@ -48,20 +49,6 @@ mock_live_cluster = {
                 "state": "RUNNING",
             },
         }),
-        # gcloud compute machine-types describe n1-standard-8 --format json --zone us-central1-a
-        json.dumps({
-            "guestCpus": 8,
-            "memoryMb": 30720,
-        }),
-        # gcloud compute accelerator-types describe nvidia-tesla-t4 --format json --zone us-central1-a
-        json.dumps({
-            "description": "NVIDIA T4",
-        }),
-        # gcloud compute machine-types describe n1-standard-2 --format json --zone us-central1-a
-        json.dumps({
-            "guestCpus": 2,
-            "memoryMb": 7680,
-        }),
     ],
 
     "emr": [
@@ -119,8 +106,89 @@ mock_live_cluster = {
                 },
             }]
         }),
-        # aws ec2 describe-instance-types --region us-west-2 --instance-types m5a.12xlarge
+    ],
+
+    "databricks-aws": [
+        # databricks clusters get --profile DEFAULT --cluster-name test-cluster
+        json.dumps({
+            "cluster_id": "1234-567890-test-cluster",
+            "driver": {
+                "public_dns": "12.34.56.789",
+                "node_id": "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+            },
+            "executors": [
+                {
+                    "public_dns": "12.34.56.798",
+                    "node_id": "bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb",
+                },
+            ],
+            "node_type_id": "g4dn.12xlarge",
+            "driver_node_type_id": "m5a.12xlarge",
+            "instance_source": {
+                "node_type_id": "g4dn.12xlarge"
+            },
+            "driver_instance_source": {
+                "node_type_id": "m5a.12xlarge"
+            },
+            "state": "RUNNING",
+            "num_workers": 1
+        }),
+    ],
+
+    "databricks-azure": [
+        # databricks clusters get --profile AZURE --cluster-name test-cluster
         json.dumps({
+            "cluster_id": "1234-567890-test-cluster",
+            "driver": {
+                "public_dns": "12.34.56.789",
+                "node_id": "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+            },
+            "executors": [{
+                "public_dns": "12.34.56.798",
+                "node_id": "bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb",
+            }
+            ],
+            "node_type_id": "Standard_NC4as_T4_v3",
+            "driver_node_type_id": "Standard_NC4as_T4_v3",
+            "instance_source": {
+                "node_type_id": "Standard_NC4as_T4_v3"
+            },
+            "driver_instance_source": {
+                "node_type_id": "Standard_NC4as_T4_v3"
+            },
+            "state": "RUNNING",
+            "num_workers": 1,
+        }),
+        # az vm list-skus --location westus
+        # This output is not required for the test because we are using a mock
+        # that reads data from the test catalog file instead.
+    ]
+}
+
+
+# the descriptions of the node types are answered by the type found in the command, because the
+# hardware info of the nodes is pulled concurrently
+mock_hw_info = {
+    "dataproc": {
+        # gcloud compute machine-types describe n1-standard-8 --format json --zone us-central1-a
+        "n1-standard-8": json.dumps({
+            "guestCpus": 8,
+            "memoryMb": 30720,
+        }),
+        # gcloud compute accelerator-types describe nvidia-tesla-t4 --format json --zone us-central1-a
+        "nvidia-tesla-t4": json.dumps({
+            "description": "NVIDIA T4",
+        }),
+        # gcloud compute machine-types describe n1-standard-2 --format json --zone us-central1-a
+        "n1-standard-2": json.dumps({
+            "guestCpus": 2,
+            "memoryMb": 7680,
+        }),
+    },
+
+    "emr": {
+        # aws ec2 describe-instance-types --region us-west-2 --instance-types m5a.12xlarge
+        "m5a.12xlarge": json.dumps({
             "InstanceTypes": [{
                 "VCpuInfo": {
                     "DefaultVCpus": 48,
@@ -131,7 +199,7 @@ mock_live_cluster = {
             }]
         }),
         # aws ec2 describe-instance-types --region us-west-2 --instance-types g4dn.12xlarge
-        json.dumps({
+        "g4dn.12xlarge": json.dumps({
             "InstanceTypes": [{
                 "VCpuInfo": {
                     "DefaultVCpus": 48,
@@ -152,35 +220,11 @@ mock_live_cluster = {
                 },
             }]
         }),
-    ],
+    },
 
-    "databricks-aws": [
-        # databricks clusters get --profile DEFAULT --cluster-name test-cluster
-        json.dumps({
-            "cluster_id": "1234-567890-test-cluster",
-            "driver": {
-                "public_dns": "12.34.56.789",
-                "node_id": "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
-            },
-            "executors": [
-                {
-                    "public_dns": "12.34.56.798",
-                    "node_id": "bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb",
-                },
-            ],
-            "node_type_id": "g4dn.12xlarge",
-            "driver_node_type_id": "m5a.12xlarge",
-            "instance_source": {
-                "node_type_id": "g4dn.12xlarge"
-            },
-            "driver_instance_source": {
-                "node_type_id": "m5a.12xlarge"
-            },
-            "state": "RUNNING",
-            "num_workers": 1
-        }),
+    "databricks-aws": {
         # aws ec2 describe-instance-types --region us-west-2 --instance-types m5a.12xlarge
-        json.dumps({
+        "m5a.12xlarge": json.dumps({
             "InstanceTypes": [{
                 "VCpuInfo": {
                     "DefaultVCpus": 48,
@@ -191,7 +235,7 @@ mock_live_cluster = {
             }]
         }),
         # aws ec2 describe-instance-types --region us-west-2 --instance-types g4dn.12xlarge
-        json.dumps({
+        "g4dn.12xlarge": json.dumps({
             "InstanceTypes": [{
                 "VCpuInfo": {
                     "DefaultVCpus": 48,
@@ -211,35 +255,21 @@ mock_live_cluster = {
                     "TotalGpuMemoryInMiB": 65536,
                 },
             }]
-        })
-    ],
-
-    "databricks-azure": [
-        # databricks clusters get --profile AZURE --cluster-name test-cluster
-        json.dumps({
-            "cluster_id": "1234-567890-test-cluster",
-            "driver": {
-                "public_dns": "12.34.56.789",
-                "node_id": "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
-            },
-            "executors": [{
-                "public_dns": "12.34.56.798",
-                "node_id": "bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb",
-            }
-            ],
-            "node_type_id": "Standard_NC4as_T4_v3",
-            "driver_node_type_id": "Standard_NC4as_T4_v3",
-            "instance_source": {
-                "node_type_id": "Standard_NC4as_T4_v3"
-            },
-            "driver_instance_source": {
-                "node_type_id": "Standard_NC4as_T4_v3"
-            },
-            "state": "RUNNING",
-            "num_workers": 1,
         }),
-        # az vm list-skus --location westus
-        # This output is not required for the test because we are using a mock
-        # that reads data from the test catalog file instead.
-    ]
+    },
 }
+
+
+def mock_cluster_cmds(build_mock, cloud: str, cmd_mock) -> None:
+    """
+    Answers the commands built by the patched SysCmd.build. The commands describing a node type are
+    answered from mock_hw_info in any order, and the other commands are run by cmd_mock.
+    """
+    def build_cmd(field_values: dict):
+        cmd = field_values.get('cmd')
+        cmd_args = cmd.split() if isinstance(cmd, str) else ' '.join(cmd).split()
+        for hw_type, hw_info in mock_hw_info.get(cloud, {}).items():
+            if hw_type in cmd_args:
+                return Mock(exec=Mock(return_value=hw_info))
+        return cmd_mock
+    build_mock.side_effect = build_cmd
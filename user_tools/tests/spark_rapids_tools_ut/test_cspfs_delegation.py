@@ -0,0 +1,60 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the delegation of the storagelib filesystems to pyArrow"""
+
+import pytest  # pylint: disable=import-error
+from pyarrow import fs as arrow_fs
+
+from spark_rapids_tools.storagelib import CspFs, LocalFs
+from spark_rapids_tools.storagelib import cspfs as cspfs_module
+from .conftest import SparkRapidsToolsUT
+
+
+class TestCspFsDelegation(SparkRapidsToolsUT):
+    """
+    Class testing the attributes delegated by CspFs to the pyArrow filesystem.
+    """
+
+    def test_delegated_members(self):
+        local_fs = LocalFs()
+        assert isinstance(local_fs.fs, arrow_fs.LocalFileSystem)
+        assert local_fs.type_name == 'local'
+        assert local_fs.get_file_info('/').type == arrow_fs.FileType.Directory
+        assert 'get_file_info' in dir(local_fs)
+        with pytest.raises(AttributeError):
+            _ = local_fs.not_a_member
+        with pytest.raises(AttributeError):
+            # protected members are not delegated
+            _ = local_fs.__reduce_cython__
+
+    def test_members_resolved_once_per_class(self, monkeypatch):
+        # pylint: disable=protected-access
+        monkeypatch.setattr(CspFs, '_delegated_attrs', {})
+        dir_calls = []
+
+        def counting_dir(obj):
+            dir_calls.append(obj)
+            return dir(obj)
+
+        monkeypatch.setattr(cspfs_module, 'dir', counting_dir, raising=False)
+        fs_objs = [LocalFs() for _ in range(3)]
+        for fs_obj in fs_objs:
+            for _ in range(10):
+                assert fs_obj.get_file_info('/').type == arrow_fs.FileType.Directory
+        assert dir_calls == [arrow_fs.LocalFileSystem]
+        assert list(CspFs._delegated_attrs.keys()) == [arrow_fs.LocalFileSystem]
+        # the methods are bound to the instances so that the next accesses skip __getattr__
+        for fs_obj in fs_objs:
+            assert fs_obj.__dict__['get_file_info'].__self__ is fs_obj.fs
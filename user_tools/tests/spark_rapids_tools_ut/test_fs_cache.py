@@ -0,0 +1,139 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the metadata cache of the storagelib"""
+
+import os
+import time
+
+import pytest  # pylint: disable=import-error
+from pyarrow.fs import FileType
+
+from spark_rapids_tools.storagelib import CspPath, LocalFs, default_fs_cache
+from .conftest import SparkRapidsToolsUT
+
+
+class CountingLocalFs(LocalFs):
+    """Local filesystem opting in the metadata cache and counting the calls sent to pyArrow."""
+
+    cache_file_info = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls_cnt = 0
+
+    def get_file_info(self, *args, **kwargs):
+        self.calls_cnt += 1
+        return self.fs.get_file_info(*args, **kwargs)
+
+
+@pytest.fixture(name='counting_fs')
+def fixture_counting_fs():
+    default_fs_cache.configure(ttl_secs=60, max_entries=1000)
+    yield CountingLocalFs()
+    default_fs_cache.clear()
+
+
+def create_eventlogs(root, count: int):
+    os.makedirs(root, exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(root, f'app-{i}'), 'w', encoding='utf-8') as f:
+            f.write('x' * i)
+
+
+class TestFileInfoCache(SparkRapidsToolsUT):
+    """
+    Class testing the shared metadata cache used by the paths.
+    """
+
+    def test_paths_share_file_info(self, counting_fs, tmp_path):
+        create_eventlogs(str(tmp_path), 1)
+        for _ in range(5):
+            csp_path = counting_fs.create_as_path(str(tmp_path / 'app-0'))
+            assert csp_path.is_file()
+        assert counting_fs.calls_cnt == 1
+
+    def test_prefetch_lists_parent_once(self, counting_fs, tmp_path):
+        create_eventlogs(str(tmp_path / 'logs'), 100)
+        csp_paths = [counting_fs.create_as_path(str(tmp_path / 'logs' / f'app-{i}')) for i in range(100)]
+        missing_path = counting_fs.create_as_path(str(tmp_path / 'logs' / 'missing'))
+        CspPath.prefetch_file_infos(csp_paths + [missing_path])
+        assert counting_fs.calls_cnt == 1
+        assert all(csp_path.is_file() for csp_path in csp_paths)
+        assert csp_paths[10].file_info.size == 10
+        assert not missing_path.exists()
+        assert counting_fs.calls_cnt == 1
+
+    def test_writes_invalidate_entries(self, counting_fs, tmp_path):
+        new_dir = counting_fs.create_as_path(str(tmp_path / 'out' / 'sub'))
+        assert not new_dir.exists()
+        new_dir.create_dirs()
+        assert counting_fs.create_as_path(str(tmp_path / 'out' / 'sub')).is_dir()
+        parent_dir = counting_fs.create_as_path(str(tmp_path / 'out'))
+        assert [f_info.base_name for f_info in parent_dir.list_file_infos()] == ['sub']
+        new_file = counting_fs.create_as_path(str(tmp_path / 'out' / 'report.csv'))
+        assert not new_file.exists()
+        with new_file.open_output_stream() as out_stream:
+            out_stream.write(b'data')
+        assert counting_fs.create_as_path(str(new_file)).file_info.size == 4
+        # the listing of the parent is refreshed as well
+        assert sorted(f_info.base_name for f_info in parent_dir.list_file_infos()) == ['report.csv', 'sub']
+
+    def test_recursive_invalidation(self, counting_fs, tmp_path):
+        create_eventlogs(str(tmp_path / 'out' / 'a' / 'b'), 3)
+        counting_fs.create_as_path(str(tmp_path / 'out')).list_file_infos(recursive=True)
+        counting_fs.create_as_path(str(tmp_path / 'other')).exists()
+        counting_fs.create_as_path(str(tmp_path / 'out')).invalidate_file_info(recursive=True)
+        # pylint: disable=protected-access
+        cached_paths = {info_key[1] for info_key in default_fs_cache._infos}
+        assert cached_paths == {str(tmp_path / 'other')}
+        assert not default_fs_cache._listings
+        # the index only keeps the paths that are still cached
+        assert all(paths == {str(tmp_path / 'other')} for paths in default_fs_cache._descendants.values())
+
+    def test_local_fs_is_not_cached(self, tmp_path):
+        default_fs_cache.configure(ttl_secs=60)
+        new_file = str(tmp_path / 'report.csv')
+        assert not LocalFs().create_as_path(new_file).exists()
+        # files written outside the storagelib are visible right away
+        with open(new_file, 'w', encoding='utf-8') as f:
+            f.write('data')
+        assert LocalFs().create_as_path(new_file).exists()
+        # pylint: disable=protected-access
+        assert not default_fs_cache._infos
+
+    def test_entries_expire(self, counting_fs, tmp_path):
+        default_fs_cache.configure(ttl_secs=0.05)
+        create_eventlogs(str(tmp_path), 1)
+        assert counting_fs.create_as_path(str(tmp_path / 'app-0')).is_file()
+        time.sleep(0.1)
+        assert counting_fs.create_as_path(str(tmp_path / 'app-0')).is_file()
+        assert counting_fs.calls_cnt == 2
+
+    def test_cache_is_bounded(self, counting_fs, tmp_path):
+        default_fs_cache.configure(max_entries=10)
+        create_eventlogs(str(tmp_path / 'logs'), 30)
+        counting_fs.create_as_path(str(tmp_path / 'logs')).list_file_infos()
+        # pylint: disable=protected-access
+        assert len(default_fs_cache._infos) == 10
+        # the evicted entries are removed from the index as well
+        cached_paths = {info_key[1] for info_key in default_fs_cache._infos}
+        assert default_fs_cache._descendants[(counting_fs, str(tmp_path / 'logs'))] == cached_paths
+
+    def test_disabled_cache(self, counting_fs, tmp_path):
+        default_fs_cache.configure(ttl_secs=0)
+        create_eventlogs(str(tmp_path), 1)
+        for _ in range(3):
+            assert counting_fs.create_as_path(str(tmp_path / 'app-0')).file_info.type == FileType.File
+        assert counting_fs.calls_cnt == 3
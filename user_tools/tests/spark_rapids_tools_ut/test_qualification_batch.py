@@ -0,0 +1,89 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the qualification batch mode"""
+
+import json
+import os
+
+import pytest  # pylint: disable=import-error
+import yaml
+from pydantic import ValidationError
+
+from spark_rapids_tools.exceptions import InvalidPropertiesSchema
+from spark_rapids_tools.tools.qualification_batch import QualBatchManifest, QualificationBatch
+from .conftest import SparkRapidsToolsUT
+
+
+def write_manifest(tmp_path, manifest: dict) -> str:
+    manifest_file = str(tmp_path / 'manifest.yaml')
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(manifest, f)
+    return manifest_file
+
+
+class TestQualificationBatch(SparkRapidsToolsUT):  # pylint: disable=too-few-public-methods
+    """
+    Class testing the manifest and the execution of the qualification batches.
+    """
+
+    def test_groups_inherit_defaults(self, tmp_path):
+        manifest_file = write_manifest(tmp_path, {
+            'maxParallel': 3,
+            'defaults': {'platform': 'onprem', 'rapidsOptions': {'per-sql': True}},
+            'groups': [
+                {'name': 'tenant-a', 'eventlogs': '/logs/a'},
+                {'name': 'tenant-b', 'eventlogs': '/logs/b', 'platform': 'dataproc', 'targetPlatform': 'dataproc'}
+            ]
+        })
+        manifest = QualBatchManifest.load_from_file(manifest_file)
+        groups = manifest.get_groups()
+        assert manifest.get_max_parallel() == 3
+        assert [g.name for g in groups] == ['tenant-a', 'tenant-b']
+        assert groups[0].platform == 'onprem'
+        assert groups[0].rapids_options == {'per-sql': True}
+        assert groups[1].platform == 'dataproc'
+        assert groups[1].target_platform == 'dataproc'
+
+    @pytest.mark.parametrize('groups', [
+        [{'name': 'a', 'eventLog': '/logs/a'}],
+        [{'eventlogs': '/logs/a'}],
+        [{'name': 'a'}, {'name': 'a'}]
+    ])
+    def test_invalid_groups(self, tmp_path, groups):
+        manifest = QualBatchManifest.load_from_file(write_manifest(tmp_path, {'groups': groups}))
+        with pytest.raises(InvalidPropertiesSchema):
+            manifest.get_groups()
+
+    def test_empty_manifest(self, tmp_path):
+        with pytest.raises(ValidationError):
+            QualBatchManifest.load_from_file(write_manifest(tmp_path, {'groups': []}))
+
+    def test_failed_groups_are_reported(self, tmp_path, capsys):
+        # the groups fail during the validation of the arguments, so no JVM is needed
+        manifest_file = write_manifest(tmp_path, {
+            'maxParallel': 2,
+            'groups': [{'name': f'tenant-{i}', 'platform': 'undefined_platform'} for i in range(3)]
+        })
+        batch = QualificationBatch(manifest_file=manifest_file, output_folder=str(tmp_path / 'out'))
+        summaries = batch.run()
+        assert [s['name'] for s in summaries] == ['tenant-0', 'tenant-1', 'tenant-2']
+        assert all(s['status'] == 'FAILED' for s in summaries)
+        for s in summaries:
+            assert s['outputFolder'] == os.path.join(batch.output_folder, s['name'])
+            assert os.path.exists(os.path.join(s['outputFolder'], 'qualification_console.log'))
+        with open(os.path.join(batch.output_folder, QualificationBatch.summary_file_name), 'r',
+                  encoding='utf-8') as f:
+            assert json.load(f) == summaries
+        assert 'Qualification Batch Summary' in capsys.readouterr().out
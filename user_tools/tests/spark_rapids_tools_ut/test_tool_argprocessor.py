@@ -23,7 +23,7 @@ import pytest  # pylint: disable=import-error
 
 from spark_rapids_tools import CspEnv
 from spark_rapids_tools.cmdli.argprocessor import AbsToolUserArgModel, ArgValueCase
-from spark_rapids_tools.enums import QualFilterApp
+from spark_rapids_tools.enums import QualFilterApp, ToolOutputFormat
 from .conftest import SparkRapidsToolsUT, all_cpu_cluster_props, csp_cpu_cluster_props, csps
 
 
@@ -117,6 +117,16 @@ class TestToolArgProcessor(SparkRapidsToolsUT):  # pylint: disable=too-few-publi
         # for qualification, cost savings should be disabled
         self.validate_args_w_savings_disabled(tool_name, tool_args)
 
+    @pytest.mark.parametrize('tool_name', ['qualification', 'profiling'])
+    @pytest.mark.parametrize('output_format,expected_format', [(None, ToolOutputFormat.CSV),
+                                                               ('parquet', ToolOutputFormat.PARQUET),
+                                                               ('BOTH', ToolOutputFormat.BOTH)])
+    def test_output_format(self, get_ut_data_dir, tool_name, output_format, expected_format):
+        tool_args = AbsToolUserArgModel.create_tool_args(tool_name,
+                                                         eventlogs=f'{get_ut_data_dir}/eventlogs',
+                                                         output_format=output_format)
+        assert tool_args['outputFormat'] == expected_format
+
     @pytest.mark.parametrize('tool_name', ['qualification', 'profiling'])
     @register_triplet_test([ArgValueCase.UNDEFINED, ArgValueCase.VALUE_A, ArgValueCase.VALUE_A])
     @register_triplet_test([ArgValueCase.VALUE_A, ArgValueCase.VALUE_A, ArgValueCase.IGNORE])
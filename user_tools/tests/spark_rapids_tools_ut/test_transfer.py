@@ -0,0 +1,187 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the transfer engine of the storagelib"""
+
+import fnmatch
+import json
+import os
+import threading
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_tools.exceptions import CspTransferError
+from spark_rapids_tools.storagelib import CspFs, LocalFs, LocalPath, TransferEngine, TransferOptions
+from .conftest import SparkRapidsToolsUT
+
+
+class FlakyLocalFs(LocalFs):
+    """Local filesystem failing the first writes of each file."""
+
+    def __init__(self, failures_per_file: int, failing_files: str = '*'):
+        super().__init__()
+        self.failures_per_file = failures_per_file
+        self.failing_files = failing_files
+        self.attempts = {}
+        self.lock = threading.Lock()
+
+    def open_output_stream(self, path, *args, **kwargs):
+        if not fnmatch.fnmatch(os.path.basename(path), self.failing_files):
+            return self.fs.open_output_stream(path, *args, **kwargs)
+        with self.lock:
+            self.attempts[path] = self.attempts.get(path, 0) + 1
+            if self.attempts[path] <= self.failures_per_file:
+                raise OSError(f'Injected failure writing {path}')
+        return self.fs.open_output_stream(path, *args, **kwargs)
+
+
+def create_tree(root: str, small_files: int = 50, large_size: int = 3 << 20):
+    for i in range(small_files):
+        file_path = os.path.join(root, f'app-{i % 5}', f'report-{i}.csv')
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(f'row,{i}\n' * (i + 1))
+    with open(os.path.join(root, 'large.bin'), 'wb') as f:
+        f.write(os.urandom(large_size))
+    with open(os.path.join(root, 'scratch.tmp'), 'w', encoding='utf-8') as f:
+        f.write('tmp')
+
+
+def read_tree(root: str) -> dict:
+    res = {}
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            file_path = os.path.join(dir_path, file_name)
+            with open(file_path, 'rb') as f:
+                res[os.path.relpath(file_path, root)] = f.read()
+    return res
+
+
+class TestTransferEngine(SparkRapidsToolsUT):
+    """
+    Class testing copying trees with the transfer engine.
+    """
+
+    def test_copy_tree(self, tmp_path):
+        create_tree(str(tmp_path / 'output'))
+        options = TransferOptions(max_workers=4, chunk_size=64 << 10, small_files_batch_size=8)
+        stats = CspFs.copy_resources(LocalPath(str(tmp_path / 'output')), LocalPath(str(tmp_path / 'dest')),
+                                     options=options)
+        assert read_tree(str(tmp_path / 'dest' / 'output')) == read_tree(str(tmp_path / 'output'))
+        assert stats.files_total == stats.files_copied == 52
+        assert stats.files_skipped == 0 and not stats.failed_files
+        assert stats.bytes_copied == sum(len(v) for v in read_tree(str(tmp_path / 'output')).values())
+        assert stats.throughput_mbps > 0
+        assert '52 files copied' in str(stats)
+
+    def test_small_files_are_batched(self, tmp_path):
+        create_tree(str(tmp_path / 'output'), small_files=20)
+        engine = TransferEngine(TransferOptions(small_files_batch_size=8))
+        files = [(LocalPath(str(tmp_path / 'output' / 'large.bin')).file_info, 'large')]
+        files.extend((LocalPath(str(tmp_path / 'output' / 'app-0' / f'report-{i}.csv')).file_info, f'{i}')
+                     for i in range(0, 20, 5))
+        files.extend([(LocalPath(str(tmp_path / 'output' / 'scratch.tmp')).file_info, 'tmp')] * 10)
+        # pylint: disable=protected-access
+        batches = engine._build_batches(files)
+        assert [len(batch) for batch in batches] == [1, 8, 6]
+
+    def test_resume_skips_unchanged_files(self, tmp_path):
+        create_tree(str(tmp_path / 'output'))
+        src, dest = LocalPath(str(tmp_path / 'output')), LocalPath(str(tmp_path / 'dest'))
+        CspFs.copy_resources(src, dest)
+        # by default, all the files are copied again
+        stats = CspFs.copy_resources(src, dest)
+        assert stats.files_copied == 52
+        with open(tmp_path / 'output' / 'app-1' / 'report-1.csv', 'a', encoding='utf-8') as f:
+            f.write('new row\n')
+        stats = CspFs.copy_resources(src, dest, options=TransferOptions(resume=True))
+        assert stats.files_copied == 1
+        assert stats.files_skipped == 51
+        assert read_tree(str(tmp_path / 'dest' / 'output')) == read_tree(str(tmp_path / 'output'))
+
+    def test_failed_files_are_retried(self, tmp_path):
+        create_tree(str(tmp_path / 'output'), small_files=10)
+        flaky_fs = FlakyLocalFs(failures_per_file=2)
+        dest = flaky_fs.create_as_path(str(tmp_path / 'dest'))
+        stats = CspFs.copy_resources(LocalPath(str(tmp_path / 'output')), dest,
+                                     options=TransferOptions(retry_delay_secs=0.001))
+        assert stats.files_copied == 12
+        assert stats.retries == 24
+        assert read_tree(str(tmp_path / 'dest' / 'output')) == read_tree(str(tmp_path / 'output'))
+
+    def test_failures_after_retries(self, tmp_path):
+        create_tree(str(tmp_path / 'output'), small_files=3)
+        dest = FlakyLocalFs(failures_per_file=10).create_as_path(str(tmp_path / 'dest'))
+        with pytest.raises(CspTransferError) as err:
+            CspFs.copy_resources(LocalPath(str(tmp_path / 'output')), dest,
+                                 options=TransferOptions(max_retries=1, retry_delay_secs=0.001))
+        assert len(err.value.failed_files) == 5
+
+    def test_copy_file_with_exclude_pattern(self, tmp_path):
+        create_tree(str(tmp_path / 'output'), small_files=5)
+        stats = CspFs.copy_resources(LocalPath(str(tmp_path / 'output')), LocalPath(str(tmp_path / 'dest')),
+                                     options=TransferOptions(exclude_pattern='*.tmp'))
+        assert stats.files_total == 6
+        assert not os.path.exists(tmp_path / 'dest' / 'output' / 'scratch.tmp')
+        CspFs.copy_resources(LocalPath(str(tmp_path / 'output' / 'large.bin')), LocalPath(str(tmp_path / 'single')))
+        assert os.path.getsize(tmp_path / 'single' / 'large.bin') == os.path.getsize(tmp_path / 'output' / 'large.bin')
+
+    def test_sync_copies_changed_files(self, tmp_path):
+        create_tree(str(tmp_path / 'output'))
+        src, dest = LocalPath(str(tmp_path / 'output')), LocalPath(str(tmp_path / 'dest'))
+        options = TransferOptions(exclude_pattern='*.tmp')
+        stats = CspFs.sync_resources(src, dest, options=options)
+        assert stats.files_copied == 51
+        manifest_path = tmp_path / 'dest' / 'output' / options.manifest_name
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        assert len(manifest['files']) == 51
+        assert manifest['files']['app-0/report-0.csv']['size'] == len('row,0\n')
+        # rewrite a file with the same content and change another one with the same size
+        with open(tmp_path / 'output' / 'app-2' / 'report-2.csv', 'w', encoding='utf-8') as f:
+            f.write('row,2\n' * 3)
+        with open(tmp_path / 'output' / 'app-3' / 'report-3.csv', 'w', encoding='utf-8') as f:
+            f.write('row,X\n' * 4)
+        os.remove(tmp_path / 'dest' / 'output' / 'app-4' / 'report-4.csv')
+        stats = CspFs.sync_resources(src, dest, options=options)
+        assert stats.files_copied == 2
+        assert stats.files_skipped == 49
+        expected = read_tree(str(tmp_path / 'output'))
+        del expected['scratch.tmp']
+        actual = read_tree(str(tmp_path / 'dest' / 'output'))
+        del actual[options.manifest_name]
+        assert actual == expected
+
+    def test_sync_retries_failed_files_on_next_run(self, tmp_path):
+        create_tree(str(tmp_path / 'output'), small_files=3)
+        src = LocalPath(str(tmp_path / 'output'))
+        dest = FlakyLocalFs(failures_per_file=10, failing_files='report-*').create_as_path(str(tmp_path / 'dest'))
+        with pytest.raises(CspTransferError) as err:
+            CspFs.sync_resources(src, dest, options=TransferOptions(max_retries=0))
+        assert len(err.value.failed_files) == 3
+        stats = CspFs.sync_resources(src, LocalPath(str(tmp_path / 'dest')))
+        assert stats.files_copied == 3
+        assert stats.files_skipped == 2
+
+    def test_sync_resumes_files_missing_from_manifest(self, tmp_path):
+        create_tree(str(tmp_path / 'output'), small_files=3)
+        src, dest = LocalPath(str(tmp_path / 'output')), LocalPath(str(tmp_path / 'dest'))
+        CspFs.copy_resources(src, dest)
+        # the files uploaded by the copy are not in a manifest yet
+        stats = CspFs.sync_resources(src, dest)
+        assert stats.files_copied == 5
+        os.remove(tmp_path / 'dest' / 'output' / TransferOptions.manifest_name)
+        stats = CspFs.sync_resources(src, dest, options=TransferOptions(resume=True))
+        assert stats.files_copied == 0
+        assert stats.files_skipped == 5
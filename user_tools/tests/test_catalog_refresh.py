@@ -0,0 +1,209 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test refreshing the pricing catalogs with conditional requests."""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.prop_manager import JSONPropertiesContainer
+from spark_rapids_pytools.common.sys_storage import FSUtil
+from spark_rapids_pytools.pricing.price_provider import PriceProvider
+
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    """Serves the catalogs defined by the server and honors If-None-Match."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('If-None-Match')))
+        content = server.catalogs.get(self.path)
+        if content is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{hash(content)}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        # delay the response to detect sequential downloads
+        time.sleep(server.delay_secs)
+        body = content.encode('utf-8')
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(name='catalog_server')
+def fixture_catalog_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CatalogRequestHandler)
+    server.catalogs = {}
+    server.requests = []
+    server.delay_secs = 0
+    server.lock = threading.Lock()
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    server.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def expire_cache_file(cache_file: str, age_secs: int):
+    old_time = time.time() - age_secs
+    os.utime(cache_file, times=(old_time, old_time))
+    url_meta = FSUtil.load_url_metadata(cache_file)
+    url_meta['checkedAt'] = old_time
+    FSUtil._save_url_metadata(cache_file, url_meta)  # pylint: disable=protected-access
+
+
+class TestConditionalDownload:
+    """Test downloading a resource only when it changes."""
+
+    def test_unchanged_resource_not_downloaded(self, catalog_server, tmp_path):
+        catalog_server.catalogs['/catalog.json'] = '{"price": 1}'
+        src_url = f'{catalog_server.base_url}/catalog.json'
+        cache_file = str(tmp_path / 'catalog.json')
+        file_checks = {'cacheExpirationSecs': 60}
+        assert FSUtil.cache_from_url_conditional(src_url, cache_file, file_checks)
+        # the file is not expired, so no request is sent
+        assert not FSUtil.cache_from_url_conditional(src_url, cache_file, file_checks)
+        assert len(catalog_server.requests) == 1
+        # the file is expired, so it is revalidated
+        expire_cache_file(cache_file, 120)
+        catalog_mtime = os.path.getmtime(cache_file)
+        assert not FSUtil.cache_from_url_conditional(src_url, cache_file, file_checks)
+        assert len(catalog_server.requests) == 2
+        assert catalog_server.requests[-1][1] is not None
+        # the content is kept as is
+        assert os.path.getmtime(cache_file) == catalog_mtime
+        assert FSUtil.get_last_validation_time(cache_file) > catalog_mtime
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            assert f.read() == '{"price": 1}'
+
+    def test_changed_resource_downloaded(self, catalog_server, tmp_path):
+        catalog_server.catalogs['/catalog.json'] = '{"price": 1}'
+        src_url = f'{catalog_server.base_url}/catalog.json'
+        cache_file = str(tmp_path / 'catalog.json')
+        file_checks = {'cacheExpirationSecs': 60}
+        FSUtil.cache_from_url_conditional(src_url, cache_file, file_checks)
+        catalog_server.catalogs['/catalog.json'] = '{"price": 2}'
+        expire_cache_file(cache_file, 120)
+        assert FSUtil.cache_from_url_conditional(src_url, cache_file, file_checks)
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            assert f.read() == '{"price": 2}'
+
+    def test_failed_download_keeps_cache(self, catalog_server, tmp_path):
+        catalog_server.catalogs['/catalog.json'] = '{"price": 1}'
+        src_url = f'{catalog_server.base_url}/catalog.json'
+        cache_file = str(tmp_path / 'catalog.json')
+        FSUtil.cache_from_url_conditional(src_url, cache_file, {'cacheExpirationSecs': 60})
+        del catalog_server.catalogs['/catalog.json']
+        expire_cache_file(cache_file, 120)
+        with pytest.raises(RuntimeError):
+            FSUtil.cache_from_url_conditional(src_url, cache_file, {'cacheExpirationSecs': 60})
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            assert f.read() == '{"price": 1}'
+        # no partial download is left behind
+        assert sorted(os.listdir(tmp_path)) == ['catalog.json', 'catalog.json.meta.json']
+
+    def test_metadata_not_torn_by_failed_write(self, catalog_server, tmp_path, monkeypatch):
+        catalog_server.catalogs['/catalog.json'] = '{"price": 1}'
+        cache_file = str(tmp_path / 'catalog.json')
+        FSUtil.cache_from_url_conditional(f'{catalog_server.base_url}/catalog.json', cache_file,
+                                          {'cacheExpirationSecs': 60})
+        url_meta = FSUtil.load_url_metadata(cache_file)
+
+        def failing_dump(obj, fp, **kwargs):
+            fp.write('{"checkedAt": ')
+            raise OSError('No space left on device')
+        monkeypatch.setattr(json, 'dump', failing_dump)
+        with pytest.raises(OSError):
+            FSUtil._save_url_metadata(cache_file, {'checkedAt': 0})  # pylint: disable=protected-access
+        monkeypatch.undo()
+        # the previous metadata is kept as a whole
+        assert FSUtil.load_url_metadata(cache_file) == url_meta
+
+
+@dataclass
+class MockPriceProvider(PriceProvider):
+    """A price provider downloading its catalogs from the local server."""
+    name = 'Mock'
+    base_url: str = None
+
+    def _process_resource_configs(self):
+        for online_entry in self.pricing_configs['mock'].get_value('catalog', 'onlineResources'):
+            file_key = online_entry.get('resourceKey')
+            self.cache_files[file_key] = FSUtil.build_path(self.cache_directory, online_entry.get('localFile'))
+            self.resource_urls[file_key] = f'{self.base_url}/{online_entry.get("localFile")}'
+
+
+class TestPriceProviderRefresh:
+    """Test refreshing the catalogs of a price provider."""
+
+    @staticmethod
+    def create_provider(catalog_server, catalogs_cnt: int, expiration_secs: int = None) -> MockPriceProvider:
+        catalog_conf = {
+            'onlineResources': [
+                {'resourceKey': f'catalog-{i}', 'localFile': f'catalog_{i}.json'} for i in range(catalogs_cnt)
+            ]
+        }
+        if expiration_secs is not None:
+            catalog_conf['cacheExpirationSecs'] = expiration_secs
+        pricing_config = JSONPropertiesContainer(prop_arg={'catalog': catalog_conf}, file_load=False)
+        return MockPriceProvider(region='us-west-2',
+                                 pricing_configs={'mock': pricing_config},
+                                 base_url=catalog_server.base_url)
+
+    def test_concurrent_downloads(self, catalog_server, tmp_path, monkeypatch):
+        monkeypatch.setenv('RAPIDS_USER_TOOLS_CACHE_FOLDER', str(tmp_path))
+        catalogs_cnt = 4
+        catalog_server.delay_secs = 0.5
+        for i in range(catalogs_cnt):
+            catalog_server.catalogs[f'/catalog_{i}.json'] = f'{{"id": {i}}}'
+        start_time = time.monotonic()
+        provider = self.create_provider(catalog_server, catalogs_cnt)
+        elapsed_time = time.monotonic() - start_time
+        assert len(catalog_server.requests) == catalogs_cnt
+        # sequential downloads would take catalogs_cnt * delay_secs
+        assert elapsed_time < catalogs_cnt * catalog_server.delay_secs
+        for i in range(catalogs_cnt):
+            with open(provider.cache_files[f'catalog-{i}'], 'r', encoding='utf-8') as f:
+                assert f.read() == f'{{"id": {i}}}'
+
+    def test_expiration_from_configs(self, catalog_server, tmp_path, monkeypatch):
+        monkeypatch.setenv('RAPIDS_USER_TOOLS_CACHE_FOLDER', str(tmp_path))
+        catalog_server.catalogs['/catalog_0.json'] = '{"id": 0}'
+        provider = self.create_provider(catalog_server, 1, expiration_secs=60)
+        assert provider.cache_expiration_secs == 60
+        expire_cache_file(provider.cache_files['catalog-0'], 30)
+        self.create_provider(catalog_server, 1, expiration_secs=60)
+        assert len(catalog_server.requests) == 1
+        expire_cache_file(provider.cache_files['catalog-0'], 90)
+        self.create_provider(catalog_server, 1, expiration_secs=60)
+        # a single conditional request answered with 304
+        assert len(catalog_server.requests) == 2
+        assert catalog_server.requests[-1][1] is not None
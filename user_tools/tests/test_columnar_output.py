@@ -0,0 +1,120 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test writing the summaries of the tools as parquet files."""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_tools import CspEnv
+from spark_rapids_tools.enums import ToolOutputFormat
+from spark_rapids_pytools.common.columnar import df_to_arrow_table
+from spark_rapids_pytools.common.utilities import Utils
+from spark_rapids_pytools.rapids.profiling import Profiling
+from spark_rapids_pytools.rapids.qualification import Qualification
+
+from .benchmarks.conftest import MockLocalToolContext
+from .test_profiling_recommendations import write_app_logs
+from .test_qualification import MockCluster, gen_apps_df
+
+
+def gen_qualification_tool(output_folder: str, output_format: ToolOutputFormat) -> Qualification:
+    tool = Qualification(platform_type=CspEnv.DATAPROC)
+    tool.ctxt = MockLocalToolContext(prop_arg=Utils.resource_path('qualification-conf.yaml'),
+                                     output_folder=output_folder)
+    tool.ctxt.wrapper_ctxt.update({
+        'cpuClusterProxy': MockCluster(workers_cnt=8),
+        'gpuClusterProxy': MockCluster(workers_cnt=4),
+        'enableSavingsCalculations': True,
+        'outputFormat': output_format,
+        'cpu_discount': 15,
+        'gpu_discount': 30
+    })
+    return tool
+
+
+def write_rapids_summary(output_folder, apps_df: pd.DataFrame) -> str:
+    rapids_output_dir = output_folder / 'rapids_4_spark_qualification_output'
+    rapids_output_dir.mkdir()
+    rapids_summary_file = rapids_output_dir / 'rapids_4_spark_qualification_output.csv'
+    apps_df.rename(columns={'Speedup Based Recommendation': 'Recommendation'}).to_csv(rapids_summary_file,
+                                                                                    index=False)
+    return str(rapids_summary_file)
+
+
+class TestColumnarOutput:
+    """Test the schema of the parquet files and the output formats of the tools."""
+
+    def test_stable_schema(self):
+        schema_conf = {'App ID': 'string', 'App Duration': 'double', 'Recommended Cluster Shape': 'int64'}
+        apps_df = pd.DataFrame({'Extra Column': [True, False],
+                                'App Duration': [10, 20],
+                                'App ID': ['app-1', 'app-2']})
+        table = df_to_arrow_table(apps_df, schema_conf)
+        assert table.schema == pa.schema([('App ID', pa.string()),
+                                          ('App Duration', pa.float64()),
+                                          ('Recommended Cluster Shape', pa.int64()),
+                                          ('Extra Column', pa.bool_())])
+        assert table.column('Recommended Cluster Shape').null_count == 2
+
+    @pytest.mark.parametrize('output_format', [ToolOutputFormat.CSV, ToolOutputFormat.PARQUET, ToolOutputFormat.BOTH])
+    def test_qualification_output_format(self, tmp_path, output_format):
+        write_rapids_summary(tmp_path, gen_apps_df(50).drop(columns=['Recommended Cluster Shape']))
+        tool = gen_qualification_tool(str(tmp_path), output_format)
+        tool._process_output()  # pylint: disable=protected-access
+        csv_file = tmp_path / 'qualification_summary.csv'
+        parquet_file = tmp_path / 'qualification_summary.parquet'
+        assert csv_file.exists() == output_format.writes_csv()
+        assert parquet_file.exists() == output_format.writes_parquet()
+        report_content = Utils.gen_multiline_str(tool.ctxt.get_ctxt('wrapperOutputContent'))
+        assert ('Parquet report' in report_content) == output_format.writes_parquet()
+        if output_format.writes_parquet():
+            schema_conf = tool.ctxt.get_value('local', 'output', 'columnarSchema')
+            summary_table = pq.read_table(parquet_file)
+            assert summary_table.schema.names == list(schema_conf)
+            assert summary_table.schema.field('Estimated Job Frequency (monthly)').type == pa.int64()
+            assert summary_table.num_rows == 50
+
+    def test_qualification_reads_columnar_summary(self, tmp_path, monkeypatch):
+        apps_df = gen_apps_df(20).drop(columns=['Recommended Cluster Shape'])
+        rapids_summary_file = write_rapids_summary(tmp_path, apps_df)
+        apps_df.rename(columns={'Speedup Based Recommendation': 'Recommendation'}).to_parquet(
+            os.path.splitext(rapids_summary_file)[0] + '.parquet')
+
+        def fail_read_csv(*args, **kwargs):
+            raise AssertionError('The CSV summary is read instead of the parquet summary')
+        monkeypatch.setattr(pd, 'read_csv', fail_read_csv)
+        tool = gen_qualification_tool(str(tmp_path), ToolOutputFormat.CSV)
+        tool._process_output()  # pylint: disable=protected-access
+        assert (tmp_path / 'qualification_summary.csv').exists()
+
+    def test_profiling_parquet_output(self, tmp_path):
+        rapids_output_dir = tmp_path / 'rapids_4_spark_profile'
+        rapids_output_dir.mkdir()
+        write_app_logs(rapids_output_dir, 3)
+        tool = Profiling(platform_type=CspEnv.ONPREM)
+        tool.ctxt = MockLocalToolContext(prop_arg=Utils.resource_path('profiling-conf.yaml'),
+                                         output_folder=str(tmp_path))
+        tool.ctxt.set_ctxt('outputFormat', ToolOutputFormat.PARQUET)
+        tool._Profiling__generate_report_with_recommendations()  # pylint: disable=protected-access
+        assert not (tmp_path / 'profiling_summary.log').exists()
+        summary_table = pq.read_table(tmp_path / 'profiling_summary.parquet')
+        assert summary_table.schema.field('Recommendations').type == pa.list_(pa.string())
+        app_comments = dict(zip(summary_table.column('App ID').to_pylist(),
+                                summary_table.column('Comments').to_pylist()))
+        assert sorted(app_comments) == ['app-0000', 'app-0001', 'app-0002']
+        assert app_comments['app-0001'] == ["- 'spark.executor.instances' was not set.", '- comment of app 1']
@@ -0,0 +1,139 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the in-process storage driver using the local filesystem as the remote storage."""
+
+import os
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.cloud_api.cspfsstorage import CspFsStorageDriver
+from spark_rapids_pytools.cloud_api.sp_types import get_platform
+from spark_rapids_pytools.common.exceptions import StorageException
+from spark_rapids_pytools.common.sys_storage import StorageDriver
+from spark_rapids_tools import CspEnv
+
+
+class CheckedDriver(StorageDriver):
+    """The fallback driver must not be called for the paths handled in-process."""
+
+    @classmethod
+    def _check_path(cls, src: str):
+        if src.startswith('file://'):
+            raise AssertionError(f'Unexpected call to the fallback driver for {src}')
+
+    def resource_exists(self, src) -> bool:
+        self._check_path(src)
+        return super().resource_exists(src)
+
+    def resource_is_dir(self, src) -> bool:
+        self._check_path(src)
+        return super().resource_is_dir(src)
+
+
+def write_file(file_path, content: str = 'data'):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+@pytest.fixture(name='remote_root')
+def fixture_remote_root(tmp_path):
+    root = tmp_path / 'remote'
+    write_file(str(root / 'logs' / 'app-1'), 'app-1')
+    write_file(str(root / 'logs' / 'nested' / 'app-2'), 'app-2')
+    write_file(str(root / 'logs' / 'app-3.tmp'), 'tmp')
+    return root
+
+
+@pytest.fixture(name='storage')
+def fixture_storage():
+    # treat the file:// urls as remote storage
+    return CspFsStorageDriver(fallback=CheckedDriver(), remote_prefixes=('file://',))
+
+
+class TestCspFsStorageDriver:
+    """Test the storage operations executed in-process."""
+
+    def test_exists_and_is_dir(self, storage, remote_root):
+        assert storage.resource_exists(f'file://{remote_root}/logs/')
+        assert storage.resource_is_dir(f'file://{remote_root}/logs/')
+        assert storage.resource_exists(f'file://{remote_root}/logs/app-1')
+        assert not storage.resource_is_dir(f'file://{remote_root}/logs/app-1')
+        assert not storage.resource_exists(f'file://{remote_root}/missing')
+        assert storage.is_file_path(f'file://{remote_root}/missing')
+
+    def test_download_dir_and_file(self, storage, remote_root, tmp_path):
+        dest = str(tmp_path / 'local')
+        res = storage.download_resource(f'file://{remote_root}/logs', dest)
+        assert res == os.path.join(dest, 'logs')
+        assert sorted(os.listdir(res)) == ['app-1', 'app-3.tmp', 'nested']
+        with open(os.path.join(res, 'nested', 'app-2'), 'r', encoding='utf-8') as f:
+            assert f.read() == 'app-2'
+        res = storage.download_resource(f'file://{remote_root}/logs/app-1', dest)
+        assert res == os.path.join(dest, 'app-1') and os.path.isfile(res)
+
+    def test_download_missing_resource(self, storage, remote_root, tmp_path):
+        with pytest.raises(StorageException):
+            storage.download_resource(f'file://{remote_root}/missing', str(tmp_path / 'local'))
+        assert storage.download_resource(f'file://{remote_root}/missing', str(tmp_path / 'local'),
+                                         fail_ok=True) is None
+
+    def test_upload_with_exclude_pattern(self, storage, remote_root, tmp_path):
+        local_folder = tmp_path / 'output'
+        write_file(str(local_folder / 'summary.csv'))
+        write_file(str(local_folder / 'raw' / 'app.csv'))
+        write_file(str(local_folder / 'raw' / 'work.tmp'))
+        remote_dest = f'file://{remote_root}/uploads'
+        storage.upload_resource(str(local_folder), remote_dest, exclude_pattern='*.tmp')
+        uploaded = remote_root / 'uploads' / 'output'
+        assert sorted(os.listdir(uploaded)) == ['raw', 'summary.csv']
+        assert os.listdir(uploaded / 'raw') == ['app.csv']
+
+    def test_sync_skips_unchanged_files(self, storage, remote_root, tmp_path):
+        local_folder = tmp_path / 'output'
+        write_file(str(local_folder / 'summary.csv'), 'summary')
+        write_file(str(local_folder / 'raw' / 'app.csv'), 'app')
+        remote_dest = f'file://{remote_root}/uploads'
+        res = storage.sync_resource(str(local_folder), remote_dest)
+        assert res == f'{remote_dest}/output'
+        synced_file = remote_root / 'uploads' / 'output' / 'raw' / 'app.csv'
+        os.utime(synced_file, (0, 0))
+        write_file(str(local_folder / 'summary.csv'), 'updated summary')
+        storage.sync_resource(str(local_folder), remote_dest)
+        # the unchanged file is not written again
+        assert os.path.getmtime(synced_file) == 0
+        with open(remote_root / 'uploads' / 'output' / 'summary.csv', 'r', encoding='utf-8') as f:
+            assert f.read() == 'updated summary'
+
+    def test_remove_resource(self, storage, remote_root):
+        storage.remove_resource(f'file://{remote_root}/logs/app-1')
+        assert not os.path.exists(remote_root / 'logs' / 'app-1')
+        storage.remove_resource(f'file://{remote_root}/logs')
+        assert not os.path.exists(remote_root / 'logs')
+
+    def test_local_paths_use_fallback(self, tmp_path):
+        storage = CspFsStorageDriver(fallback=StorageDriver())
+        write_file(str(tmp_path / 'file'))
+        assert storage.resource_exists(str(tmp_path / 'file'))
+        assert storage.resource_is_dir(str(tmp_path))
+
+    @pytest.mark.parametrize('storage_backend,expected_driver', [('cspfs', CspFsStorageDriver), ('cli', None)])
+    def test_backend_selected_by_env(self, monkeypatch, storage_backend, expected_driver):
+        monkeypatch.setenv('RAPIDS_USER_TOOLS_STORAGE_BACKEND', storage_backend)
+        platform = get_platform(CspEnv.ONPREM)({'deployMode': 'LOCAL'})
+        if expected_driver is None:
+            assert not isinstance(platform.storage, CspFsStorageDriver)
+        else:
+            assert isinstance(platform.storage, expected_driver)
+            assert not isinstance(platform.storage.fallback, CspFsStorageDriver)
@@ -0,0 +1,131 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the store of the verified dependencies."""
+
+import hashlib
+import os
+import tarfile
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.sys_storage import FileVerifier, FSUtil
+from spark_rapids_pytools.rapids.dependency_cache import DependencyCache
+
+
+@pytest.fixture(name='cache_folder')
+def fixture_cache_folder(tmp_path):
+    """Creates a cache folder holding a downloaded archive and a jar."""
+    cache_folder = tmp_path / 'cache'
+    spark_dir = tmp_path / 'spark-3.3.3-bin-hadoop3' / 'jars'
+    os.makedirs(spark_dir)
+    with open(spark_dir / 'spark-core.jar', 'wb') as f:
+        f.write(b'spark-core')
+    os.makedirs(cache_folder)
+    with tarfile.open(cache_folder / 'spark-3.3.3-bin-hadoop3.tgz', 'w:gz') as tar:
+        tar.add(tmp_path / 'spark-3.3.3-bin-hadoop3', arcname='spark-3.3.3-bin-hadoop3')
+    with open(cache_folder / 'hadoop-aws.jar', 'wb') as f:
+        f.write(b'hadoop-aws')
+    return cache_folder
+
+
+def build_dep(file_path, dep_type: str) -> dict:
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    return {
+        'name': os.path.basename(file_path),
+        'uri': f'https://archive.apache.org/dist/{os.path.basename(file_path)}',
+        'type': dep_type,
+        'size': len(content),
+        'sha512': hashlib.sha512(content).hexdigest()
+    }
+
+
+class TestDependencyCache:
+    """Test verifying, extracting and linking the dependencies through the store."""
+
+    @pytest.fixture(autouse=True)
+    def count_verifications(self, monkeypatch):
+        self.verifications = []  # pylint: disable=attribute-defined-outside-init
+        orig_check = FileVerifier.check_integrity.__func__
+        monkeypatch.setattr(FileVerifier, 'get_signature_file', classmethod(lambda cls, url, dest: None))
+        monkeypatch.setattr(FSUtil, 'fast_download_url',
+                            classmethod(lambda cls, *args, **kwargs: pytest.fail('Unexpected download')))
+
+        def check_integrity(cls, file_path, check_args):
+            self.verifications.append(file_path)
+            return orig_check(cls, file_path, check_args)
+        monkeypatch.setattr(FileVerifier, 'check_integrity', classmethod(check_integrity))
+
+    def test_archive_extracted_once(self, tmp_path, cache_folder):
+        dep = build_dep(cache_folder / 'spark-3.3.3-bin-hadoop3.tgz', 'archive')
+        dep['relativePath'] = 'jars/*'
+        for run_ind in range(2):
+            work_dir = str(tmp_path / f'run-{run_ind}')
+            os.makedirs(work_dir)
+            dep_item = DependencyCache(str(cache_folder)).fetch_dependency(dep, work_dir)
+            assert dep_item == os.path.join(work_dir, 'spark-3.3.3-bin-hadoop3', 'jars/*')
+            with open(os.path.join(work_dir, 'spark-3.3.3-bin-hadoop3', 'jars', 'spark-core.jar'), 'rb') as f:
+                assert f.read() == b'spark-core'
+        # the archive is verified and extracted by the first run only
+        assert len(self.verifications) == 1
+        assert len(os.listdir(cache_folder / 'extracted')) == 1
+
+    def test_jar_is_linked(self, tmp_path, cache_folder):
+        dep = build_dep(cache_folder / 'hadoop-aws.jar', 'jar')
+        dep_item = DependencyCache(str(cache_folder)).fetch_dependency(dep, str(tmp_path))
+        assert dep_item == str(tmp_path / 'hadoop-aws.jar')
+        assert os.path.samefile(dep_item, cache_folder / 'hadoop-aws.jar')
+        # removing the work directory keeps the cached file
+        FSUtil.remove_path(dep_item)
+        assert os.path.exists(cache_folder / 'hadoop-aws.jar')
+
+    def test_modified_file_is_verified_again(self, tmp_path, cache_folder):
+        dep = build_dep(cache_folder / 'hadoop-aws.jar', 'jar')
+        dependency_cache = DependencyCache(str(cache_folder))
+        dependency_cache.fetch_dependency(dep, str(tmp_path))
+        dependency_cache.fetch_dependency(dep, str(tmp_path))
+        assert len(self.verifications) == 1
+        os.utime(cache_folder / 'hadoop-aws.jar', ns=(0, 0))
+        dependency_cache.fetch_dependency(dep, str(tmp_path))
+        assert len(self.verifications) == 2
+
+    def test_concurrent_extraction(self, tmp_path, cache_folder, monkeypatch):
+        dep = build_dep(cache_folder / 'spark-3.3.3-bin-hadoop3.tgz', 'archive')
+        orig_extract = DependencyCache._extract_members.__func__  # pylint: disable=protected-access
+
+        def extract_with_concurrent_run(cls, resource_file, dest_dir):
+            orig_extract(cls, resource_file, dest_dir)
+            # another run completes the extraction of the same archive meanwhile
+            orig_extract(cls, resource_file, dest_dir.rsplit('.', 2)[0])
+        monkeypatch.setattr(DependencyCache, '_extract_members', classmethod(extract_with_concurrent_run))
+        dep_item = DependencyCache(str(cache_folder)).fetch_dependency(dep, str(tmp_path))
+        assert os.path.isdir(dep_item)
+        # the directory of the other run is used and no temporary directory is left behind
+        assert len(os.listdir(cache_folder / 'extracted')) == 1
+
+    @pytest.mark.parametrize('with_filters', [True, False])
+    def test_unsafe_archive_rejected(self, tmp_path, cache_folder, monkeypatch, with_filters):
+        if not with_filters:
+            monkeypatch.delattr(tarfile, 'data_filter', raising=False)
+        elif not hasattr(tarfile, 'data_filter'):
+            pytest.skip('The extraction filters are not available')
+        with open(tmp_path / 'payload', 'wb') as f:
+            f.write(b'payload')
+        with tarfile.open(cache_folder / 'unsafe.tgz', 'w:gz') as tar:
+            tar.add(tmp_path / 'payload', arcname='../escaped')
+        dep = build_dep(cache_folder / 'unsafe.tgz', 'archive')
+        with pytest.raises((RuntimeError, tarfile.TarError)):
+            DependencyCache(str(cache_folder)).fetch_dependency(dep, str(tmp_path / 'work'))
+        assert not os.path.exists(cache_folder / 'escaped')
+        assert not os.listdir(cache_folder / 'extracted')
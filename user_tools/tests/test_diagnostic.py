@@ -23,7 +23,7 @@ from cli_test_helpers import ArgvContext, EnvironContext  # pylint: disable=impo
 
 from spark_rapids_pytools import wrapper
 from .spark_rapids_tools_ut import conftest
-from .mock_cluster import mock_live_cluster
+from .mock_cluster import mock_live_cluster, mock_cluster_cmds
 
 
 @pytest.mark.parametrize('cloud', ['dataproc', 'emr', 'databricks-aws', 'databricks-azure'])
@@ -63,7 +63,7 @@ class TestInfoCollect:
 
         mock = Mock()
         mock.exec = Mock(side_effect=return_values)
-        build_mock.return_value = mock
+        mock_cluster_cmds(build_mock, cloud, mock)
 
         self.run_tool(cloud)
 
@@ -87,7 +87,7 @@ class TestInfoCollect:
 
         mock = Mock()
         mock.exec = Mock(side_effect=return_values)
-        build_mock.return_value = mock
+        mock_cluster_cmds(build_mock, cloud, mock)
 
         self.run_tool(cloud, ['--thread_num', '7', '--yes', '--verbose'])
 
@@ -114,7 +114,7 @@ class TestInfoCollect:
 
         mock = Mock()
         mock.exec = Mock(side_effect=return_values)
-        build_mock.return_value = mock
+        mock_cluster_cmds(build_mock, cloud, mock)
 
         self.run_tool(cloud, ['--thread_num', thread_num, '--yes', '--verbose'], SystemExit)
 
@@ -145,7 +145,7 @@ class TestInfoCollect:
 
         mock = Mock()
         mock.exec = mock_exec
-        build_mock.return_value = mock
+        mock_cluster_cmds(build_mock, cloud, mock)
 
         self.run_tool(cloud, ['--thread_num', '1', '--yes', '--verbose'], expected_exception=SystemExit)
 
@@ -179,7 +179,7 @@ class TestInfoCollect:
 
         mock = Mock()
         mock.exec = mock_exec
-        build_mock.return_value = mock
+        mock_cluster_cmds(build_mock, cloud, mock)
 
         self.run_tool(cloud, ['--thread_num', '1', '--yes', '--verbose'], expected_exception=SystemExit)
 
@@ -206,7 +206,7 @@ class TestInfoCollect:
 
         mock = Mock()
         mock.exec = Mock(side_effect=return_values)
-        build_mock.return_value = mock
+        mock_cluster_cmds(build_mock, cloud, mock)
 
         with patch('builtins.input', return_value=user_input):
             self.run_tool(cloud, ['--verbose'])
@@ -229,7 +229,7 @@ class TestInfoCollect:
 
         mock = Mock()
         mock.exec = Mock(side_effect=return_values)
-        build_mock.return_value = mock
+        mock_cluster_cmds(build_mock, cloud, mock)
 
         with patch('builtins.input', return_value=user_input):
             self.run_tool(cloud, ['--thread_num', '1', '--verbose'], expected_exception=SystemExit)
@@ -0,0 +1,158 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the local disk cache of the remote eventlogs."""
+
+import json
+import os
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.rapids.eventlogs_cache import EventlogsCache
+
+
+class CountingEventlogsCache(EventlogsCache):
+    """Treats the file:// urls as remote storage and counts the fetched files."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, remote_prefixes=('file://',), **kwargs)
+        self.fetched_files = []
+
+    def _fetch_file(self, eventlog_path, f_info, blob_path):
+        self.fetched_files.append(f_info.base_name)
+        return super()._fetch_file(eventlog_path, f_info, blob_path)
+
+
+class InterleavedEventlogsCache(CountingEventlogsCache):
+    """Runs the stage of another run while fetching its first file."""
+
+    def __init__(self, *args, interleaved_stage=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interleaved_stage = interleaved_stage
+
+    def _fetch_file(self, eventlog_path, f_info, blob_path):
+        if self.interleaved_stage is not None:
+            interleaved_stage, self.interleaved_stage = self.interleaved_stage, None
+            interleaved_stage()
+        return super()._fetch_file(eventlog_path, f_info, blob_path)
+
+
+def write_file(file_path, content: str):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def read_file(file_path) -> str:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture(name='remote_root')
+def fixture_remote_root(tmp_path):
+    root = tmp_path / 'remote'
+    write_file(str(root / 'app-1.zstd'), 'app-1' * 10)
+    write_file(str(root / 'eventlog_v2_app-2' / 'events_1_app-2'), 'app-2-part-1' * 10)
+    write_file(str(root / 'eventlog_v2_app-2' / 'events_2_app-2'), 'app-2-part-2' * 10)
+    return root
+
+
+class TestEventlogsCache:
+    """Test staging the remote eventlogs through the cache."""
+
+    def test_repeated_runs_read_from_cache(self, tmp_path, remote_root):
+        eventlogs = [f'file://{remote_root}/app-1.zstd', f'file://{remote_root}/eventlog_v2_app-2/',
+                     str(tmp_path / 'local-app')]
+        eventlogs_cache = CountingEventlogsCache(str(tmp_path / 'cache'), max_size_bytes=1 << 20)
+        staged_logs = eventlogs_cache.stage(eventlogs, str(tmp_path / 'run-1'))
+        assert staged_logs[0] == str(tmp_path / 'run-1' / '0' / 'app-1.zstd')
+        assert staged_logs[1] == str(tmp_path / 'run-1' / '1' / 'eventlog_v2_app-2')
+        # local eventlogs are passed as is
+        assert staged_logs[2] == eventlogs[2]
+        assert read_file(staged_logs[0]) == 'app-1' * 10
+        assert sorted(os.listdir(staged_logs[1])) == ['events_1_app-2', 'events_2_app-2']
+        assert len(eventlogs_cache.fetched_files) == 3
+        # a second run does not download the files again
+        eventlogs_cache = CountingEventlogsCache(str(tmp_path / 'cache'), max_size_bytes=1 << 20)
+        staged_logs = eventlogs_cache.stage(eventlogs, str(tmp_path / 'run-2'))
+        assert not eventlogs_cache.fetched_files
+        assert read_file(os.path.join(staged_logs[1], 'events_2_app-2')) == 'app-2-part-2' * 10
+
+    def test_changed_eventlog_is_fetched_again(self, tmp_path, remote_root):
+        eventlogs = [f'file://{remote_root}/app-1.zstd']
+        eventlogs_cache = CountingEventlogsCache(str(tmp_path / 'cache'), max_size_bytes=1 << 20)
+        eventlogs_cache.stage(eventlogs, str(tmp_path / 'run-1'))
+        write_file(str(remote_root / 'app-1.zstd'), 'app-1 rewritten')
+        staged_logs = eventlogs_cache.stage(eventlogs, str(tmp_path / 'run-2'))
+        assert eventlogs_cache.fetched_files == ['app-1.zstd', 'app-1.zstd']
+        assert read_file(staged_logs[0]) == 'app-1 rewritten'
+
+    def test_least_recently_used_eventlogs_are_evicted(self, tmp_path, remote_root):
+        eventlogs_cache = CountingEventlogsCache(str(tmp_path / 'cache'), max_size_bytes=250,
+                                                 eviction_grace_secs=0)
+        eventlogs_cache.stage([f'file://{remote_root}/app-1.zstd'], str(tmp_path / 'run-1'))
+        eventlogs_cache.stage([f'file://{remote_root}/eventlog_v2_app-2'], str(tmp_path / 'run-2'))
+        # the first eventlog was evicted to make room for the second one
+        eventlogs_cache.stage([f'file://{remote_root}/app-1.zstd'], str(tmp_path / 'run-3'))
+        assert eventlogs_cache.fetched_files.count('app-1.zstd') == 2
+        # the eventlogs linked by previous runs are still readable
+        assert read_file(tmp_path / 'run-1' / '0' / 'app-1.zstd') == 'app-1' * 10
+
+    def test_eventlogs_that_cannot_be_staged(self, tmp_path, remote_root):
+        eventlogs = [f'file://{remote_root}/missing', f'file://{remote_root}/eventlog_v2_app-2']
+        eventlogs_cache = CountingEventlogsCache(str(tmp_path / 'cache'), max_size_bytes=100)
+        # the missing eventlog and the one larger than the cache are read remotely by the tool
+        assert eventlogs_cache.stage(eventlogs, str(tmp_path / 'run-1')) == eventlogs
+        assert not eventlogs_cache.fetched_files
+
+    def test_interleaved_runs_keep_their_entries(self, tmp_path, remote_root):
+        cache_folder = str(tmp_path / 'cache')
+        other_cache = CountingEventlogsCache(cache_folder, max_size_bytes=1 << 20)
+        eventlogs_cache = InterleavedEventlogsCache(
+            cache_folder, max_size_bytes=1 << 20,
+            interleaved_stage=lambda: other_cache.stage([f'file://{remote_root}/eventlog_v2_app-2'],
+                                                        str(tmp_path / 'run-2')))
+        eventlogs_cache.stage([f'file://{remote_root}/app-1.zstd'], str(tmp_path / 'run-1'))
+        assert len(other_cache.fetched_files) == 2
+        with open(os.path.join(cache_folder, 'eventlogs', 'index.json'), 'r', encoding='utf-8') as index_fd:
+            assert len(json.load(index_fd)) == 3
+        # the next runs read the files staged by both runs from the cache
+        eventlogs_cache = CountingEventlogsCache(cache_folder, max_size_bytes=1 << 20)
+        eventlogs_cache.stage([f'file://{remote_root}/app-1.zstd', f'file://{remote_root}/eventlog_v2_app-2'],
+                              str(tmp_path / 'run-3'))
+        assert not eventlogs_cache.fetched_files
+
+    def test_recently_used_eventlogs_are_not_evicted(self, tmp_path, remote_root):
+        eventlogs_cache = CountingEventlogsCache(str(tmp_path / 'cache'), max_size_bytes=250,
+                                                 eviction_grace_secs=3600)
+        eventlogs_cache.stage([f'file://{remote_root}/app-1.zstd'], str(tmp_path / 'run-1'))
+        eventlogs_cache.stage([f'file://{remote_root}/eventlog_v2_app-2'], str(tmp_path / 'run-2'))
+        # the first eventlog may still be read by the first run
+        eventlogs_cache.stage([f'file://{remote_root}/app-1.zstd'], str(tmp_path / 'run-3'))
+        assert eventlogs_cache.fetched_files.count('app-1.zstd') == 1
+
+    def test_entries_missing_from_index_are_evicted(self, tmp_path, remote_root):
+        store_dir = tmp_path / 'cache' / 'eventlogs'
+        eventlogs_cache = CountingEventlogsCache(str(tmp_path / 'cache'), max_size_bytes=250,
+                                                 eviction_grace_secs=60)
+        eventlogs_cache.stage([f'file://{remote_root}/app-1.zstd'], str(tmp_path / 'run-1'))
+        # the entry of the first eventlog is lost from the index, and its directory is old
+        (store_dir / 'index.json').unlink()
+        for entry_dir in store_dir.iterdir():
+            if entry_dir.is_dir():
+                os.utime(entry_dir, (0, 0))
+        eventlogs_cache.stage([f'file://{remote_root}/eventlog_v2_app-2'], str(tmp_path / 'run-2'))
+        store_size = sum(os.path.getsize(os.path.join(root, f_name))
+                         for root, _, f_names in os.walk(store_dir) for f_name in f_names
+                         if root != str(store_dir))
+        assert store_size <= 250
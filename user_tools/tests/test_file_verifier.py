@@ -0,0 +1,53 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test hashing the files verified by the FileVerifier."""
+
+import hashlib
+import os
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.sys_storage import FileVerifier
+
+
+@pytest.fixture(name='cache_folder')
+def fixture_cache_folder(tmp_path, monkeypatch):
+    cache_folder = tmp_path / 'cache'
+    os.makedirs(cache_folder)
+    monkeypatch.setenv('RAPIDS_USER_TOOLS_CACHE_FOLDER', str(cache_folder))
+    return cache_folder
+
+
+def write_file(file_path, content: bytes) -> str:
+    with open(file_path, 'wb') as f:
+        f.write(content)
+    return str(file_path)
+
+
+class TestFileVerifier:
+    """Test hashing the files through the mapped views."""
+
+    @pytest.mark.parametrize('algorithm', ['md5', 'sha1', 'sha256', 'sha512'])
+    @pytest.mark.parametrize('content', [b'', b'abc', os.urandom(3 << 20)])
+    def test_hash_matches_hashlib(self, cache_folder, tmp_path, monkeypatch, algorithm, content):
+        # use several blocks for the large file
+        monkeypatch.setattr(FileVerifier, 'HASH_BLOCK_SIZE', 1 << 20)
+        file_path = write_file(tmp_path / 'dep.tgz', content)
+        expected_hash = hashlib.new(algorithm, content).hexdigest()
+        assert FileVerifier.calculate_hash(file_path, algorithm) == expected_hash
+        assert FileVerifier.check_integrity(file_path, {'size': len(content),
+                                                        'hashlib': {'algorithm': algorithm,
+                                                                    'hash': expected_hash}})
+        # the hashes are not memoized under the cache folder. The dependency cache keeps its own sidecar
+        assert not os.listdir(cache_folder)
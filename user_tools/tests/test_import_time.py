@@ -0,0 +1,78 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the startup cost of the CLI using the import time report of the interpreter."""
+
+import os
+import subprocess
+import sys
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.utilities import Utils
+
+CLI_MODULE = 'spark_rapids_tools.cmdli.tools_cli'
+# budget of the cumulative import time of the CLI module in microseconds. The wall-clock time depends
+# on the host, so the budget is checked only when the benchmarks are enabled.
+IMPORT_TIME_BUDGET_US = 1_000_000
+# modules that must not be loaded before a cmd runs
+HEAVY_MODULES = [
+    'adlfs',
+    'azure.storage.blob',
+    'bs4',
+    'pandas',
+    'pyarrow',
+    'pydantic.main',
+    'tabulate',
+    'spark_rapids_pytools.cloud_api.sp_types',
+    'spark_rapids_pytools.rapids.qualification',
+    'spark_rapids_tools.storagelib',
+]
+
+
+def run_importtime(module_name: str) -> dict:
+    """
+    Imports the module in a new interpreter with "-X importtime".
+    :return: the cumulative import time in microseconds of each imported module
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in sys.path if p)
+    res = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                         capture_output=True, text=True, env=env, check=True)
+    import_times = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, imported_module = line[len('import time:'):].split('|')
+        import_times[imported_module.strip()] = int(cumulative_us)
+    return import_times
+
+
+@pytest.fixture(scope='module', name='import_times')
+def fixture_import_times():
+    # the first run warms up the bytecode cache
+    run_importtime(CLI_MODULE)
+    return run_importtime(CLI_MODULE)
+
+
+class TestImportTime:
+    """Test that the CLI starts without loading the modules of the tools."""
+
+    @pytest.mark.parametrize('heavy_module', HEAVY_MODULES)
+    def test_heavy_modules_are_not_imported(self, import_times, heavy_module):
+        assert heavy_module not in import_times
+
+    @pytest.mark.skipif(not Utils.get_rapids_tools_env('BENCHMARK'),
+                        reason='Set RAPIDS_USER_TOOLS_BENCHMARK to check the import time budget')
+    def test_import_time_budget(self, import_times):
+        assert import_times[CLI_MODULE] < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,107 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the automatic sizing of the local JVM."""
+
+import os
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.prop_manager import YAMLPropertiesContainer
+from spark_rapids_pytools.common.utilities import Utils
+from spark_rapids_pytools.rapids.jvm_sizing import GIB, HostResources, JvmSizing, get_eventlogs_size
+
+
+def write_file(file_path, content: str):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def create_host(tmp_path, cgroup_files: dict, mem_available_gb: int = 256) -> HostResources:
+    cgroup_root = tmp_path / 'cgroup'
+    os.makedirs(cgroup_root, exist_ok=True)
+    for file_name, content in cgroup_files.items():
+        write_file(str(cgroup_root / file_name), content)
+    meminfo_file = str(tmp_path / 'meminfo')
+    write_file(meminfo_file, f'MemTotal: {512 * 1024 * 1024} kB\nMemAvailable: {mem_available_gb * 1024 * 1024} kB\n')
+    return HostResources(cgroup_root=str(cgroup_root), meminfo_file=meminfo_file)
+
+
+def load_sizing_conf() -> dict:
+    conf = YAMLPropertiesContainer(Utils.resource_path('qualification-conf.yaml'))
+    return conf.get_value('sparkRapids', 'jvmSizing')
+
+
+class TestJvmSizing:
+    """Test detecting the resources and sizing the JVM."""
+
+    def test_cgroup_v2_limits(self, tmp_path):
+        host = create_host(tmp_path, {'memory.max': f'{8 * GIB}\n',
+                                      'memory.current': f'{GIB}\n',
+                                      'cpu.max': '250000 100000\n'})
+        assert host.memory_bytes == 7 * GIB
+        assert host.cpu_cores == min(3, len(os.sched_getaffinity(0)))
+
+    def test_cgroup_v1_limits(self, tmp_path):
+        host = create_host(tmp_path, {'memory/memory.limit_in_bytes': f'{4 * GIB}',
+                                      'memory/memory.usage_in_bytes': '0',
+                                      'cpu/cpu.cfs_quota_us': '100000',
+                                      'cpu/cpu.cfs_period_us': '100000'})
+        assert host.memory_bytes == 4 * GIB
+        assert host.cpu_cores == 1
+
+    def test_unlimited_cgroup(self, tmp_path):
+        host = create_host(tmp_path, {'memory.max': 'max\n', 'cpu.max': 'max 100000\n'}, mem_available_gb=30)
+        assert host.memory_bytes == 30 * GIB
+        assert host.cpu_cores == len(os.sched_getaffinity(0))
+
+    @pytest.mark.parametrize('memory_gb,cores,eventlogs_gb,eventlogs_cnt,exp_heap,exp_threads', [
+        # small CI box: the heap is capped by the available memory
+        (4, 2, 10, 100, 3, 1),
+        # large server with small input: the heap follows the eventlogs
+        (384, 96, 1, 8, 16, 8),
+        # large server with large input
+        (384, 96, 40, 2000, 64, 32),
+        # unknown input size
+        (384, 96, None, None, 64, 32),
+    ])
+    def test_heap_and_threads(self, memory_gb, cores, eventlogs_gb, eventlogs_cnt, exp_heap, exp_threads):
+        host = HostResources.__new__(HostResources)
+        host.memory_bytes = memory_gb * GIB
+        host.cpu_cores = cores
+        jvm_sizing = JvmSizing(load_sizing_conf(), host=host,
+                               eventlogs_size=None if eventlogs_gb is None else eventlogs_gb * GIB,
+                               eventlogs_count=eventlogs_cnt)
+        assert jvm_sizing.heap_gb == exp_heap
+        assert jvm_sizing.num_threads == exp_threads
+        jvm_args = jvm_sizing.get_jvm_args()
+        assert f'Xmx{exp_heap}g' in jvm_args
+        assert f'XX:ParallelGCThreads={cores}' in jvm_args
+        assert ('XX:+UseG1GC' in jvm_args) == (exp_heap >= 4)
+
+    def test_user_heap_is_kept(self):
+        host = HostResources.__new__(HostResources)
+        host.memory_bytes = 8 * GIB
+        host.cpu_cores = 64
+        jvm_sizing = JvmSizing(load_sizing_conf(), host=host, eventlogs_size=GIB, eventlogs_count=100,
+                               user_heap_gb=24)
+        assert jvm_sizing.heap_gb == 24
+        assert jvm_sizing.num_threads == 12
+
+    def test_eventlogs_size(self, tmp_path):
+        write_file(str(tmp_path / 'logs' / 'app-1'), 'a' * 100)
+        write_file(str(tmp_path / 'logs' / 'nested' / 'app-2'), 'b' * 50)
+        write_file(str(tmp_path / 'app-3'), 'c' * 10)
+        assert get_eventlogs_size([str(tmp_path / 'logs'), str(tmp_path / 'app-3')]) == (160, 3)
+        assert get_eventlogs_size(['unknown://bucket/logs']) == (None, None)
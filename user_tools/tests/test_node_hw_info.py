@@ -0,0 +1,75 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test pulling the hardware info of the cluster nodes."""
+
+import threading
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.cloud_api.sp_types import ClusterBase, ClusterNode, CMDDriverBase, SysInfo
+
+
+@dataclass
+class CountingNode(ClusterNode):
+    """Describes the instance type of the node through the lookups recorded by the test."""
+
+    lookups = []
+    lookups_barrier = None
+
+    def _pull_sys_info(self, cli=None) -> SysInfo:
+        self.lookups.append(self.instance_type)
+        if self.lookups_barrier is not None:
+            # all the distinct lookups have to run at the same time to pass the barrier
+            self.lookups_barrier.wait(timeout=10)
+        num_cpus = int(self.instance_type.rsplit('-', 1)[-1])
+        return SysInfo(num_cpus=num_cpus, cpu_mem=num_cpus * 4096)
+
+    def _pull_gpu_hw_info(self, cli=None):
+        return None
+
+
+def create_nodes(instance_types: list) -> list:
+    return [CountingNode.create_worker_node().set_fields_from_dict({'name': f'worker-{node_ind}',
+                                                                    'instance_type': instance_type})
+            for node_ind, instance_type in enumerate(instance_types)]
+
+
+@pytest.fixture(name='cluster')
+def fixture_cluster(monkeypatch):
+    monkeypatch.setattr(CountingNode, 'lookups', [])
+    cli = CMDDriverBase(cloud_ctxt={})
+    return ClusterBase(platform=SimpleNamespace(cli=cli))
+
+
+class TestNodeHWInfo:
+    """Test that the hardware info is pulled once per instance type."""
+
+    def test_distinct_instance_types_pulled_once(self, cluster, monkeypatch):
+        monkeypatch.setattr(CountingNode, 'lookups_barrier', threading.Barrier(2))
+        nodes = create_nodes(['n1-standard-8'] * 200 + ['n1-standard-4'])
+        cluster._fetch_and_set_nodes_hw_info(nodes)  # pylint: disable=protected-access
+        assert sorted(CountingNode.lookups) == ['n1-standard-4', 'n1-standard-8']
+        assert all(node.hw_info.sys_info.num_cpus == 8 for node in nodes[:200])
+        assert nodes[200].hw_info.sys_info.num_cpus == 4
+
+    def test_hw_info_memoized_for_the_session(self, cluster):
+        cluster._fetch_and_set_nodes_hw_info(create_nodes(['n1-standard-8']))  # pylint: disable=protected-access
+        # another cluster sharing the same cli does not pull the info again
+        other_cluster = ClusterBase(platform=SimpleNamespace(cli=cluster.cli))
+        nodes = create_nodes(['n1-standard-8', 'n1-standard-16'])
+        other_cluster._fetch_and_set_nodes_hw_info(nodes)  # pylint: disable=protected-access
+        assert CountingNode.lookups == ['n1-standard-8', 'n1-standard-16']
+        assert [node.hw_info.sys_info.num_cpus for node in nodes] == [8, 16]
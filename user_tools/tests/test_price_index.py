@@ -0,0 +1,203 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the price indices compiled from the pricing catalogs."""
+
+import io
+import json
+import os
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.prop_manager import JSONStreamReader
+from spark_rapids_pytools.pricing.dataproc_pricing import DataprocCatalogContainer
+from spark_rapids_pytools.pricing.emr_pricing import AWSCatalogContainer
+from spark_rapids_pytools.pricing.price_index import PriceIndex
+
+
+def gen_aws_offer(instance_prices: dict) -> dict:
+    products = {}
+    on_demand = {}
+    for i, (instance_type, price) in enumerate(instance_prices.items()):
+        sku = f'SKU{i}'
+        products[sku] = {
+            'sku': sku,
+            'attributes': {
+                'instanceType': instance_type,
+                'tenancy': 'Shared',
+                'operatingSystem': 'Linux',
+                'operation': 'RunInstances',
+                'capacitystatus': 'Used'
+            }
+        }
+        on_demand[sku] = {
+            f'{sku}.TERM': {
+                'priceDimensions': {
+                    f'{sku}.TERM.DIM': {'pricePerUnit': {'USD': str(price)}}
+                }
+            }
+        }
+    # add a product that does not match the conditions
+    products['SKU_WINDOWS'] = {
+        'sku': 'SKU_WINDOWS',
+        'attributes': {'instanceType': 'm5.xlarge', 'operatingSystem': 'Windows'}
+    }
+    reserved = {sku: {f'{sku}.RESERVED': {'priceDimensions': {}}} for sku in on_demand}
+    return {
+        'formatVersion': 'v1.0',
+        'products': products,
+        'terms': {'OnDemand': on_demand, 'Reserved': reserved}
+    }
+
+
+def write_json(file_path: str, content: dict, mtime_ns: int = None):
+    with open(file_path, 'w', encoding='utf-8') as json_file:
+        json.dump(content, json_file)
+    if mtime_ns is not None:
+        os.utime(file_path, ns=(mtime_ns, mtime_ns))
+
+
+class TestPriceIndex:
+    """Test building and reusing price indices."""
+
+    def test_index_built_once(self, tmp_path):
+        catalog_file = str(tmp_path / 'catalog.json')
+        write_json(catalog_file, {'a': 1})
+        build_calls = []
+
+        def build_cb(file_path: str) -> dict:
+            build_calls.append(file_path)
+            return {'a': 1.5}
+
+        first_index = PriceIndex(catalog_file, build_cb=build_cb)
+        second_index = PriceIndex(catalog_file, build_cb=build_cb)
+        assert build_calls == [catalog_file]
+        assert first_index.props == second_index.props == {'a': 1.5}
+        assert os.path.exists(str(tmp_path / 'catalog.index.json'))
+
+    def test_index_rebuilt_on_catalog_change(self, tmp_path):
+        catalog_file = str(tmp_path / 'catalog.json')
+        write_json(catalog_file, {'price': 1}, mtime_ns=1_000_000_000)
+
+        def build_cb(file_path: str) -> dict:
+            with open(file_path, 'r', encoding='utf-8') as json_file:
+                return json.load(json_file)
+
+        assert PriceIndex(catalog_file, build_cb=build_cb).props == {'price': 1}
+        # same size but a different modification time
+        write_json(catalog_file, {'price': 2}, mtime_ns=2_000_000_000)
+        assert PriceIndex(catalog_file, build_cb=build_cb).props == {'price': 2}
+
+    def test_corrupted_index_is_rebuilt(self, tmp_path):
+        catalog_file = str(tmp_path / 'catalog.json')
+        write_json(catalog_file, {'a': 1})
+        PriceIndex(catalog_file, build_cb=lambda _: {'a': 1})
+        with open(PriceIndex.get_index_file(catalog_file), 'w', encoding='utf-8') as index_file:
+            index_file.write('{not a json')
+        assert PriceIndex(catalog_file, build_cb=lambda _: {'a': 2}).props == {'a': 2}
+
+    def test_aws_catalog_loaded_from_index(self, tmp_path, monkeypatch):
+        catalog_file = str(tmp_path / 'aws_ec2_catalog_ec2.json')
+        write_json(catalog_file, gen_aws_offer({'m5.xlarge': 0.192, 'g4dn.xlarge': 0.526}))
+        catalog = AWSCatalogContainer({'ec2': catalog_file})
+        assert catalog.get_value('ec2') == {'m5.xlarge': 0.192, 'g4dn.xlarge': 0.526}
+
+        # the second load must not parse the catalog file
+        def fail_build(*_):
+            raise AssertionError('The catalog file should not be parsed')
+        monkeypatch.setattr(AWSCatalogContainer, '_build_price_map_ec2', fail_build)
+        cached_catalog = AWSCatalogContainer({'ec2': catalog_file})
+        assert cached_catalog.props == catalog.props
+
+    def test_dataproc_index_keeps_scalars(self, tmp_path):
+        catalog_file = str(tmp_path / 'gcloud-catalog.json')
+        write_json(catalog_file, {
+            'gcp_price_list': {
+                'updated': '01-June-2023',
+                'CP-COMPUTEENGINE-VMIMAGE-N1-STANDARD-4': {
+                    'us': 0.19, 'us-central1': 0.19, 'cores': '4', 'memory': '15', 'ssd': [0, 1, 2]
+                }
+            }
+        })
+        price_index = PriceIndex(catalog_file, build_cb=DataprocCatalogContainer.build_price_index)
+        catalog = DataprocCatalogContainer(prop_arg=price_index.props, file_load=False)
+        assert catalog.get_value('CP-COMPUTEENGINE-VMIMAGE-N1-STANDARD-4', 'us-central1') == 0.19
+        assert catalog.get_value_silent('CP-COMPUTEENGINE-VMIMAGE-N1-STANDARD-4', 'cores') == '4'
+        assert catalog.get_value_silent('CP-COMPUTEENGINE-VMIMAGE-N1-STANDARD-4', 'ssd') is None
+
+
+def stream_to_value(reader: JSONStreamReader):
+    # rebuilds the document member by member to exercise all the reader paths
+    next_ch = reader._peek()  # pylint: disable=protected-access
+    if next_ch == '{':
+        return {key: stream_to_value(reader) for key in reader.iter_object()}
+    if next_ch == '[':
+        return [stream_to_value(reader) for _ in reader.iter_array()]
+    return reader.read_value()
+
+
+class TestJSONStreamReader:
+    """Test the incremental loading of JSON documents."""
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 7, 1 << 20])
+    def test_stream_parity(self, chunk_size):
+        doc = {
+            'a': [1, 2.5, -3e-2, True, False, None, [], {}],
+            'b\\"c': {'nested': {'x': 'v}a"l]ue', 'y': 12345678}},
+            'num': 1234567890,
+            'u': '\u00e9t\u00e9'
+        }
+        reader = JSONStreamReader(io.StringIO(json.dumps(doc, indent=2)), chunk_size=chunk_size)
+        assert stream_to_value(reader) == doc
+
+    def test_skip_value(self):
+        reader = JSONStreamReader(io.StringIO('{"skip": {"a": [1, {"b": 2}]}, "keep": [3]}'), chunk_size=2)
+        res = {}
+        for key in reader.iter_object():
+            if key == 'keep':
+                res[key] = reader.read_value()
+            else:
+                reader.skip_value()
+        assert res == {'keep': [3]}
+
+    def test_truncated_content(self):
+        reader = JSONStreamReader(io.StringIO('{"a": {"b": 1'), chunk_size=4)
+        with pytest.raises(RuntimeError):
+            stream_to_value(reader)
+
+
+class TestAWSOfferStreaming:
+    """Test extracting the instance prices from AWS offer files."""
+
+    def test_ec2_prices(self, tmp_path):
+        prices = {f'm5.{i}xlarge': 0.1 * i for i in range(1, 50)}
+        catalog_file = str(tmp_path / 'ec2.json')
+        write_json(catalog_file, gen_aws_offer(prices))
+        # pylint: disable=protected-access
+        assert AWSCatalogContainer._build_price_map_ec2(catalog_file) == prices
+
+    def test_terms_before_products(self, tmp_path):
+        offer = gen_aws_offer({'m5.xlarge': 0.192, 'g4dn.xlarge': 0.526})
+        reordered_offer = {'terms': offer['terms'], 'products': offer['products']}
+        catalog_file = str(tmp_path / 'ec2.json')
+        write_json(catalog_file, reordered_offer)
+        # pylint: disable=protected-access
+        assert AWSCatalogContainer._build_price_map_ec2(catalog_file) == {'m5.xlarge': 0.192, 'g4dn.xlarge': 0.526}
+
+    def test_emr_prices(self, tmp_path):
+        offer = gen_aws_offer({'m5.xlarge': 0.048})
+        offer['products']['SKU0']['attributes']['softwareType'] = 'EMR'
+        catalog_file = str(tmp_path / 'emr.json')
+        write_json(catalog_file, offer)
+        # pylint: disable=protected-access
+        assert AWSCatalogContainer._build_price_map_emr(catalog_file) == {'m5.xlarge': 0.048}
@@ -0,0 +1,105 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test parsing the recommendations of the Profiling tool output."""
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_tools import CspEnv
+from spark_rapids_pytools.common.utilities import Utils
+from spark_rapids_pytools.rapids.profiling import Profiling, read_app_recommendations
+
+from .test_qualification import MockToolContext
+
+HEADERS = {
+    'section': '### D. Recommended Configuration ###',
+    'sparkProperties': 'Spark Properties:',
+    'comments': 'Comments:'
+}
+
+
+def gen_profile_log(app_ind: int, with_props: bool = True, with_comments: bool = True) -> str:
+    lines = ['### A. Information Collected ###',
+             'Spark Properties:',
+             '|propertyName                   |appIndex_1          |',
+             f'|spark.app.name                 |app name {app_ind}  |',
+             '|spark.executor.memory          |8g                  |',
+             '',
+             '### D. Recommended Configuration ###',
+             '']
+    if with_props:
+        lines.extend(['Spark Properties:',
+                      f'--conf spark.sql.shuffle.partitions={200 + app_ind}',
+                      '--conf spark.executor.cores=16',
+                      ''])
+    if with_comments:
+        lines.extend(['Comments:',
+                      "- 'spark.executor.instances' was not set.",
+                      f'- comment of app {app_ind}'])
+    return Utils.gen_multiline_str(lines)
+
+
+def write_app_logs(root_dir, apps_cnt: int) -> list:
+    app_folders = []
+    for app_ind in range(apps_cnt):
+        app_folder = root_dir / f'app-{app_ind:04d}'
+        app_folder.mkdir()
+        (app_folder / 'profile.log').write_text(gen_profile_log(app_ind), encoding='utf-8')
+        app_folders.append(str(app_folder))
+    return app_folders
+
+
+def gen_profiling_tool() -> Profiling:
+    tool = Profiling(platform_type=CspEnv.ONPREM)
+    tool.ctxt = MockToolContext(prop_arg=Utils.resource_path('profiling-conf.yaml'))
+    return tool
+
+
+class TestProfilingRecommendations:
+    """Test the single-pass parser of the profile logs and the parallel parsing of the apps."""
+
+    def test_read_app_recommendations(self, tmp_path):
+        log_file = tmp_path / 'profile.log'
+        log_file.write_text(gen_profile_log(7), encoding='utf-8')
+        app_name, props_list, comments_list = read_app_recommendations(str(log_file), HEADERS)
+        assert app_name == 'app name 7'
+        # the properties of the information section are not part of the recommendations
+        assert props_list == ['--conf spark.sql.shuffle.partitions=207', '--conf spark.executor.cores=16']
+        assert comments_list == ["- 'spark.executor.instances' was not set.", '- comment of app 7']
+
+    @pytest.mark.parametrize('with_props,with_comments', [(False, True), (True, False), (False, False)])
+    def test_read_partial_recommendations(self, tmp_path, with_props, with_comments):
+        log_file = tmp_path / 'profile.log'
+        log_file.write_text(gen_profile_log(1, with_props, with_comments), encoding='utf-8')
+        _, props_list, comments_list = read_app_recommendations(str(log_file), HEADERS)
+        assert bool(props_list) == with_props
+        assert bool(comments_list) == with_comments
+
+    def test_read_missing_log(self, tmp_path):
+        assert read_app_recommendations(str(tmp_path / 'profile.log'), HEADERS) is None
+        tool = gen_profiling_tool()
+        apps_output = tool._Profiling__read_apps_output([str(tmp_path)])  # pylint: disable=protected-access
+        assert apps_output == [('', ['- No recommendations'], ['- No comments'])]
+
+    def test_process_pool_keeps_apps_order(self, tmp_path, monkeypatch):
+        app_folders = write_app_logs(tmp_path, 40)
+        tool = gen_profiling_tool()
+        serial_output = tool._Profiling__read_apps_output(app_folders)  # pylint: disable=protected-access
+        parser_conf = tool.ctxt.get_value('local', 'output', 'recommendationsParser')
+        parser_conf['minAppsForProcessPool'] = 2
+        monkeypatch.setattr('os.cpu_count', lambda: 4)
+        pool_output = tool._Profiling__read_apps_output(app_folders)  # pylint: disable=protected-access
+        assert pool_output == serial_output
+        assert [app_name for app_name, _, _ in pool_output] == [f'app name {ind}' for ind in range(40)]
+        # the properties are sorted
+        assert pool_output[0][1] == ['--conf spark.executor.cores=16', '--conf spark.sql.shuffle.partitions=200']
@@ -0,0 +1,287 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test Qualification post-processing of the summary report."""
+
+from dataclasses import dataclass, field
+from math import ceil
+
+import numpy as np
+import pandas as pd
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_tools import CspEnv
+from spark_rapids_tools.enums import QualGpuClusterReshapeType
+from spark_rapids_pytools.cloud_api.sp_types import ClusterGetAccessor, ClusterNode, SparkNodeType, SysInfo
+from spark_rapids_pytools.common.prop_manager import JSONPropertiesContainer, YAMLPropertiesContainer
+from spark_rapids_pytools.common.utilities import Utils
+from spark_rapids_pytools.pricing.price_provider import PriceProvider, SavingsEstimator, SavingsEstimatorPool
+from spark_rapids_pytools.rapids.qualification import Qualification
+
+
+@dataclass
+class MockCluster(ClusterGetAccessor):  # pylint: disable=abstract-method
+    """A cluster that only defines the count of the nodes and their hardware."""
+    workers_cnt: int = 4
+    instance_type: str = 'mock-standard-16'
+
+    def get_node(self, node_type: SparkNodeType) -> ClusterNode:
+        node = ClusterNode.create_node(node_type).set_fields_from_dict({'instance_type': self.instance_type})
+        node.construct_hw_info(sys_info=SysInfo(num_cpus=16, cpu_mem=65536))
+        return node
+
+    def get_master_node(self) -> ClusterNode:
+        return self.get_node(SparkNodeType.MASTER)
+
+    def get_worker_node(self) -> ClusterNode:
+        return self.get_node(SparkNodeType.WORKER)
+
+    def get_nodes_cnt(self, node_type: SparkNodeType) -> int:
+        return self.workers_cnt if node_type == SparkNodeType.WORKER else 1
+
+    def get_name(self) -> str:
+        return 'mock-cluster'
+
+
+@dataclass
+class MockPriceProvider:
+    """A price provider reading its catalogs from local files."""
+    cache_files: dict
+    expired: bool = False
+
+    def get_cached_files(self) -> list:
+        return list(self.cache_files.values())
+
+    def get_catalogs_stamp(self) -> tuple:
+        return PriceProvider.get_catalogs_stamp(self)
+
+    def catalogs_expired(self) -> bool:
+        return self.expired
+
+
+@dataclass
+class MockSavingsEstimator(SavingsEstimator):
+    """An estimator with a flat hourly price per node."""
+
+    def _get_cost_per_cluster(self, cluster: ClusterGetAccessor):
+        return 1.7 * cluster.get_workers_count() + 0.3
+
+
+@dataclass
+class MockCMDDriver:
+    """CLI driver of the mock platform."""
+
+    def get_region(self) -> str:
+        return 'mock-region'
+
+
+@dataclass
+class MockPlatform:
+    """Platform creating the mock estimators."""
+    estimators_cnt: int = 0
+    cli: MockCMDDriver = field(default_factory=MockCMDDriver)
+    configs: JSONPropertiesContainer = field(
+        default_factory=lambda: JSONPropertiesContainer(prop_arg={}, file_load=False))
+    notes: dict = field(default_factory=dict)
+
+    def update_ctxt_notes(self, note_key, note_value):
+        self.notes.update({note_key: note_value})
+
+    def get_platform_name(self) -> str:
+        return 'mock'
+
+    def create_saving_estimator(self, source_cluster, reshaped_cluster, target_cost=None, source_cost=None):
+        self.estimators_cnt += 1
+        return MockSavingsEstimator(price_provider=None,
+                                    source_cluster=source_cluster,
+                                    reshaped_cluster=reshaped_cluster,
+                                    target_cost=target_cost,
+                                    source_cost=source_cost)
+
+
+@dataclass
+class MockToolContext(YAMLPropertiesContainer):
+    """Tool context loaded from the qualification configurations."""
+    platform: MockPlatform = field(default_factory=MockPlatform)
+    wrapper_ctxt: dict = field(default_factory=dict)
+
+    def get_ctxt(self, key: str):
+        return self.wrapper_ctxt.get(key)
+
+    def set_ctxt(self, key: str, val):
+        self.wrapper_ctxt[key] = val
+
+
+def gen_qualification_tool(vectorized: bool) -> Qualification:
+    tool = Qualification(platform_type=CspEnv.DATAPROC)
+    tool.ctxt = MockToolContext(prop_arg=Utils.resource_path('qualification-conf.yaml'))
+    tool.ctxt.props['local']['output']['processDFProps']['vectorizedCostCalculation'] = vectorized
+    tool.ctxt.wrapper_ctxt.update({
+        'cpuClusterProxy': MockCluster(workers_cnt=8),
+        'gpuClusterProxy': MockCluster(workers_cnt=4),
+        'cpu_discount': 15,
+        'gpu_discount': 30
+    })
+    return tool
+
+
+def gen_apps_df(apps_cnt: int, with_frequency: bool = True) -> pd.DataFrame:
+    rand_gen = np.random.default_rng(seed=1234)
+    app_durations = rand_gen.integers(1000, 10000000, size=apps_cnt)
+    speedups = rand_gen.uniform(1.0, 6.0, size=apps_cnt)
+    apps_df = pd.DataFrame({
+        'App Name': [f'app_{ind}' for ind in range(apps_cnt)],
+        'App ID': [f'app-id-{ind}' for ind in range(apps_cnt)],
+        'Speedup Based Recommendation': rand_gen.choice(['Strongly Recommended', 'Recommended',
+                                                         'Not Recommended', 'Not Applicable'],
+                                                        size=apps_cnt),
+        'App Duration': app_durations,
+        'Estimated GPU Duration': app_durations / speedups,
+        'Estimated GPU Speedup': speedups,
+        'Recommended Cluster Shape': rand_gen.integers(2, 8, size=apps_cnt)
+    })
+    if with_frequency:
+        apps_df['Estimated Job Frequency (monthly)'] = rand_gen.integers(1, 60, size=apps_cnt)
+    return apps_df
+
+
+class TestQualificationCosts:
+    """Test the calculations of the costs and savings of the applications."""
+
+    @staticmethod
+    def calc_apps_cost(tool: Qualification, apps_df: pd.DataFrame, per_row: bool) -> pd.DataFrame:
+        return tool._Qualification__calc_apps_cost(apps_df,  # pylint: disable=protected-access
+                                                   'Recommended Cluster Shape',
+                                                   'Speedup Based Recommendation',
+                                                   per_row)
+
+    @pytest.mark.parametrize('per_row', [False, True])
+    @pytest.mark.parametrize('with_frequency', [False, True])
+    def test_vectorized_costs_match_per_row_costs(self, per_row, with_frequency):
+        apps_df = gen_apps_df(500, with_frequency=with_frequency)
+        expected_df = self.calc_apps_cost(gen_qualification_tool(vectorized=False), apps_df.copy(), per_row)
+        actual_df = self.calc_apps_cost(gen_qualification_tool(vectorized=True), apps_df.copy(), per_row)
+        pd.testing.assert_frame_equal(actual_df, expected_df, check_exact=True)
+
+    @pytest.mark.parametrize('vectorized', [False, True])
+    def test_costs_reuse_estimator_per_shape(self, vectorized):
+        SavingsEstimatorPool.clear()
+        tool = gen_qualification_tool(vectorized=vectorized)
+        apps_df = gen_apps_df(500)
+        self.calc_apps_cost(tool, apps_df, per_row=True)
+        assert tool.ctxt.platform.estimators_cnt == apps_df['Recommended Cluster Shape'].nunique()
+
+    def test_estimators_pool_reused_across_invocations(self):
+        SavingsEstimatorPool.clear()
+        apps_df = gen_apps_df(500)
+        shapes_cnt = apps_df['Recommended Cluster Shape'].nunique()
+        first_tool = gen_qualification_tool(vectorized=True)
+        expected_df = self.calc_apps_cost(first_tool, apps_df.copy(), per_row=True)
+        second_tool = gen_qualification_tool(vectorized=True)
+        actual_df = self.calc_apps_cost(second_tool, apps_df.copy(), per_row=True)
+        pd.testing.assert_frame_equal(actual_df, expected_df, check_exact=True)
+        assert first_tool.ctxt.platform.estimators_cnt == shapes_cnt
+        assert second_tool.ctxt.platform.estimators_cnt == 0
+        assert SavingsEstimatorPool.get_stats() == {'hits': shapes_cnt, 'misses': shapes_cnt, 'size': shapes_cnt}
+        # a different cpu cluster cannot reuse the estimators
+        third_tool = gen_qualification_tool(vectorized=True)
+        third_tool.ctxt.set_ctxt('cpuClusterProxy', MockCluster(workers_cnt=10))
+        self.calc_apps_cost(third_tool, apps_df.copy(), per_row=True)
+        assert third_tool.ctxt.platform.estimators_cnt == shapes_cnt
+
+    def test_estimators_pool_is_bounded(self, monkeypatch):
+        SavingsEstimatorPool.clear()
+        monkeypatch.setattr(SavingsEstimatorPool, 'max_size', 2)
+        for key in range(5):
+            SavingsEstimatorPool.get_or_create(key, lambda k=key: k)
+        assert SavingsEstimatorPool.get_or_create(4, lambda: None) == 4
+        assert SavingsEstimatorPool.get_or_create(0, lambda: 'new') == 'new'
+        assert SavingsEstimatorPool.get_stats()['size'] == 2
+
+    def test_estimators_pool_drops_refreshed_catalogs(self, tmp_path):
+        SavingsEstimatorPool.clear()
+        catalog_file = tmp_path / 'catalog.json'
+        catalog_file.write_text('{"price": 1}', encoding='utf-8')
+        price_provider = MockPriceProvider(cache_files={'catalog': str(catalog_file)})
+
+        def create_estimator():
+            return MockSavingsEstimator(price_provider=price_provider,
+                                        source_cluster=MockCluster(workers_cnt=8),
+                                        reshaped_cluster=MockCluster(workers_cnt=4))
+        first_estimator = SavingsEstimatorPool.get_or_create('key', create_estimator)
+        assert SavingsEstimatorPool.get_or_create('key', create_estimator) is first_estimator
+        # the catalog is refreshed by another invocation
+        catalog_file.write_text('{"price": 10}', encoding='utf-8')
+        assert SavingsEstimatorPool.get_or_create('key', create_estimator) is not first_estimator
+        # the catalog expired and needs to be checked again
+        price_provider.expired = True
+        assert SavingsEstimatorPool.get_or_create('key', create_estimator) is not first_estimator
+        assert SavingsEstimatorPool.get_stats() == {'hits': 1, 'misses': 3, 'size': 1}
+
+
+def reshape_apps_per_row(apps_df: pd.DataFrame,
+                         workers_cnt: int,
+                         shape_type: QualGpuClusterReshapeType,
+                         min_w_cnt: int = 2,
+                         scale_f: float = 0.8) -> pd.DataFrame:
+    """Reference implementation applying the GPU cluster reshape one row at a time."""
+    def f_cell(x):
+        return ceil(x * 100) / 100
+
+    apps_df['Recommended Cluster Shape'] = apps_df.apply(
+        lambda row: max(min_w_cnt, ceil(scale_f * workers_cnt / row['Estimated GPU Speedup'])), axis=1)
+    if shape_type == QualGpuClusterReshapeType.CLUSTER:
+        apps_df['Recommended Cluster Shape'] = apps_df['Recommended Cluster Shape'].max()
+    apps_df['Estimated GPU Duration'] = apps_df.apply(lambda row: f_cell(
+        (workers_cnt / row['Recommended Cluster Shape']) * scale_f * row['App Duration'] /
+        row['Estimated GPU Speedup']), axis=1)
+    apps_df['Estimated GPU Speedup'] = apps_df.apply(
+        lambda row: f_cell(row['App Duration'] / row['Estimated GPU Duration']), axis=1)
+    return apps_df
+
+
+class TestQualificationClusterReshape:
+    """Test recommending GPU cluster shapes for the applications."""
+
+    @staticmethod
+    def apply_gpu_shape(tool: Qualification, apps_df: pd.DataFrame, workers_cnt: int,
+                        shape_type: QualGpuClusterReshapeType) -> (pd.DataFrame, bool):
+        return tool._Qualification__apply_non_standard_gpu_shape(apps_df,  # pylint: disable=protected-access
+                                                                 workers_cnt,
+                                                                 shape_type)
+
+    @pytest.mark.parametrize('shape_type', [QualGpuClusterReshapeType.JOB, QualGpuClusterReshapeType.CLUSTER])
+    def test_reshape_matches_per_row_reshape(self, shape_type):
+        apps_df = gen_apps_df(500).drop(columns=['Recommended Cluster Shape'])
+        expected_df = reshape_apps_per_row(apps_df.copy(), 20, shape_type)
+        actual_df, recalc_flag = self.apply_gpu_shape(gen_qualification_tool(vectorized=True),
+                                                      apps_df.copy(), 20, shape_type)
+        assert recalc_flag
+        pd.testing.assert_frame_equal(actual_df, expected_df, check_exact=True)
+
+    def test_cluster_reshape_with_same_workers_count(self):
+        tool = gen_qualification_tool(vectorized=True)
+        apps_df = gen_apps_df(100).drop(columns=['Recommended Cluster Shape'])
+        apps_df['Estimated GPU Speedup'] = 1.0
+        actual_df, recalc_flag = self.apply_gpu_shape(tool, apps_df.copy(), 2, QualGpuClusterReshapeType.CLUSTER)
+        assert not recalc_flag
+        assert (actual_df['Recommended Cluster Shape'] == 2).all()
+        pd.testing.assert_series_equal(actual_df['Estimated GPU Duration'], apps_df['Estimated GPU Duration'])
+        assert '2 worker nodes' in tool.ctxt.platform.notes.get('clusterShape')
+
+    def test_reshape_large_input(self):
+        apps_df = gen_apps_df(20000).drop(columns=['Recommended Cluster Shape'])
+        expected_df = reshape_apps_per_row(apps_df.copy(), 20, QualGpuClusterReshapeType.JOB)
+        actual_df, _ = self.apply_gpu_shape(gen_qualification_tool(vectorized=True),
+                                            apps_df.copy(), 20, QualGpuClusterReshapeType.JOB)
+        pd.testing.assert_frame_equal(actual_df, expected_df, check_exact=True)
@@ -0,0 +1,105 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test running the RAPIDS tools jar as a local job."""
+
+import logging
+from dataclasses import dataclass, field
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.utilities import SysCmd, ToolLogging
+from spark_rapids_pytools.rapids.rapids_job import RapidsJobPropContainer, RapidsLocalJob
+
+
+@dataclass
+class MockCli:
+    """Runs the command of the job in place of the java command."""
+    cmd: str
+
+    def run_sys_cmd(self, cmd: list, env_vars: dict = None, stream_lines_cb=None) -> str:
+        del cmd
+        return SysCmd().build({'cmd': self.cmd, 'env_vars': env_vars, 'stream_lines_cb': stream_lines_cb}).exec()
+
+
+@dataclass
+class MockPlatform:
+    """Platform running the commands with the mock cli."""
+    cli: MockCli
+
+
+@dataclass
+class MockExecCtxt:
+    """Execution context of the job."""
+    platform: MockPlatform
+
+    @staticmethod
+    def get_platform_name() -> str:
+        return 'mock'
+
+
+@dataclass
+class MockLocalRapidsJob(RapidsLocalJob):
+    """Local job collecting the lines passed to the progress hook."""
+    job_label = 'mockLocal'
+    stream_lines: list = field(default_factory=list, init=False)
+
+
+def gen_job(cmd: str) -> MockLocalRapidsJob:
+    prop_container = RapidsJobPropContainer(prop_arg={'rapidsArgs': {'jarFile': 'tools.jar',
+                                                                     'className': 'Main',
+                                                                     'jarArgs': []},
+                                                      'outputDirectory': 'output'},
+                                            file_load=False)
+    job = MockLocalRapidsJob(prop_container=prop_container,
+                             exec_ctxt=MockExecCtxt(platform=MockPlatform(cli=MockCli(cmd))))
+    job.progress_cb = lambda stream_name, line: job.stream_lines.append((stream_name, line))
+    return job
+
+
+@pytest.fixture(name='log_records')
+def fixture_log_records():
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('rapids.tools.submit.mockLocal')
+    logger.addHandler(handler)
+    yield records
+    logger.removeHandler(handler)
+
+
+class TestRapidsLocalJob:
+    """Test that the output of the local job is streamed and that its failures are reported."""
+
+    def test_output_logged_at_debug(self, log_records):
+        job = gen_job('echo out_1; echo err_1 >&2')
+        assert job.run_job() == 'out_1'
+        ToolLogging.flush()
+        assert sorted(job.stream_lines) == [('stderr', 'err_1'), ('stdout', 'out_1')]
+        line_records = [r for r in log_records if ' | ' in r.getMessage()]
+        assert len(line_records) == 2
+        assert all(r.levelno == logging.DEBUG for r in line_records)
+
+    def test_failure_reports_stderr_tail(self, log_records):
+        tail_size = MockLocalRapidsJob.stderr_tail_size
+        job = gen_job(f'for i in $(seq 1 {tail_size * 2}); do echo err_$i >&2; done; exit 1')
+        with pytest.raises(RuntimeError):
+            job.run_job()
+        ToolLogging.flush()
+        assert list(job.stderr_tail) == [f'err_{ind}' for ind in range(tail_size + 1, tail_size * 2 + 1)]
+        error_records = [r for r in log_records if r.levelno == logging.ERROR]
+        assert len(error_records) == 1
+        error_msg = error_records[0].getMessage()
+        assert f'Last {tail_size} lines' in error_msg
+        assert f'err_{tail_size * 2}' in error_msg
+        assert f'err_{tail_size}\n' not in error_msg
@@ -0,0 +1,91 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test running system commands."""
+
+import subprocess
+import time
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.utilities import SysCmd
+
+
+class LinesCollector:  # pylint: disable=too-few-public-methods
+    """Collects the lines streamed by a command."""
+
+    def __init__(self):
+        self.lines = {'stdout': [], 'stderr': []}
+
+    def __call__(self, stream_name: str, line: str):
+        self.lines[stream_name].append(line)
+
+
+class TestSysCmd:
+    """Test the buffered and the streaming modes of SysCmd."""
+
+    def test_buffered_and_streaming_parity(self):
+        cmd = 'for i in 1 2 3; do echo out_$i; echo err_$i >&2; done'
+        buffered_out = SysCmd().build({'cmd': cmd}).exec()
+        collector = LinesCollector()
+        streaming_cmd = SysCmd().build({'cmd': cmd, 'stream_lines_cb': collector})
+        assert streaming_cmd.exec() == buffered_out
+        assert collector.lines['stdout'] == ['out_1', 'out_2', 'out_3']
+        assert collector.lines['stderr'] == ['err_1', 'err_2', 'err_3']
+        assert streaming_cmd.err_std == 'err_1\nerr_2\nerr_3'
+
+    def test_streaming_buffers_are_bounded(self):
+        collector = LinesCollector()
+        sys_cmd = SysCmd().build({
+            'cmd': 'seq 1 5000; seq 1 5000 >&2',
+            'stream_lines_cb': collector,
+            'max_buffered_lines': 10
+        })
+        out_std = sys_cmd.exec()
+        # all the lines are streamed, but only the tail is kept
+        assert len(collector.lines['stdout']) == 5000
+        assert len(collector.lines['stderr']) == 5000
+        assert out_std.splitlines() == [str(i) for i in range(4991, 5001)]
+        assert sys_cmd.err_std.splitlines() == [str(i) for i in range(4991, 5001)]
+
+    def test_streaming_failure_reports_stderr_tail(self):
+        sys_cmd = SysCmd().build({
+            'cmd': 'seq 1 100 >&2; exit 3',
+            'stream_lines_cb': LinesCollector(),
+            'max_buffered_lines': 2
+        })
+        with pytest.raises(RuntimeError) as err:
+            sys_cmd.exec()
+        assert sys_cmd.res == 3
+        assert '| 99' in str(err.value) and '| 100' in str(err.value)
+        assert '| 98\n' not in str(err.value)
+
+    def test_streaming_with_input(self):
+        collector = LinesCollector()
+        out_std = SysCmd().build({'cmd': 'cat', 'cmd_input': 'a\nb\n', 'stream_lines_cb': collector}).exec()
+        assert out_std == 'a\nb'
+        assert collector.lines['stdout'] == ['a', 'b']
+
+    def test_streaming_timeout(self):
+        collector = LinesCollector()
+        sys_cmd = SysCmd().build({
+            'cmd': 'echo start; sleep 10; echo end',
+            'stream_lines_cb': collector,
+            'timeout_secs': 0.5
+        })
+        start_time = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            sys_cmd.exec()
+        # the children of the shell are killed as well
+        assert time.monotonic() - start_time < 5
+        assert collector.lines['stdout'] == ['start']
@@ -0,0 +1,95 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the setup of the loggers used by the tools."""
+
+import logging.handlers
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.utilities import SysCmd, ToolLogging
+
+
+def read_file(file_path) -> str:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture(name='setup_calls')
+def fixture_setup_calls(monkeypatch):
+    setup_calls = []
+    orig_setup = ToolLogging._setup_logging.__func__  # pylint: disable=protected-access
+
+    def setup_logging(cls, debug_enabled):
+        setup_calls.append(debug_enabled)
+        return orig_setup(cls, debug_enabled)
+    monkeypatch.setattr(ToolLogging, '_setup_logging', classmethod(setup_logging))
+    return setup_calls
+
+
+def log_from_worker(message: str) -> int:
+    logger = ToolLogging.get_and_setup_logger('rapids.tools.test')
+    logger.info(message)
+    ToolLogging.flush()
+    return os.getpid()
+
+
+class TestToolLogging:
+    """Test that the logging is set up once and writes the records of each run to its log file."""
+
+    def test_constant_setup_cost(self, setup_calls):
+        ToolLogging.get_and_setup_logger('rapids.tools.test')
+        setup_calls.clear()
+        for _ in range(500):
+            SysCmd().build({'cmd': 'ls'})
+        assert not setup_calls
+        queue_handlers = [handler for handler in logging.getLogger().handlers
+                          if isinstance(handler, logging.handlers.QueueHandler)]
+        assert len(queue_handlers) == 1
+
+    def test_log_file_of_each_run(self, tmp_path, monkeypatch, setup_calls):
+        for run_ind in range(2):
+            monkeypatch.setenv('RAPIDS_USER_TOOLS_LOG_FILE', str(tmp_path / f'run-{run_ind}.log'))
+            logger = ToolLogging.get_and_setup_logger('rapids.tools.test')
+            logger.debug('Message of run %d', run_ind)
+            # records of other libraries are not written to the log file
+            logging.getLogger('other.library').error('Message of other library')
+        ToolLogging.flush()
+        assert 'rapids.tools.test: Message of run 0' in read_file(tmp_path / 'run-0.log')
+        assert 'rapids.tools.test: Message of run 1' in read_file(tmp_path / 'run-1.log')
+        assert 'run 1' not in read_file(tmp_path / 'run-0.log')
+        assert 'other.library' not in read_file(tmp_path / 'run-0.log')
+        assert len(setup_calls) <= 1
+
+    def test_console_follows_debug_mode(self, monkeypatch, capsys):
+        monkeypatch.delenv('RAPIDS_USER_TOOLS_LOG_DEBUG', raising=False)
+        logger = ToolLogging.get_and_setup_logger('rapids.tools.test')
+        logger.info('Hidden message')
+        monkeypatch.setenv('RAPIDS_USER_TOOLS_LOG_DEBUG', 'True')
+        logger = ToolLogging.get_and_setup_logger('rapids.tools.test')
+        logger.info('Debug message')
+        ToolLogging.flush()
+        stderr = capsys.readouterr().err
+        assert 'Hidden message' not in stderr
+        assert 'rapids.tools.test: Debug message' in stderr
+
+    def test_logging_of_pool_workers(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('RAPIDS_USER_TOOLS_LOG_FILE', str(tmp_path / 'worker.log'))
+        # the listener thread runs in the parent while the workers are started
+        ToolLogging.get_and_setup_logger('rapids.tools.test')
+        with ProcessPoolExecutor(max_workers=1, mp_context=ToolLogging.get_process_pool_context()) as executor:
+            worker_pid = executor.submit(log_from_worker, 'Message of worker').result(timeout=60)
+        assert worker_pid != os.getpid()
+        assert 'rapids.tools.test: Message of worker' in read_file(tmp_path / 'worker.log')
@@ -0,0 +1,95 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the timing trace of the tool runs."""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.tracing import ToolTracer
+from spark_rapids_pytools.common.utilities import SysCmd
+
+
+@pytest.fixture(name='tracer')
+def fixture_tracer():
+    tracer = ToolTracer('Qualification').activate()
+    yield tracer
+    tracer.deactivate()
+
+
+class TestToolTracer:
+    """Test recording the spans and writing them as a Chrome trace."""
+
+    def test_nested_spans(self, tracer, tmp_path):
+        with ToolTracer.span('Execution', 'phase', is_root=True):
+            with ToolTracer.span('Reading the summary report', 'dataframe') as span_args:
+                time.sleep(0.05)
+                span_args['rows'] = 10
+            SysCmd().build({'cmd': 'echo traced'}).exec()
+        spans = {span.name: span for span in tracer.spans}
+        assert set(spans) == {'Execution', 'Reading the summary report', 'CMD echo'}
+        assert spans['Execution'].parent_id is None
+        assert spans['Reading the summary report'].parent_id == spans['Execution'].span_id
+        assert spans['Reading the summary report'].wall_secs >= 0.05
+        assert spans['Execution'].wall_secs >= spans['Reading the summary report'].wall_secs
+        assert spans['CMD echo'].args == {'returnCode': 0}
+        # the peak of the reaped shell is reported apart from the peak of the process
+        assert spans['CMD echo'].children_peak_rss_mb > 0
+        assert [span.name for span in tracer.get_top_spans(1)] == ['Reading the summary report']
+
+        trace_file = tracer.write_trace_file(str(tmp_path / 'trace.json'))
+        with open(trace_file, 'r', encoding='utf-8') as trace_fd:
+            trace_events = json.load(trace_fd)['traceEvents']
+        complete_events = [event for event in trace_events if event['ph'] == 'X']
+        # the events are sorted by their start time and nested by their time ranges
+        assert complete_events[0]['name'] == 'Execution'
+        exec_event, read_event = complete_events[0], complete_events[1]
+        assert exec_event['ts'] <= read_event['ts']
+        assert read_event['ts'] + read_event['dur'] <= exec_event['ts'] + exec_event['dur']
+        assert read_event['args']['rows'] == 10
+        assert {'cpuSecs', 'peakRssMB', 'childrenPeakRssMB'} <= set(read_event['args'])
+        assert any(event['ph'] == 'M' and event['name'] == 'process_name' for event in trace_events)
+
+    def test_no_spans_without_active_tracer(self, tracer):
+        tracer.deactivate()
+
+        @ToolTracer.traced('Loading price catalogs', 'catalog')
+        def load_catalogs():
+            return 'catalogs'
+        assert load_catalogs() == 'catalogs'
+        with ToolTracer.span('Execution', 'phase'):
+            pass
+        assert not tracer.spans
+
+    def test_spans_of_pool_threads(self, tracer):
+        @ToolTracer.traced('Downloading url', 'storage')
+        def download(ind: int):
+            time.sleep(0.01 * ind)
+            return ind
+        with ToolTracer.span('Qualification', 'tool', is_root=True):
+            with ToolTracer.span('Processing Arguments', 'phase'):
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    assert list(executor.map(download, range(1, 4))) == [1, 2, 3]
+        spans = tracer.spans
+        root_span = next(span for span in spans if span.is_root)
+        download_spans = [span for span in spans if span.name == 'Downloading url']
+        assert len(download_spans) == 3
+        # the spans of the pool threads are attached to the run
+        assert all(span.parent_id == root_span.span_id for span in download_spans)
+        top_spans = tracer.get_top_spans(10)
+        assert root_span not in top_spans
+        assert {span.name for span in top_spans} == {'Processing Arguments', 'Downloading url'}
+        assert tracer.get_top_spans(1, include_root=True) == [root_span]
@@ -0,0 +1,152 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the persistent cache of the tools jar."""
+
+import json
+import os
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import pytest  # pylint: disable=import-error
+
+from spark_rapids_pytools.common.utilities import ToolLogging
+from spark_rapids_pytools.rapids.rapids_tool import RapidsJarTool
+from spark_rapids_pytools.rapids.tools_jar_cache import ToolsJarCache
+
+JAR_URL = 'https://repo1.maven.org/maven2/com/nvidia/rapids-4-spark-tools_2.12/23.10.0/' \
+          'rapids-4-spark-tools_2.12-23.10.0.jar'
+
+
+class MockDownloader:  # pylint: disable=too-few-public-methods
+    """Writes the jar content into the destination folder and counts the downloads."""
+
+    def __init__(self, content: bytes = b'jar-content'):
+        self.content = content
+        self.downloads_cnt = 0
+
+    def __call__(self, dest_dir: str) -> str:
+        self.downloads_cnt += 1
+        jar_path = os.path.join(dest_dir, os.path.basename(JAR_URL))
+        with open(jar_path, 'wb') as f:
+            f.write(self.content)
+        return jar_path
+
+
+class TestToolsJarCache:
+    """Test resolving and downloading the tools jar through the cache."""
+
+    def test_version_resolved_once_within_ttl(self, tmp_path):
+        resolve_calls = []
+
+        def resolve_cb():
+            resolve_calls.append(1)
+            return '23.10.0'
+
+        for _ in range(3):
+            jar_cache = ToolsJarCache(str(tmp_path), version_expiration_secs=3600)
+            assert jar_cache.get_resolved_version('mvn', '23.10.0', resolve_cb) == '23.10.0'
+        assert len(resolve_calls) == 1
+        # a different release is resolved separately
+        jar_cache.get_resolved_version('mvn', '23.12.0', resolve_cb)
+        assert len(resolve_calls) == 2
+
+    def test_version_resolved_after_ttl(self, tmp_path):
+        resolved_versions = ['23.08.0', '23.10.0']
+        jar_cache = ToolsJarCache(str(tmp_path), version_expiration_secs=3600)
+        assert jar_cache.get_resolved_version('mvn', '23.10.0', lambda: resolved_versions.pop(0)) == '23.08.0'
+        # age the version record beyond the expiration
+        versions_file = os.path.join(jar_cache.store_dir, 'versions.json')
+        with open(versions_file, 'r', encoding='utf-8') as f:
+            versions = json.load(f)
+        for version_entry in versions.values():
+            version_entry['resolvedAt'] -= 7200
+        with open(versions_file, 'w', encoding='utf-8') as f:
+            json.dump(versions, f)
+        assert jar_cache.get_resolved_version('mvn', '23.10.0', lambda: resolved_versions.pop(0)) == '23.10.0'
+
+    def test_jar_downloaded_once(self, tmp_path):
+        downloader = MockDownloader()
+        jar_cache = ToolsJarCache(str(tmp_path / 'cache'))
+        jar_paths = []
+        for run_id in range(3):
+            work_dir = str(tmp_path / f'run_{run_id}')
+            jar_paths.append(jar_cache.fetch_jar(JAR_URL, work_dir, download_cb=downloader))
+        assert downloader.downloads_cnt == 1
+        for jar_path in jar_paths:
+            assert os.path.basename(jar_path) == os.path.basename(JAR_URL)
+            with open(jar_path, 'rb') as f:
+                assert f.read() == b'jar-content'
+        # the work directories share the same content
+        assert os.path.samefile(jar_paths[0], jar_paths[-1])
+        # no staging leftovers in the store
+        assert all(not f.startswith('staging') for f in os.listdir(jar_cache.store_dir))
+
+    def test_missing_blob_downloaded_again(self, tmp_path):
+        downloader = MockDownloader()
+        jar_cache = ToolsJarCache(str(tmp_path / 'cache'))
+        jar_path = jar_cache.fetch_jar(JAR_URL, str(tmp_path / 'run_0'), download_cb=downloader)
+        for f in os.listdir(jar_cache.store_dir):
+            if f.endswith('.jar'):
+                os.remove(os.path.join(jar_cache.store_dir, f))
+        os.remove(jar_path)
+        jar_cache.fetch_jar(JAR_URL, str(tmp_path / 'run_1'), download_cb=downloader)
+        assert downloader.downloads_cnt == 2
+
+    def test_cacheable_urls(self):
+        assert ToolsJarCache.is_cacheable_url(JAR_URL)
+        assert not ToolsJarCache.is_cacheable_url('s3://bucket/tools.jar')
+        assert not ToolsJarCache.is_cacheable_url('/local/path/tools.jar')
+        assert not ToolsJarCache.is_cacheable_url('https://host/rapids-4-spark-tools_2.12-23.12.0-SNAPSHOT.jar')
+
+
+@dataclass
+class MockJarToolContext:
+    """Context resolving the tools jar from the maven repository through the cache."""
+    jar_cache: ToolsJarCache
+    work_dir: str
+    downloads: list = field(default_factory=list)
+    rapids_args: dict = field(default_factory=dict)
+
+    @property
+    def platform(self):
+        return SimpleNamespace(storage=SimpleNamespace(download_resource=self.download_resource))
+
+    def download_resource(self, src_url: str, dest_dir: str, **kwargs) -> str:
+        self.downloads.append(src_url)
+        if kwargs.get('create_dir'):
+            os.makedirs(dest_dir, exist_ok=True)
+        return MockDownloader()(dest_dir)
+
+    def get_rapids_jar_url(self) -> str:
+        return JAR_URL
+
+    def get_tools_jar_cache(self) -> ToolsJarCache:
+        return self.jar_cache
+
+    def get_local_work_dir(self) -> str:
+        return self.work_dir
+
+    def add_rapids_args(self, key: str, value: str) -> None:
+        self.rapids_args[key] = value
+
+
+@pytest.mark.parametrize('user_jar', [None, JAR_URL])
+def test_only_resolved_jars_are_cached(tmp_path, user_jar):
+    ctxt = MockJarToolContext(ToolsJarCache(str(tmp_path / 'cache')), str(tmp_path / 'work'))
+    jar_tool = SimpleNamespace(wrapper_options={'toolsJar': user_jar}, ctxt=ctxt,
+                               logger=ToolLogging.get_and_setup_logger('rapids.tools.test'))
+    for _ in range(2):
+        RapidsJarTool._process_jar_arg(jar_tool)  # pylint: disable=protected-access
+    # the jar passed by the user may be republished at the same url, so it is downloaded by every run
+    assert len(ctxt.downloads) == (1 if user_jar is None else 2)